@@ -0,0 +1,98 @@
+"""
+微博搜索网页解析后端对比
+以 bs4 完整解析（改用可切换后端之前的解析方式）为基准，逐页对比 bs4 / lxml / selectolax 各后端产出的页面标题与卡片字段，
+并统计各后端的解析耗时；搜索页样本可通过 PARSER_CONFIG['sample_dir'] 在爬取时保存
+"""
+import os
+import sys
+import argparse
+import timeit
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import PARSER_CONFIG
+from crawler.html_parser import CARD_PARSERS, BeautifulSoupCardParser
+
+def collect_pages(paths):
+    """读取样本页面，参数可以是HTML文件或包含 *.html 的目录"""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('*.html')) if path.is_dir() else [path])
+    return [(str(file), file.read_text(encoding='utf-8', errors='replace')) for file in files]
+
+def create_backends(names):
+    """创建待对比的后端，依赖未安装的后端跳过"""
+    backends = {}
+    for name in names:
+        try:
+            backends[name] = CARD_PARSERS[name]()
+        except ImportError as e:
+            print(f"跳过后端 {name}：{e}")
+    return backends
+
+def diff_page(expected, actual):
+    """返回两次解析结果的差异描述列表"""
+    expected_title, expected_cards = expected
+    actual_title, actual_cards = actual
+    diffs = []
+    if expected_title != actual_title:
+        diffs.append(f"标题: {expected_title!r} != {actual_title!r}")
+    if len(expected_cards) != len(actual_cards):
+        diffs.append(f"卡片数: {len(expected_cards)} != {len(actual_cards)}")
+    for index, (expected_card, actual_card) in enumerate(zip(expected_cards, actual_cards)):
+        for field, value in expected_card.items():
+            if actual_card.get(field) != value:
+                diffs.append(f"卡片 {index} {field}: {value!r} != {actual_card.get(field)!r}")
+    return diffs
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="微博搜索网页解析后端对比：字段一致性与解析耗时")
+    parser.add_argument('paths', nargs='*', help='搜索页样本（HTML文件或目录，默认为 PARSER_CONFIG 中的 sample_dir）')
+    parser.add_argument('--backends', nargs='+', choices=sorted(CARD_PARSERS), default=sorted(CARD_PARSERS),
+                        help='参与对比的后端（默认全部）')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数，取最快一次（默认5）')
+    parser.add_argument('--max-diffs', type=int, default=5, help='每页每个后端最多显示的差异条数（默认5）')
+    args = parser.parse_args()
+
+    paths = args.paths or ([PARSER_CONFIG['sample_dir']] if PARSER_CONFIG['sample_dir'] else [])
+    pages = collect_pages(paths)
+    if not pages:
+        print("没有找到搜索页样本：请指定HTML文件或目录，或设置 PARSER_CONFIG['sample_dir'] 后先爬取一次")
+        return 1
+
+    reference = BeautifulSoupCardParser(parse_only=False)
+    backends = create_backends(args.backends)
+    expected = {path: reference.parse(html) for path, html in pages}
+    card_count = sum(len(cards) for _, cards in expected.values())
+    print(f"样本: {len(pages)} 页，{card_count} 个卡片；基准: bs4 完整解析")
+
+    mismatched = 0
+    for name, backend in backends.items():
+        for path, html in pages:
+            diffs = diff_page(expected[path], backend.parse(html))
+            if diffs:
+                mismatched += 1
+                print(f"[{name}] {path}: {len(diffs)} 处差异")
+                for diff in diffs[:args.max_diffs]:
+                    print(f"  {diff}")
+
+    timings = {'bs4（完整解析）': reference}
+    timings.update(backends)
+    baseline = None
+    for name, backend in timings.items():
+        best = min(timeit.repeat(lambda: [backend.parse(html) for _, html in pages], number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{name}: {best / len(pages) * 1e3:.2f} 毫秒/页，相对基准 {baseline / best:.2f}x")
+
+    if mismatched:
+        print(f"共 {mismatched} 个（后端, 页面）组合与基准不一致，切换 html_backend 前请先排查")
+        return 1
+    print("所有后端的解析结果与基准一致")
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,153 @@
+"""
+正文提取微基准
+以优化前的逐项提取实现（BaselineExtractor，每次调用按字符串模式查找正则、列表去重、不缓存图片URL校验）为基线，
+对比当前逐项提取方法（模块级预编译正则）与 DataProcessor.extract_all（话题、@用户、来源一次扫描，链接与图片各自 findall）的耗时，
+以及爬虫实际调用的 extract_source_and_pics（只提取来源和图片）的耗时，并检查各方式的提取结果一致
+"""
+import os
+import re
+import sys
+import random
+import argparse
+import timeit
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from urllib.parse import urlparse
+
+from utils.data_processor import DataProcessor
+
+WORDS = ('今天 天气 真的 不错 我们 一起 去 公园 散步 看到 很多 花 开了 心情 很好 分享 给 大家 '
+         '这个 视频 太 好笑 了 哈哈哈 转发 微博 支持 一下 加油 新品 发布 活动 抽奖 iPhone').split()
+
+def generate_contents(count: int, pics: int = 0, seed: int = 0):
+    """生成接近微博搜索结果正文的样本：话题、@用户、短链、图片链接与来源按一定比例出现；
+    pics 大于0时每条正文附带 pics 个图片链接（部分重复，模拟多图及转发引用同一图片）"""
+    rng = random.Random(seed)
+    contents = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(15, 80))]
+        for _ in range(rng.choice([0, 0, 1, 1, 2])):
+            words.insert(rng.randrange(len(words) + 1), f"#{rng.choice(WORDS)}{rng.choice(WORDS)}#")
+        for _ in range(rng.choice([0, 0, 0, 1, 2])):
+            words.insert(rng.randrange(len(words) + 1), f"@用户{rng.randint(1, 9999)} ")
+        if rng.random() < 0.3:
+            words.append(f" http://t.cn/A6{rng.randint(1000, 9999)} ")
+        if rng.random() < 0.2:
+            words.append(f" https://wx{rng.randint(1, 4)}.sinaimg.cn/large/{rng.randint(1, 10 ** 8)}.jpg ")
+        if rng.random() < 0.1:
+            words.append(rng.choice([' 来自iPhone客户端', ' via 微博网页版', ' 发布于 北京']))
+        for _ in range(pics):
+            words.append(f" https://wx{rng.randint(1, 4)}.sinaimg.cn/mw690/{rng.randint(1, pics * 2)}.jpg ")
+        contents.append(''.join(words))
+    return contents
+
+class BaselineExtractor:
+    """优化前 DataProcessor 中的逐项提取实现（保持原样，作为基线）"""
+
+    source_patterns = [
+        r'来自\s*([^<>\n]+)',
+        r'via\s+([^<>\n]+)',
+        r'source:\s*([^<>\n]+)',
+        r'发布于\s*([^<>\n]+)'
+    ]
+
+    pic_url_patterns = [
+        r'https?://[^\s<>"]+\.(?:jpg|jpeg|png|gif|webp|bmp)',
+        r'https?://wx\d+\.sinaimg\.cn/[^\s<>"]+',
+        r'https?://tva\d+\.sinaimg\.cn/[^\s<>"]+',
+        r'https?://ww\d+\.sinaimg\.cn/[^\s<>"]+'
+    ]
+
+    def _extract_source(self, content: str):
+        for pattern in self.source_patterns:
+            match = re.search(pattern, content, re.IGNORECASE)
+            if match:
+                return re.sub(r'<[^>]+>', '', match.group(1).strip())
+        client_match = re.search(r'(iPhone|Android|iPad|微博网页版|微博桌面版)', content)
+        return client_match.group(1) if client_match else None
+
+    def _extract_pic_urls(self, content: str):
+        pic_urls = []
+        for pattern in self.pic_url_patterns:
+            pic_urls.extend(re.findall(pattern, content))
+        unique_urls = []
+        for url in pic_urls:
+            if url not in unique_urls and self._is_valid_image_url(url):
+                unique_urls.append(url)
+        return unique_urls
+
+    def _is_valid_image_url(self, url: str) -> bool:
+        try:
+            parsed = urlparse(url)
+            if not parsed.scheme or not parsed.netloc:
+                return False
+            path = parsed.path.lower()
+            return any(path.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'])
+        except Exception:
+            return False
+
+    def extract_hashtags(self, content: str):
+        return [tag.strip() for tag in re.findall(r'#([^#]+)#', content) if tag.strip()]
+
+    def extract_mentions(self, content: str):
+        return [mention.strip() for mention in re.findall(r'@([^\s@]+)', content) if mention.strip()]
+
+    def extract_urls(self, content: str):
+        return [url.strip() for url in re.findall(r'https?://[^\s<>"]+|www\.[^\s<>"]+', content) if url.strip()]
+
+def extract_separately(processor, content: str):
+    """逐项提取（每个方法各自扫描一遍正文），processor 为 DataProcessor 或 BaselineExtractor"""
+    return {
+        'source': processor._extract_source(content),
+        'pic_urls': processor._extract_pic_urls(content),
+        'hashtags': processor.extract_hashtags(content),
+        'mentions': processor.extract_mentions(content),
+        'urls': processor.extract_urls(content)
+    }
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="正文提取微基准：优化前实现 vs 逐项提取 vs extract_all，以及爬虫调用的来源+图片提取")
+    parser.add_argument('--records', type=int, default=20000, help='样本正文条数（默认20000）')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数，取最快一次（默认5）')
+    parser.add_argument('--pics', type=int, default=0, help='每条正文附带的图片链接数（默认0，多图场景可设为30）')
+    args = parser.parse_args()
+
+    processor = DataProcessor()
+    baseline = BaselineExtractor()
+    contents = generate_contents(args.records, args.pics)
+
+    for content in contents:
+        expected = extract_separately(baseline, content)
+        for name, actual in (('逐项提取', extract_separately(processor, content)), ('单次扫描', processor.extract_all(content))):
+            if actual != expected:
+                print(f"提取结果不一致: {content!r}\n  优化前实现: {expected}\n  {name}: {actual}")
+                return 1
+        if processor.extract_source_and_pics(content) != (expected['source'], expected['pic_urls']):
+            print(f"来源+图片提取结果不一致: {content!r}")
+            return 1
+
+    benchmarks = (
+        ('优化前实现', lambda: [extract_separately(baseline, c) for c in contents]),
+        ('逐项提取', lambda: [extract_separately(processor, c) for c in contents]),
+        ('单次扫描', lambda: [processor.extract_all(c) for c in contents]),
+        ('优化前来源+图片', lambda: [(baseline._extract_source(c), baseline._extract_pic_urls(c)) for c in contents]),
+        ('来源+图片', lambda: [processor.extract_source_and_pics(c) for c in contents]),
+    )
+    timings = {}
+    for name, run in benchmarks:
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        timings[name] = best
+        print(f"{name}: {best / len(contents) * 1e6:.2f} 微秒/条（{len(contents)} 条 {best:.3f} 秒）")
+
+    for name in ('逐项提取', '单次扫描'):
+        print(f"{name}相对优化前实现: {timings['优化前实现'] / timings[name]:.2f}x")
+    print(f"单次扫描相对逐项提取: {timings['逐项提取'] / timings['单次扫描']:.2f}x")
+    print(f"来源+图片（爬虫调用路径）相对优化前实现: {timings['优化前来源+图片'] / timings['来源+图片']:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,66 @@
+"""
+历史数据批量回灌脚本
+将会话目录中的原始数据（raw_data/*.json）通过 LOAD DATA LOCAL INFILE 批量导入数据库
+"""
+import os
+import sys
+import argparse
+from itertools import chain
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import PLATFORM_CONFIG
+from database.models import DatabaseManager
+from utils.data_storage_manager import DataStorageManager
+from utils.logger import setup_logger
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="将爬取会话的原始数据批量导入数据库")
+    parser.add_argument('paths', nargs='+',
+                       help='会话目录、按日期平台划分的一级目录或数据根目录（如 data/）')
+    parser.add_argument('--platform', '-p', choices=list(PLATFORM_CONFIG.keys()),
+                       help='只导入指定平台（默认导入全部平台）')
+    parser.add_argument('--replace', action='store_true',
+                       help='_id 已存在时以导入的数据覆盖（默认跳过）')
+
+    args = parser.parse_args()
+    logger = setup_logger()
+
+    storage_manager = DataStorageManager()
+    session_dirs = [session_dir for path in args.paths for session_dir in storage_manager.find_session_directories(path)]
+    if not session_dirs:
+        print("未找到包含 raw_data 的会话目录")
+        return 1
+    logger.info(f"[批量导入] 共找到 {len(session_dirs)} 个会话目录")
+
+    db_manager = DatabaseManager()
+    if not db_manager.create_database() or not db_manager.connect() or not db_manager.create_tables():
+        print("数据库初始化失败，程序退出")
+        return 1
+
+    try:
+        platforms = [args.platform] if args.platform else list(PLATFORM_CONFIG.keys())
+
+        print("\n" + "="*50)
+        for platform in platforms:
+            records = chain.from_iterable(
+                storage_manager.iter_raw_records(session_dir, platform) for session_dir in session_dirs
+            )
+            result = db_manager.bulk_load(platform, records, replace=args.replace)
+            print(f"{PLATFORM_CONFIG[platform]['name']}: 读取 {result['rows']} 行，新增 {result['inserted']} 行，"
+                  f"跳过 {result['ignored']} 行，覆盖 {result['replaced']} 行")
+        print("="*50)
+
+        return 0
+
+    except KeyboardInterrupt:
+        print("\n用户中断程序")
+        return 1
+    finally:
+        db_manager.disconnect()
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
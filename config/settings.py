@@ -14,6 +14,65 @@ DATABASE_CONFIG = {
     'charset': 'utf8mb4'
 }
 
+# 数据库写入配置
+DB_WRITE_CONFIG = {
+    'chunk_size': 500,  # 批量插入时每条多行 INSERT 语句包含的行数（同一批次的所有分块在一个事务中提交）
+    'load_chunk_rows': 100000,  # LOAD DATA 批量导入时每个临时文件的行数（bulk_ingest.py）
+    'write_behind': True,  # 爬取结果交给后台线程写入，爬取不等待数据库提交
+    'write_behind_batch_size': 1000,  # 后台写入累积到该条数时立即写入
+    'write_behind_interval': 2.0,  # 后台写入的最长等待时间（秒），到期即写入已累积的数据
+    'write_behind_max_pending': 100,  # 队列中最多等待写入的批次数，超出时提交方阻塞
+}
+
+# 数据库连接池配置（进程内共享，各线程借用独立连接）
+DB_POOL_CONFIG = {
+    'min_size': 1,  # 保持的最少连接数
+    'max_size': 10,  # 最大连接数，全部借出时等待归还
+    'checkout_timeout': 30,  # 等待可用连接的最长时间（秒）
+    'idle_timeout': 300,  # 超出 min_size 的连接空闲超过该时长（秒）后关闭
+    'health_check_interval': 30,  # 连接空闲超过该时长（秒）后，借出前先 ping 检查
+}
+
+# 网页解析配置
+PARSER_CONFIG = {
+    'html_backend': 'bs4',  # 微博搜索网页解析后端：bs4 / lxml / selectolax（未安装时退回 bs4），切换前先用 benchmark_parsers.py 对比
+    'bs4_parse_only': True,  # bs4 后端只解析 card-wrap 卡片（找不到卡片时再完整解析以记录页面结构）
+    'sample_dir': None,  # 设置目录时保存每个搜索结果页的原始HTML，供 benchmark_parsers.py 对比各解析后端
+}
+
+# 爬虫实例内已爬取ID的去重配置（按代淘汰，长期运行时内存恒定）
+CRAWLED_IDS_CONFIG = {
+    'capacity': 500000,  # 最多保留的ID数
+    'generations': 4,  # 分代数，每代写满 capacity/generations 个后封存，超出时丢弃最旧的一代
+}
+
+# 近似重复内容检测配置（SimHash + LSH，为每条数据标记 content_cluster_id）
+NEAR_DUPLICATE_CONFIG = {
+    'enabled': True,
+    'drop_duplicates': False,  # 是否在入库前丢弃近似重复的内容（只保留每簇第一条）
+    'max_distance': 8,  # 汉明距离不超过该值的内容视为近似重复（64 位指纹，短文本需要较宽的阈值）
+    'bands': 6,  # LSH 分段数，段越多召回越高、比较的候选越多
+    'shingle_size': 2,  # 计算指纹的字符 n-gram 长度
+    'max_entries': 100000,  # 索引保留的最大指纹数
+    'min_length': 10,  # 清洗后短于该长度的正文不参与检测
+}
+
+# 去重索引配置（每个平台一个持久化的布隆过滤器，代替启动时加载全部 _id）
+DEDUPE_CONFIG = {
+    'directory': 'data/dedupe',  # 索引文件目录
+    'capacity': 5000000,  # 预计的最大记录数，超出后按两倍容量重建
+    'error_rate': 0.001,  # 误判率（误判的ID由数据库查询确认，只影响查询次数）
+    'sync_batch_size': 50000,  # 从数据库同步新增行时每次查询的行数
+    'pending_capacity': 100000,  # 内存中保留的最近加入ID数（可能尚未写入数据库），更早的ID由布隆过滤器+数据库确认
+}
+
+# 互动计数快照配置（engagement_snapshots 表按天分区，更新模式写入时追加快照）
+SNAPSHOT_CONFIG = {
+    'enabled': True,
+    'partitions_ahead': 7,  # 预先创建的未来天数分区
+    'retention_days': 90,  # 快照保留天数，更早的分区整体删除
+}
+
 # 爬虫配置
 CRAWLER_CONFIG = {
     'keyword': '李雨珊',
@@ -22,6 +81,88 @@ CRAWLER_CONFIG = {
     'retry_times': 3,  # 重试次数
     'timeout': 30,  # 请求超时时间
     'batch_size': 100,  # 批量插入数据库的大小
+    'concurrency': 5,  # 异步模式下每个平台同时在途的页面请求数
+}
+
+# 请求限速配置（按主机的令牌桶，所有出站请求共享）
+RATE_LIMIT_CONFIG = {
+    'enabled': True,  # 启用后由令牌桶控制请求节奏，不再在每页之后固定随机等待
+    'default': {'rate': 0.5, 'burst': 2},  # rate: 每秒请求数, burst: 允许的突发请求数
+    'hosts': {
+        's.weibo.com': {'rate': 0.5, 'burst': 2},
+        'm.weibo.cn': {'rate': 0.5, 'burst': 2},
+        'm.douyin.com': {'rate': 0.4, 'burst': 2},
+        'www.douyin.com': {'rate': 0.4, 'burst': 2},
+    }
+}
+
+# 自适应限速配置（AIMD：响应正常时线性提速，遇到封禁信号时按比例降速，按平台+代理分别计算）
+THROTTLE_CONFIG = {
+    'enabled': True,
+    'initial_rate': 0.3,  # 初始速率（每秒请求数）
+    'min_rate': 0.05,  # 最低速率
+    'max_rate': 2.0,  # 最高速率（实际仍受RATE_LIMIT_CONFIG的主机上限约束）
+    'increase_step': 0.02,  # 每次正常响应增加的速率
+    'decrease_factor': 0.5,  # 遇到封禁信号时速率乘以该系数
+    'penalty_signals': ['status_429', 'status_403', 'login', 'captcha'],
+}
+
+# 对冲请求配置（主接口迟迟未返回时并行请求备用接口，采用先返回有效结果的一方）
+HEDGE_CONFIG = {
+    'enabled': False,
+    'mode': 'percentile',  # percentile: 主请求超过历史延迟分位数后再发备用请求; parallel: 同时发出
+    'percentile': 90,  # 对冲等待时间取主接口延迟的该分位数
+    'min_samples': 10,  # 延迟样本不足时使用 default_delay
+    'default_delay': 3.0,  # 默认对冲等待时间（秒）
+    'window': 200,  # 参与分位数计算的最近请求数
+}
+
+# 重试策略配置（最大尝试次数沿用 CRAWLER_CONFIG['retry_times']）
+RETRY_CONFIG = {
+    'base_delay': 2.0,  # 首次重试的最短等待（秒）
+    'max_delay': 60.0,  # 单次重试的最长等待（秒）
+    'max_retry_after': 300,  # 服务端 Retry-After 的采纳上限（秒）
+    'retry_budget': 50,  # 每次运行允许的重试总次数，None 表示不限制
+    'blocked_signals': ['status_429', 'status_403', 'login', 'captcha'],  # 视为被限制的响应信号
+    'retry_statuses': [408, 500, 502, 503, 504],  # 可重试的服务端状态码
+}
+
+# 熔断器配置（按平台统计连续的响应验证失败）
+CIRCUIT_BREAKER_CONFIG = {
+    'enabled': True,
+    'failure_threshold': 5,  # 连续验证失败达到该次数后熔断
+    'cooldown': 120,  # 首次熔断冷却时长（秒），半开探测失败后逐次翻倍
+    'max_cooldown': 1800,  # 最长冷却时长（秒）
+    'probe_interval': 10,  # 半开状态下探测请求的最小间隔（秒），间隔内的其他请求直接拒绝
+    'max_trips': 3,  # 单次运行中熔断次数达到该值时终止爬取
+}
+
+# 增量爬取配置（--incremental，按发布时间排序搜索，每个关键词记录水位线）
+INCREMENTAL_CONFIG = {
+    'known_pages_to_stop': 2,  # 连续多少页全部为已知数据时停止翻页
+}
+
+# 任务调度配置（crawl_scheduler.py，单进程内并发执行多个 关键词×平台 任务）
+SCHEDULER_CONFIG = {
+    'max_workers': 4,  # 同时运行的任务总数
+    'platform_concurrency': {  # 每个平台同时运行的任务数（同平台任务共享限速器与熔断器）
+        'weibo': 2,
+        'douyin': 2,
+    },
+    'default_priority': 0,  # 数值越大越先执行
+}
+
+# 流水线模式配置（--pipeline，抓取→去重→入库→写文件 各阶段以有界队列连接）
+PIPELINE_CONFIG = {
+    'report_interval': 30,  # 定时输出各阶段吞吐量与队列深度的间隔（秒），0为不输出
+    'stages': {
+        # workers: 工作线程数, queue_size: 输入队列容量（写满时上游阻塞）, batch_size: 每次处理的条数
+        # 输入为页码；解析在抓取线程内完成（对冲请求与移动端/网页端回退要根据解析结果选择采用哪个响应，不单独成阶段）
+        'fetch': {'workers': 3, 'queue_size': 10},
+        'dedupe': {'workers': 1, 'queue_size': 20},  # 输入为一页数据，整页一次查询去重索引
+        'db_writer': {'workers': 1, 'queue_size': 500, 'batch_size': 100, 'flush_interval': 2.0},
+        'file_writer': {'workers': 1, 'queue_size': 500, 'batch_size': 100, 'flush_interval': 2.0},  # 逐批追加到会话目录，结束时合并为结构化数据文件
+    }
 }
 
 # User-Agent池
@@ -39,7 +180,14 @@ PROXY_CONFIG = {
     'proxies': [
         # 'http://proxy1:port',
         # 'http://proxy2:port',
-    ]
+    ],
+    # 代理池健康管理
+    'max_consecutive_failures': 3,  # 连续失败达到该次数后隔离代理
+    'ban_signals': ['status_403', 'status_429', 'captcha'],  # 视为代理被封的响应信号，出现即隔离
+    'base_cooldown': 30,  # 首次隔离时长（秒），连续隔离时逐次翻倍
+    'max_cooldown': 1800,  # 最长隔离时长（秒）
+    'latency_alpha': 0.3,  # 延迟指数移动平均的平滑系数
+    'pool_maxsize': 10,  # 每个代理保持的keep-alive连接数
 }
 
 # 日志配置
@@ -61,6 +209,7 @@ WEIBO_API_CONFIG = {
 WEIBO_URLS = {
     'search_url': 'https://s.weibo.com/weibo',
     'mobile_search_url': 'https://m.weibo.cn/api/container/getIndex',
+    'realtime_search_url': 'https://s.weibo.com/realtime',  # 按发布时间排序的实时搜索
     'pc_search_url': 'https://weibo.com/ajax/side/search'
 }
 
@@ -0,0 +1,240 @@
+"""
+多任务爬取调度器
+在单个进程内按优先级并发执行多个 关键词×平台 任务，按平台限制并发数，
+所有任务共享数据库连接池、去重索引以及进程内的限速器、代理池与熔断器
+"""
+import os
+import sys
+import signal
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, List, Any
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import CRAWLER_CONFIG, PLATFORM_CONFIG, SCHEDULER_CONFIG
+from database.models import DatabaseManager
+from multi_platform_crawler import MultiPlatformCrawler
+from utils.logger import setup_logger
+from utils.proxy_pool import get_proxy_pool
+from utils.dedupe_index import DedupeIndex
+from utils import json_codec
+
+class CrawlScheduler:
+    """爬取任务调度器"""
+
+    def __init__(self, jobs: List[Dict[str, Any]], config: Dict[str, Any] = None):
+        self.config = config or SCHEDULER_CONFIG
+        self.logger = setup_logger()
+        # 优先级高的任务先执行，同优先级保持任务列表中的顺序
+        self.jobs = sorted(jobs, key=lambda job: -job['priority'])
+        self.db_manager = DatabaseManager()
+        self.existing_ids: Dict[str, DedupeIndex] = {}  # 按平台共享的去重索引
+        self.results: List[Dict[str, Any]] = []
+        self.is_running = True
+
+        self._active_crawlers: Dict[int, MultiPlatformCrawler] = {}
+        self._lock = threading.Lock()
+
+        # 注册信号处理器（工作线程中的爬虫不注册，由调度器统一通知停止）
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+    @staticmethod
+    def load_jobs(file_path: str) -> List[Dict[str, Any]]:
+        """读取任务列表JSON文件，格式: [{"platform": "weibo", "keyword": "...", "pages": 10, "priority": 1}, ...]"""
+        raw_jobs = json_codec.load_file(file_path)
+
+        jobs = []
+        for index, job in enumerate(raw_jobs):
+            platform = str(job.get('platform', 'weibo')).lower()
+            if platform not in PLATFORM_CONFIG or not job.get('keyword'):
+                setup_logger().error(f"忽略无效任务 #{index}: {job}")
+                continue
+
+            jobs.append({
+                'id': index,
+                'platform': platform,
+                'keyword': job['keyword'],
+                'pages': job.get('pages') or CRAWLER_CONFIG['max_pages'],
+                'priority': job.get('priority', SCHEDULER_CONFIG['default_priority']),
+                'incremental': job.get('incremental', False),
+                'use_async': job.get('async', False),
+                'upsert': job.get('upsert', False)
+            })
+        return jobs
+
+    def _signal_handler(self, signum, frame):
+        """信号处理器：不再启动新任务，并通知运行中的任务安全退出"""
+        self.logger.info("接收到退出信号，等待运行中的任务安全退出...")
+        self.is_running = False
+        with self._lock:
+            for crawler in self._active_crawlers.values():
+                crawler.is_running = False
+
+    def initialize(self) -> bool:
+        """初始化共享的数据库连接池与数据表"""
+        try:
+            if not self.db_manager.create_database():
+                self.logger.error("创建数据库失败")
+                return False
+
+            if not self.db_manager.connect():
+                self.logger.error("连接数据库失败")
+                return False
+
+            if not self.db_manager.create_tables():
+                self.logger.error("创建数据表失败")
+                return False
+
+            self.logger.info(f"调度器初始化完成，共 {len(self.jobs)} 个任务")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"初始化失败: {e}")
+            return False
+
+    def _get_existing_ids(self, platform: str) -> DedupeIndex:
+        """获取平台共享的去重索引，每个平台只打开一次"""
+        if platform not in self.existing_ids:
+            self.existing_ids[platform] = DedupeIndex.open(platform, self.db_manager)
+            self.logger.info(f"加载{PLATFORM_CONFIG[platform]['name']}已有记录 {len(self.existing_ids[platform])} 条")
+        return self.existing_ids[platform]
+
+    def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """在工作线程中执行单个任务"""
+        crawler = MultiPlatformCrawler(
+            platform=job['platform'],
+            use_async=job['use_async'],
+            incremental=job['incremental'],
+            upsert=job['upsert'],
+            db_manager=self.db_manager,
+            existing_ids=self.existing_ids[job['platform']],
+            install_signal_handlers=False
+        )
+        with self._lock:
+            self._active_crawlers[job['id']] = crawler
+
+        try:
+            self.logger.info(f"[调度] 开始任务 #{job['id']}: {job['platform']} - {job['keyword']} ({job['pages']} 页)")
+            success = crawler.crawl_data(keyword=job['keyword'], max_pages=job['pages'])
+            return dict(job, success=success, stats=crawler.stats)
+        finally:
+            crawler.cleanup()
+            with self._lock:
+                self._active_crawlers.pop(job['id'], None)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """按优先级派发任务，同时满足总并发数与各平台并发数限制"""
+        pending = list(self.jobs)
+        running = {}
+        active_per_platform = defaultdict(int)
+        max_workers = self.config['max_workers']
+        start_time = datetime.now()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawl-job') as executor:
+            while pending or running:
+                if self.is_running:
+                    # 按优先级顺序启动平台仍有空闲名额的任务，平台已满的任务不阻塞其他平台
+                    for job in list(pending):
+                        if len(running) >= max_workers:
+                            break
+                        platform = job['platform']
+                        if active_per_platform[platform] >= self.config['platform_concurrency'].get(platform, 1):
+                            continue
+
+                        self._get_existing_ids(platform)
+                        pending.remove(job)
+                        active_per_platform[platform] += 1
+                        running[executor.submit(self._run_job, job)] = job
+                elif pending:
+                    self.logger.info(f"[调度] 已停止，跳过 {len(pending)} 个未开始的任务")
+                    pending.clear()
+
+                if not running:
+                    break
+
+                # 定时返回以便及时响应退出信号
+                done, _ = wait(list(running), timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    active_per_platform[job['platform']] -= 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.error(f"[调度] 任务 #{job['id']} 执行出错: {e}")
+                        result = dict(job, success=False, stats={}, error=str(e))
+                    self.results.append(result)
+                    self.logger.info(f"[调度] 任务 #{job['id']} 结束: {job['platform']} - {job['keyword']}，"
+                                     f"新增 {result['stats'].get('total_crawled', 0)} 条，"
+                                     f"剩余 {len(pending) + len(running)} 个任务")
+
+        duration = (datetime.now() - start_time).total_seconds()
+        self.logger.info(f"[调度] 全部任务结束，完成 {len(self.results)} 个，耗时 {duration:.1f} 秒")
+        return self.results
+
+    def cleanup(self):
+        """关闭共享资源"""
+        try:
+            for index in self.existing_ids.values():
+                index.save()
+            self.db_manager.disconnect()
+            proxy_pool = get_proxy_pool()
+            if proxy_pool:
+                proxy_pool.close()
+            self.logger.info("资源清理完成")
+        except Exception as e:
+            self.logger.error(f"清理资源失败: {e}")
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="多任务爬取调度器")
+    parser.add_argument('--jobs', '-j', type=str, required=True,
+                       help='任务列表JSON文件，每个任务包含 platform/keyword/pages/priority，可选 incremental/async/upsert')
+    parser.add_argument('--workers', '-w', type=int,
+                       help='同时运行的任务总数（默认见 SCHEDULER_CONFIG）')
+
+    args = parser.parse_args()
+
+    config = dict(SCHEDULER_CONFIG)
+    if args.workers:
+        config['max_workers'] = args.workers
+
+    try:
+        jobs = CrawlScheduler.load_jobs(args.jobs)
+    except Exception as e:
+        print(f"读取任务列表失败: {e}")
+        return 1
+
+    scheduler = CrawlScheduler(jobs, config)
+
+    try:
+        if not scheduler.initialize():
+            print("调度器初始化失败，程序退出")
+            return 1
+
+        results = scheduler.run()
+
+        print("\n" + "="*50)
+        print("任务执行结果:")
+        for result in sorted(results, key=lambda r: r['id']):
+            status = '成功' if result['success'] else '失败'
+            print(f"#{result['id']} {PLATFORM_CONFIG[result['platform']]['name']} - {result['keyword']}: "
+                  f"{status}，新增 {result['stats'].get('total_crawled', 0)} 条")
+        print("="*50)
+
+        return 0 if results and all(result['success'] for result in results) else 1
+
+    except Exception as e:
+        print(f"程序运行出错: {e}")
+        return 1
+    finally:
+        scheduler.cleanup()
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,194 @@
+"""
+异步爬虫基础类
+基于asyncio + aiohttp，在同一个事件循环中保持多个页面请求同时在途
+"""
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
+
+import aiohttp
+
+from config.settings import CRAWLER_CONFIG, CIRCUIT_BREAKER_CONFIG
+from utils.helpers import detect_block_signal
+from utils.retry_policy import RetryPolicy
+from utils.circuit_breaker import CircuitOpenError
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+class AsyncResponse:
+    """异步请求的响应快照
+
+    提供与 requests.Response 相同的常用属性（status_code / url / text / headers / json），
+    使同步爬虫中的 validate_response 与各类解析方法可以直接复用。
+    """
+
+    __slots__ = ('status_code', 'url', 'text', 'headers')
+
+    def __init__(self, status_code: int, url: str, text: str, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.url = url
+        self.text = text
+        self.headers = headers
+
+    def json(self) -> Any:
+        return json_codec.loads(self.text)
+
+class AsyncBaseSpider(ABC):
+    """异步爬虫基础类
+
+    以混入方式与具体的同步爬虫组合使用（如 AsyncWeiboSpider(AsyncBaseSpider, WeiboSpider)），
+    请求头、Cookie、代理沿用同步爬虫 requests.Session 中的配置，解析逻辑完全复用，
+    只把网络请求替换为 aiohttp 并发执行。
+    """
+
+    def __init__(self, *args, concurrency: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.concurrency = concurrency or CRAWLER_CONFIG['concurrency']
+        self.async_session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.retry_policy = RetryPolicy(retryable_exceptions=(aiohttp.ClientError, asyncio.TimeoutError))
+
+    @abstractmethod
+    async def search_content(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步搜索内容 - 子类必须实现"""
+        pass
+
+    async def open(self):
+        """创建aiohttp会话（需在事件循环中调用）"""
+        if self.async_session is not None:
+            return
+
+        # 同步Session中的Cookie按域名迁移到aiohttp的CookieJar
+        cookie_jar = aiohttp.CookieJar()
+        for cookie in self.session.cookies:
+            morsel = SimpleCookie()
+            morsel[cookie.name] = cookie.value
+            morsel[cookie.name]['domain'] = cookie.domain
+            morsel[cookie.name]['path'] = cookie.path or '/'
+            cookie_jar.update_cookies(morsel)
+
+        self.async_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            cookie_jar=cookie_jar,
+            timeout=aiohttp.ClientTimeout(total=CRAWLER_CONFIG['timeout'])
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        logger.info(f"[异步] {self.get_platform_name()} 会话已创建，并发上限: {self.concurrency}")
+
+    async def close(self):
+        """关闭aiohttp会话"""
+        if self.async_session is not None:
+            await self.async_session.close()
+            self.async_session = None
+            self._semaphore = None
+
+    async def _get(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> AsyncResponse:
+        """发送异步GET请求，受熔断器、并发上限、主机限速、自适应限速约束并经代理池轮换代理"""
+        if self.async_session is None:
+            await self.open()
+
+        # 每次请求都以同步Session的当前请求头为基础，保证User-Agent轮换等修改生效
+        request_headers = dict(self.session.headers)
+        if headers:
+            request_headers.update(headers)
+
+        self.circuit_breaker.before_request()
+
+        platform = self.get_platform_name()
+
+        async with self._semaphore:
+            # 取得并发名额后再选择代理，代理的在途计数只反映实际发出的请求
+            proxy = self.proxy_pool.acquire() if self.proxy_pool else None
+            try:
+                await self.rate_limiter.acquire_async(url)
+                await self.throttle.acquire_async(platform, proxy)
+            except BaseException:
+                # 等待限速期间被取消时释放代理的在途计数，不计入代理健康度
+                if proxy:
+                    self.proxy_pool.release(proxy)
+                raise
+
+            # aiohttp连接器按 (主机, 代理) 维护keep-alive连接，同一代理的请求会复用连接
+            start_time = time.monotonic()
+            try:
+                async with self.async_session.get(url, params=params, headers=request_headers, proxy=proxy) as response:
+                    text = await response.text(errors='replace')
+                    result = AsyncResponse(response.status, str(response.url), text, dict(response.headers))
+            except asyncio.CancelledError:
+                if proxy:
+                    self.proxy_pool.release(proxy)
+                raise
+            except Exception:
+                if proxy:
+                    self.proxy_pool.report(proxy, None, error=True)
+                raise
+
+        signal = detect_block_signal(result)
+        if proxy:
+            self.proxy_pool.report(proxy, time.monotonic() - start_time, signal)
+        self.throttle.record(platform, proxy, signal)
+        return result
+
+    async def crawl_with_retry(self, keyword: str, page: int = 1, max_retries: int = None) -> List[Dict[str, Any]]:
+        """带重试机制的异步爬取 - 正常响应但无数据时不再重试"""
+        try:
+            return await self.retry_policy.call_async(
+                lambda: self.search_content(keyword, page),
+                max_attempts=max_retries,
+                description=f"第 {page} 页",
+                on_retry=self._rotate_user_agent
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"[异步] 第 {page} 页爬取失败: {e}")
+            return []
+
+    async def crawl_pages(self, keyword: str, start_page: int, end_page: int) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """并发爬取页面区间，按页码顺序产出 (页码, 数据列表)
+
+        滑动窗口方式调度：始终保持最多 concurrency 个页面在途，
+        最早的页面完成后立即产出并补充新的页面请求。
+        平台熔断时等待冷却结束后重新爬取该页，熔断次数超过上限时抛出 CircuitOpenError。
+        """
+        max_trips = CIRCUIT_BREAKER_CONFIG['max_trips']
+        trips_at_start = self.circuit_breaker.trip_count
+        await self.open()
+
+        pending: Dict[int, asyncio.Task] = {}
+        next_page = start_page
+
+        try:
+            for page in range(start_page, end_page + 1):
+                while next_page <= end_page and len(pending) < self.concurrency:
+                    logger.info(f"[异步] 正在爬取第 {next_page} 页...")
+                    pending[next_page] = asyncio.ensure_future(self.crawl_with_retry(keyword, next_page))
+                    next_page += 1
+
+                while True:
+                    try:
+                        results = await pending.pop(page)
+                    except CircuitOpenError as e:
+                        if self.circuit_breaker.trip_count - trips_at_start >= max_trips:
+                            logger.error(f"[异步] {self.get_platform_name()} 本次运行已熔断 {max_trips} 次，停止爬取")
+                            raise
+                        logger.warning(f"[异步] {e}，等待后重新爬取第 {page} 页")
+                        await asyncio.sleep(e.retry_after)
+                        pending[page] = asyncio.ensure_future(self.crawl_with_retry(keyword, page))
+                        continue
+                    except Exception as e:
+                        logger.error(f"[异步] 爬取第 {page} 页失败: {e}")
+                        results = []
+                    break
+
+                yield page, results
+        finally:
+            # 提前结束时取消仍在途的页面请求
+            for task in pending.values():
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending.values(), return_exceptions=True)
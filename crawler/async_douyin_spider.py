@@ -0,0 +1,62 @@
+"""
+抖音异步爬虫模块
+"""
+import logging
+from typing import Dict, List, Any
+
+from config.settings import DOUYIN_URLS
+from crawler.async_base_spider import AsyncBaseSpider
+from crawler.douyin_spider import DouyinSpider
+from utils.hedging import PRIMARY
+from utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+class AsyncDouyinSpider(AsyncBaseSpider, DouyinSpider):
+    """抖音异步爬虫类 - 参数构建与解析复用DouyinSpider"""
+    
+    async def search_content(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步搜索抖音内容"""
+        try:
+            # 构建搜索参数
+            params = self._build_search_params(keyword, page)
+            
+            # 优先尝试移动端API接口
+            mobile_url = DOUYIN_URLS.get('search_url_mobile', DOUYIN_URLS['search_url'])
+            backup_url = DOUYIN_URLS.get('search_url_backup', DOUYIN_URLS['search_url'])
+            
+            if self.hedger.enabled:
+                return await self.hedged_search(keyword, page, params, mobile_url, backup_url)
+            
+            logger.info(f"[异步] 尝试移动端API: {mobile_url}")
+            
+            response = await self._get(mobile_url, params=params)
+            
+            # 如果移动端失败，尝试PC端备用接口
+            if not self.validate_response(response):
+                logger.warning("[异步] 移动端API失败，尝试PC端备用接口")
+                response = await self._get(backup_url, params=params)
+            
+            content_list = self._handle_search_response(response, keyword)
+            return self._commit_results(content_list, page)
+        
+        except Exception as e:
+            if isinstance(e, CircuitOpenError) or self.retry_policy.is_retryable(e):
+                raise
+            logger.error(f"[异步] 搜索抖音内容失败: {e}")
+            return []
+    
+    async def hedged_search(self, keyword: str, page: int, params: Dict[str, Any],
+                            mobile_url: str, backup_url: str) -> List[Dict[str, Any]]:
+        """异步对冲请求：落败一方的请求会被取消"""
+        label, content_list = await self.hedger.run_async(
+            lambda: self._fetch_search_results(mobile_url, params, keyword),
+            lambda: self._fetch_search_results(backup_url, params, keyword)
+        )
+        logger.info(f"[异步] 对冲请求采用{'移动端API' if label == PRIMARY else 'PC端备用接口'}的结果")
+        return self._commit_results(content_list, page)
+    
+    async def _fetch_search_results(self, url: str, params: Dict[str, Any], keyword: str) -> List[Dict[str, Any]]:
+        """异步请求单个搜索接口并解析（不登记已爬取ID、不保存数据）"""
+        response = await self._get(url, params=params)
+        return self._handle_search_response(response, keyword)
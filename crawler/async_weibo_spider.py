@@ -0,0 +1,106 @@
+"""
+微博异步爬虫模块
+"""
+import logging
+from typing import Dict, List, Any
+
+from crawler.async_base_spider import AsyncBaseSpider
+from crawler.weibo_spider import WeiboSpider
+from utils.helpers import get_random_user_agent
+from utils.hedging import PRIMARY
+from utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+class AsyncWeiboSpider(AsyncBaseSpider, WeiboSpider):
+    """微博异步爬虫类 - 请求构建与解析复用WeiboSpider"""
+    
+    async def search_weibo(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步搜索微博数据"""
+        try:
+            weibo_list = await self._fetch_web_results(keyword, page)
+            return self._commit_results(weibo_list, page, "weibo_web")
+        
+        except Exception as e:
+            logger.error(f"[异步] 搜索微博失败: {e}")
+            return []
+    
+    async def search_weibo_mobile(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步使用移动端API搜索微博"""
+        try:
+            weibo_list = await self._fetch_mobile_results(keyword, page)
+            return self._commit_results(weibo_list, page, "weibo_mobile")
+        
+        except Exception as e:
+            logger.error(f"[异步] 移动端搜索失败: {e}")
+            return []
+    
+    async def _fetch_web_results(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步请求并解析网页端搜索结果（不登记已爬取ID、不保存数据）"""
+        response = await self._get(
+            self._build_search_url(keyword, page),
+            headers={'User-Agent': get_random_user_agent()}
+        )
+        return self._handle_search_response(response, keyword)
+    
+    async def _fetch_mobile_results(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步请求并解析移动端搜索结果（不登记已爬取ID、不保存数据）"""
+        response = await self._get(
+            self._build_mobile_search_url(keyword, page),
+            headers=self._get_mobile_headers()
+        )
+        return self._handle_mobile_response(response, keyword)
+    
+    async def search_content(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """异步搜索微博内容 - 优先移动端，无结果时回退网页端"""
+        results = await self.search_weibo_mobile(keyword, page)
+        if results:
+            return results
+        return await self.search_weibo(keyword, page)
+    
+    async def hedged_search(self, keyword: str, page: int = 1, use_mobile: bool = True) -> List[Dict[str, Any]]:
+        """异步对冲请求：落败一方的请求会被取消"""
+        (primary, primary_type), (secondary, secondary_type) = self._get_search_fetchers(use_mobile)
+        
+        label, weibo_list = await self.hedger.run_async(
+            lambda: primary(keyword, page),
+            lambda: secondary(keyword, page)
+        )
+        return self._commit_results(weibo_list, page, primary_type if label == PRIMARY else secondary_type)
+    
+    async def _search_once(self, keyword: str, page: int = 1, use_mobile: bool = True) -> List[Dict[str, Any]]:
+        """异步单次爬取：主接口无结果时回退备用接口；两个接口都请求失败时抛出异常"""
+        if self.hedger.enabled:
+            return await self.hedged_search(keyword, page, use_mobile)
+        
+        last_error = None
+        responded = False
+        for fetch, data_type in self._get_search_fetchers(use_mobile):
+            try:
+                weibo_list = await fetch(keyword, page)
+            except Exception as e:
+                logger.warning(f"[异步] {data_type} 请求失败: {e}")
+                last_error = e
+                continue
+            
+            if weibo_list:
+                return self._commit_results(weibo_list, page, data_type)
+            responded = True
+        
+        if not responded and last_error is not None:
+            raise last_error
+        return []
+    
+    async def crawl_with_retry(self, keyword: str, page: int = 1, use_mobile: bool = True) -> List[Dict[str, Any]]:
+        """带重试机制的异步爬取"""
+        try:
+            return await self.retry_policy.call_async(
+                lambda: self._search_once(keyword, page, use_mobile),
+                description=f"第 {page} 页",
+                on_retry=self._rotate_user_agent
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"[异步] 第 {page} 页爬取失败: {e}")
+            return []
@@ -12,17 +12,25 @@ from typing import Dict, List, Optional, Any
 from urllib.parse import urlencode
 
 from utils.data_storage_manager import DataStorageManager
-from utils.helpers import get_random_user_agent
+from crawler.request_mixin import RequestMixin
+from utils.helpers import get_random_user_agent, detect_block_signal
+from utils.rate_limiter import HostRateLimiter
+from utils.adaptive_throttle import AdaptiveThrottle
+from utils.circuit_breaker import CircuitOpenError
+from utils.bounded_id_set import BoundedIdSet
 
 logger = logging.getLogger(__name__)
 
-class BaseSpider(ABC):
+class BaseSpider(RequestMixin, ABC):
     """爬虫基础抽象类"""
     
-    def __init__(self, storage_manager: DataStorageManager = None):
+    def __init__(self, storage_manager: DataStorageManager = None, rate_limiter: HostRateLimiter = None,
+                 throttle: AdaptiveThrottle = None):
         self.session = requests.Session()
         self.storage_manager = storage_manager
-        self.crawled_ids = set()
+        self.crawled_ids = BoundedIdSet()
+        self.sort_by_time = False  # 增量模式下按发布时间排序搜索
+        self._setup_request_controls(rate_limiter, throttle)
         
         # 设置基础请求头
         self.session.headers.update({
@@ -58,12 +66,7 @@ class BaseSpider(ABC):
         """设置会话配置 - 子类可重写"""
         config = self.get_platform_config()
         
-        # 设置代理
-        if config.get('proxy_config', {}).get('enabled'):
-            proxies = config['proxy_config'].get('proxies', [])
-            if proxies:
-                proxy = random.choice(proxies)
-                self.session.proxies = {'http': proxy, 'https': proxy}
+        # 代理由共享代理池按请求轮换（见 RequestMixin._get）
         
         # 设置Cookie
         cookie_config = config.get('cookie_config', {})
@@ -78,49 +81,50 @@ class BaseSpider(ABC):
         """获取Cookie域名 - 子类可重写"""
         return f".{self.get_platform_name().lower()}.com"
     
-    def crawl_with_retry(self, keyword: str, page: int = 1, max_retries: int = 3) -> List[Dict[str, Any]]:
-        """带重试机制的爬取"""
-        for attempt in range(max_retries):
-            try:
-                results = self.search_content(keyword, page)
-                if results:
-                    return results
-                
-                logger.warning(f"第 {attempt + 1} 次尝试未获取到数据")
-                
-            except Exception as e:
-                logger.warning(f"第 {attempt + 1} 次尝试失败: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(random.uniform(2, 5))
-                    # 更换User-Agent
-                    self.session.headers['User-Agent'] = get_random_user_agent()
-        
-        logger.error(f"爬取失败，已重试 {max_retries} 次")
-        return []
+    def crawl_with_retry(self, keyword: str, page: int = 1, max_retries: int = None) -> List[Dict[str, Any]]:
+        """带重试机制的爬取 - 网络错误与限流按重试策略退避重试，正常响应但无数据时不再重试"""
+        try:
+            return self.retry_policy.call(
+                lambda: self.search_content(keyword, page),
+                max_attempts=max_retries,
+                description=f"第 {page} 页",
+                on_retry=self._rotate_user_agent
+            )
+        except CircuitOpenError:
+            # 熔断由爬取循环等待冷却后处理
+            raise
+        except Exception as e:
+            logger.error(f"第 {page} 页爬取失败: {e}")
+            return []
     
     def random_delay(self, min_delay: float = 1.0, max_delay: float = 3.0):
-        """随机延迟"""
+        """随机延迟（启用限速器时由令牌桶控制节奏，无需额外等待）"""
+        if self.rate_limiter.enabled:
+            return
+        
         delay = random.uniform(min_delay, max_delay)
         logger.debug(f"等待 {delay:.2f} 秒")
         time.sleep(delay)
     
     def validate_response(self, response: requests.Response) -> bool:
-        """验证响应是否有效"""
-        if response.status_code != 200:
-            logger.warning(f"响应状态码异常: {response.status_code}")
-            return False
+        """验证响应是否有效（验证失败计入平台熔断器）"""
+        signal = detect_block_signal(response)
         
-        # 检查是否被重定向到登录页面
-        if 'login' in response.url.lower() or '登录' in response.text:
-            logger.warning("检测到被重定向到登录页面")
-            return False
+        if signal is None:
+            return True
         
-        # 检查是否包含反爬虫提示
-        if '验证码' in response.text or 'captcha' in response.text.lower():
+        self.circuit_breaker.record_failure(signal)
+        
+        if signal == 'login':
+            # 检查是否被重定向到登录页面
+            logger.warning("检测到被重定向到登录页面")
+        elif signal == 'captcha':
+            # 检查是否包含反爬虫提示
             logger.warning("检测到验证码或反爬虫机制")
-            return False
+        else:
+            logger.warning(f"响应状态码异常: {response.status_code}")
         
-        return True
+        return False
     
     def save_raw_data(self, data: List[Dict[str, Any]], page: int = None):
         """保存原始数据 - 传递平台信息"""
@@ -128,11 +132,25 @@ class BaseSpider(ABC):
             platform_name = self.get_platform_name().lower()
             self.storage_manager.save_raw_data(data, page, f"{platform_name}_data", platform_name)
     
+    def _commit_results(self, content_list: List[Dict[str, Any]], page: int = None) -> List[Dict[str, Any]]:
+        """登记已爬取ID并保存原始数据 - 只对最终采用的结果调用"""
+        # 并发爬取时其他页面可能已登记同一条内容，这里再过滤一次
+        content_list = [item for item in content_list if item['_id'] not in self.crawled_ids]
+        self.crawled_ids.update(item['_id'] for item in content_list)
+        self.save_raw_data(content_list, page)
+        return content_list
+    
     def get_statistics(self) -> Dict[str, Any]:
         """获取爬取统计信息"""
         return {
             'platform': self.get_platform_name(),
             'crawled_count': len(self.crawled_ids),
             'session_cookies': len(self.session.cookies),
+            'rate_limits': self.rate_limiter.get_statistics(),
+            'throttle': self.throttle.get_statistics(self.get_platform_name()),
+            'proxies': self.proxy_pool.get_statistics() if self.proxy_pool else {},
+            'hedging': self.hedger.get_statistics(),
+            'retry': self.retry_policy.get_statistics(),
+            'circuit_breaker': self.circuit_breaker.get_state(),
             'session_headers': dict(self.session.headers)
         }
\ No newline at end of file
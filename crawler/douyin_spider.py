@@ -2,7 +2,6 @@
 抖音爬虫核心模块
 """
 import requests
-import json
 import time
 import random
 import re
@@ -19,14 +18,18 @@ from config.settings import (
 from crawler.base_spider import BaseSpider
 from utils.data_processor import DataProcessor
 from utils.helpers import get_random_user_agent, parse_weibo_time
+from utils.hedging import PRIMARY
+from utils.retry_policy import raise_for_signal
+from utils.circuit_breaker import CircuitOpenError
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
 class DouyinSpider(BaseSpider):
     """抖音爬虫类"""
     
-    def __init__(self, storage_manager=None):
-        super().__init__(storage_manager)
+    def __init__(self, storage_manager=None, rate_limiter=None, throttle=None):
+        super().__init__(storage_manager, rate_limiter, throttle)
         self.data_processor = DataProcessor()
         
         # 设置抖音移动端请求头 - 避免复杂Cookie认证
@@ -71,11 +74,15 @@ class DouyinSpider(BaseSpider):
             
             # 优先尝试移动端API接口
             mobile_url = DOUYIN_URLS.get('search_url_mobile', DOUYIN_URLS['search_url'])
+            backup_url = DOUYIN_URLS.get('search_url_backup', DOUYIN_URLS['search_url'])
+            
+            if self.hedger.enabled:
+                return self.hedged_search(keyword, page, params, mobile_url, backup_url)
             
             logger.info(f"尝试移动端API: {mobile_url}")
             
             # 发送搜索请求
-            response = self.session.get(
+            response = self._get(
                 mobile_url,
                 params=params,
                 timeout=CRAWLER_CONFIG['timeout']
@@ -84,39 +91,61 @@ class DouyinSpider(BaseSpider):
             # 如果移动端失败，尝试PC端备用接口
             if not self.validate_response(response):
                 logger.warning("移动端API失败，尝试PC端备用接口")
-                backup_url = DOUYIN_URLS.get('search_url_backup', DOUYIN_URLS['search_url'])
-                response = self.session.get(
+                response = self._get(
                     backup_url,
                     params=params,
                     timeout=CRAWLER_CONFIG['timeout']
                 )
             
-            # 验证响应并尝试解析
-            if self.validate_response(response):
-                logger.info(f"API响应成功，状态码: {response.status_code}")
-                
-                # 解析搜索结果
-                content_list = self._parse_search_response(response.text, keyword)
-                
-                if content_list:
-                    logger.info(f"✅ 成功获取到 {len(content_list)} 条真实抖音数据")
-                    # 保存原始数据
-                    self.save_raw_data(content_list, page)
-                    return content_list
-                else:
-                    logger.warning("响应成功但未解析到有效数据")
-            else:
-                logger.warning(f"API响应验证失败，状态码: {response.status_code}")
-            
-            # 如果真实API失败，返回空列表
-            logger.warning("未能获取到真实抖音数据，返回空列表")
-            return []
+            content_list = self._handle_search_response(response, keyword)
+            return self._commit_results(content_list, page)
             
         except Exception as e:
+            # 网络错误与限流交由重试策略处理，熔断交由爬取循环处理
+            if isinstance(e, CircuitOpenError) or self.retry_policy.is_retryable(e):
+                raise
             logger.error(f"搜索抖音内容失败: {e}")
             # 发生异常时返回空列表
             return []
     
+    def hedged_search(self, keyword: str, page: int, params: Dict[str, Any],
+                      mobile_url: str, backup_url: str) -> List[Dict[str, Any]]:
+        """对冲请求：移动端超过对冲等待时间未返回时并行请求PC端备用接口，采用先返回有效结果的一方"""
+        label, content_list = self.hedger.run(
+            lambda: self._fetch_search_results(mobile_url, params, keyword),
+            lambda: self._fetch_search_results(backup_url, params, keyword)
+        )
+        logger.info(f"对冲请求采用{'移动端API' if label == PRIMARY else 'PC端备用接口'}的结果")
+        return self._commit_results(content_list, page)
+    
+    def _fetch_search_results(self, url: str, params: Dict[str, Any], keyword: str) -> List[Dict[str, Any]]:
+        """请求单个搜索接口并解析（不登记已爬取ID、不保存数据）"""
+        response = self._get(url, params=params, timeout=CRAWLER_CONFIG['timeout'])
+        return self._handle_search_response(response, keyword)
+    
+    def _handle_search_response(self, response, keyword: str) -> List[Dict[str, Any]]:
+        """验证并解析搜索响应（同步/异步请求共用）"""
+        # 验证响应并尝试解析
+        if self.validate_response(response):
+            logger.info(f"API响应成功，状态码: {response.status_code}")
+            
+            # 解析搜索结果
+            content_list = self._parse_search_response(response.text, keyword)
+            
+            if content_list:
+                logger.info(f"✅ 成功获取到 {len(content_list)} 条真实抖音数据")
+                return content_list
+            else:
+                logger.warning("响应成功但未解析到有效数据")
+        else:
+            # 限流/封禁及服务端错误抛出可重试异常
+            raise_for_signal(response)
+            logger.warning(f"API响应验证失败，状态码: {response.status_code}")
+        
+        # 如果真实API失败，返回空列表
+        logger.warning("未能获取到真实抖音数据，返回空列表")
+        return []
+    
     def _build_search_params(self, keyword: str, page: int = 1) -> Dict[str, Any]:
         """构建移动端搜索参数 - 简化参数避免复杂认证"""
         # 移动端基础参数（更简化）
@@ -133,7 +162,7 @@ class DouyinSpider(BaseSpider):
             'search_source': 'normal_search',
             'query_correct_type': '1',
             'is_filter_search': '0',
-            'sort_type': '0',  # 综合排序
+            'sort_type': '2' if self.sort_by_time else '0',  # 2: 最新发布, 0: 综合排序
             'publish_time': '0',  # 不限时间
             
             # 简化的版本信息
@@ -177,18 +206,21 @@ class DouyinSpider(BaseSpider):
         return hashlib.md5(device_info.encode()).hexdigest()[:16]
 
     def _parse_search_response(self, response_text: str, keyword: str) -> List[Dict[str, Any]]:
-        """解析搜索响应"""
+        """解析搜索响应（只读检查已爬取ID，登记由 _commit_results 完成）"""
         content_list = []
+        seen_ids = set()
         
         try:
             # 尝试解析JSON响应
             if response_text.startswith('{'):
-                json_data = json.loads(response_text)
+                json_data = json_codec.loads(response_text)
                 
                 # 检查响应状态
                 if json_data.get('status_code') != 0:
                     logger.warning(f"API响应错误: {json_data.get('status_msg', '未知错误')}")
+                    self.circuit_breaker.record_failure(f"api_status_{json_data.get('status_code')}")
                     return []
+                self.circuit_breaker.record_success()
                 
                 # 提取视频数据
                 data = json_data.get('data', [])
@@ -196,17 +228,18 @@ class DouyinSpider(BaseSpider):
                     if isinstance(item, dict) and 'aweme_info' in item:
                         aweme_info = item['aweme_info']
                         parsed_item = self.parse_content_item(aweme_info, keyword)
-                        if parsed_item and parsed_item['_id'] not in self.crawled_ids:
+                        if parsed_item and parsed_item['_id'] not in self.crawled_ids and parsed_item['_id'] not in seen_ids:
                             content_list.append(parsed_item)
-                            self.crawled_ids.add(parsed_item['_id'])
+                            seen_ids.add(parsed_item['_id'])
             
             else:
                 # 如果不是JSON，尝试从HTML中提取数据
+                self.circuit_breaker.record_success()
                 content_list = self._parse_html_response(response_text, keyword)
             
             logger.info(f"解析到 {len(content_list)} 条抖音内容")
             
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.error(f"JSON解析失败: {e}")
             # 尝试HTML解析
             content_list = self._parse_html_response(response_text, keyword)
@@ -218,6 +251,7 @@ class DouyinSpider(BaseSpider):
     def _parse_html_response(self, html: str, keyword: str) -> List[Dict[str, Any]]:
         """解析HTML响应（备用方案）"""
         content_list = []
+        seen_ids = set()
         
         try:
             # 更新正则表达式匹配抖音最新数据格式
@@ -226,16 +260,16 @@ class DouyinSpider(BaseSpider):
             
             if match:
                 json_str = unquote(match.group(1))  # 处理URL编码
-                json_data = json.loads(json_str)
+                json_data = json_codec.loads(json_str)
                 
                 # 更新视频数据提取逻辑
                 videos = self._extract_videos_from_json(json_data)
                 
                 for video_data in videos:
                     parsed_item = self.parse_content_item(video_data, keyword)
-                    if parsed_item and parsed_item['_id'] not in self.crawled_ids:
+                    if parsed_item and parsed_item['_id'] not in self.crawled_ids and parsed_item['_id'] not in seen_ids:
                         content_list.append(parsed_item)
-                        self.crawled_ids.add(parsed_item['_id'])
+                        seen_ids.add(parsed_item['_id'])
             
             logger.info(f"从HTML解析到 {len(content_list)} 条抖音内容")
             
@@ -332,7 +366,7 @@ class DouyinSpider(BaseSpider):
                 'music_title': music_title,
                 'music_author': music_author,
                 'location': location,
-                'hashtags': json.dumps(hashtags) if hashtags else None,
+                'hashtags': json_codec.dumps(hashtags) if hashtags else None,
                 'digg_count': digg_count,
                 'comment_count': comment_count,
                 'share_count': share_count,
@@ -343,7 +377,8 @@ class DouyinSpider(BaseSpider):
                 'user_verified': user_verified,
                 'url': f"https://www.douyin.com/video/{aweme_id}",
                 'keyword': keyword,
-                'platform': 'douyin'
+                'platform': 'douyin',
+                'content_cluster_id': None  # 入库前由近似重复检测填写
             }
             
         except Exception as e:
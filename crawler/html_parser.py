@@ -0,0 +1,216 @@
+"""
+微博搜索网页解析后端
+从搜索结果页中提取每个 card-wrap 卡片的原始字段，可在 bs4 / lxml / selectolax 之间切换（PARSER_CONFIG），
+各后端产出的字段相同，由 WeiboSpider._extract_weibo_from_card 组装为微博数据
+"""
+import re
+import html as html_lib
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Tuple
+
+from config.settings import PARSER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 微博链接 /{用户ID}/{微博ID}
+CARD_LINK_PATTERN = re.compile(r'/\d+/[A-Za-z0-9]+')
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+def _class_xpath(tag: str, class_name: str) -> str:
+    """匹配 class 属性中包含指定类名的元素（与 bs4 的 class_ 匹配规则一致）"""
+    return f'{tag}[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+
+class WeiboCardParser(ABC):
+    """解析后端基类
+
+    parse 返回 (页面标题, 卡片字段列表)，卡片字段为：
+    content（p.txt 文本，不存在为None）、link（第一个微博链接的href，不存在为None）、
+    user_name（a.name 文本，不存在为空字符串）、time_text（a.time 文本，不存在为None）、
+    actions（div.card-act 中各链接的文本）；文本均为各文本节点去除首尾空白后直接拼接
+    """
+
+    name = ''
+
+    @abstractmethod
+    def parse(self, html: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """解析搜索结果页，返回 (页面标题, 卡片字段列表)"""
+        pass
+
+class BeautifulSoupCardParser(WeiboCardParser):
+    """BeautifulSoup + html.parser 后端（纯Python，最慢）
+
+    PARSER_CONFIG['bs4_parse_only'] 开启时用 SoupStrainer 只构建 card-wrap 卡片的子树，
+    脚本、导航等其余部分不生成节点；页面标题直接从源码中截取。
+    没有找到卡片时才完整解析一次页面，用于记录页面结构。
+    """
+
+    name = 'bs4'
+
+    def __init__(self, parse_only: bool = None):
+        from bs4 import BeautifulSoup, SoupStrainer
+        self._soup_class = BeautifulSoup
+        self._strainer = SoupStrainer('div', class_='card-wrap')
+        self.parse_only = PARSER_CONFIG.get('bs4_parse_only', True) if parse_only is None else parse_only
+
+    def parse(self, html: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        if not self.parse_only:
+            soup = self._soup_class(html, 'html.parser')
+            title = soup.find('title')
+            cards = soup.find_all('div', class_='card-wrap')
+            if not cards:
+                self._log_structure(soup)
+            return (title.get_text() if title else None), [self._extract_fields(card) for card in cards]
+
+        match = TITLE_PATTERN.search(html)
+        title = html_lib.unescape(match.group(1)) if match else None
+        cards = self._soup_class(html, 'html.parser', parse_only=self._strainer).find_all('div', class_='card-wrap')
+        if not cards:
+            self._log_structure(self._soup_class(html, 'html.parser'))
+        return title, [self._extract_fields(card) for card in cards]
+
+    @staticmethod
+    def _extract_fields(card) -> Dict[str, Any]:
+        content_elem = card.find('p', class_='txt')
+        link_elem = card.find('a', href=CARD_LINK_PATTERN)
+        user_elem = card.find('a', class_='name')
+        time_elem = card.find('a', class_='time')
+        action_elem = card.find('div', class_='card-act')
+        return {
+            'content': content_elem.get_text(strip=True) if content_elem else None,
+            'link': link_elem.get('href', '') if link_elem else None,
+            'user_name': user_elem.get_text(strip=True) if user_elem else '',
+            'time_text': time_elem.get_text(strip=True) if time_elem else None,
+            'actions': [link.get_text(strip=True) for link in action_elem.find_all('a')] if action_elem else []
+        }
+
+    @staticmethod
+    def _log_structure(soup):
+        """未找到card-wrap时记录页面结构，便于排查页面改版"""
+        logger.info("[调试] 未找到card-wrap，尝试其他选择器...")
+        alternative_selectors = [
+            'div[class*="card"]',
+            'div[class*="weibo"]',
+            'div[class*="feed"]',
+            'div[class*="content"]',
+            '.m-con-box',
+            '.WB_feed',
+            '.WB_cardwrap'
+        ]
+
+        for selector in alternative_selectors:
+            elements = soup.select(selector)
+            if elements:
+                logger.info(f"[调试] 使用选择器 '{selector}' 找到 {len(elements)} 个元素")
+                break
+        else:
+            logger.warning("[调试] 所有选择器都未找到匹配元素")
+
+            body = soup.find('body')
+            if body:
+                main_divs = body.find_all('div', limit=10)
+                logger.info(f"[调试] 页面主要div元素的class属性:")
+                for i, div in enumerate(main_divs):
+                    logger.info(f"[调试] Div {i}: class={div.get('class', [])}")
+
+class LxmlCardParser(WeiboCardParser):
+    """lxml 后端（libxml2，C实现）"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._cards = etree.XPath(f'//{_class_xpath("div", "card-wrap")}')
+        self._content = etree.XPath(f'.//{_class_xpath("p", "txt")}')
+        self._links = etree.XPath('.//a[@href]')
+        self._user = etree.XPath(f'.//{_class_xpath("a", "name")}')
+        self._time = etree.XPath(f'.//{_class_xpath("a", "time")}')
+        self._action = etree.XPath(f'.//{_class_xpath("div", "card-act")}')
+        self._action_links = etree.XPath('.//a')
+        self._text_nodes = etree.XPath('.//text()')
+
+    def _text(self, element) -> str:
+        return ''.join(text.strip() for text in self._text_nodes(element))
+
+    def _first_text(self, xpath, card) -> Optional[str]:
+        elements = xpath(card)
+        return self._text(elements[0]) if elements else None
+
+    def parse(self, html: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        if not html or not html.strip():
+            return None, []
+        try:
+            root = self._html.fromstring(html)
+        except ValueError:
+            # 带编码声明的文档不能以字符串解析
+            root = self._html.fromstring(html.encode('utf-8'))
+
+        title = root.find('.//title')
+        return (self._text(title) if title is not None else None), [self._extract_fields(card) for card in self._cards(root)]
+
+    def _extract_fields(self, card) -> Dict[str, Any]:
+        link = next((element.get('href') for element in self._links(card)
+                     if CARD_LINK_PATTERN.search(element.get('href'))), None)
+        actions = self._action(card)
+        return {
+            'content': self._first_text(self._content, card),
+            'link': link,
+            'user_name': self._first_text(self._user, card) or '',
+            'time_text': self._first_text(self._time, card),
+            'actions': [self._text(element) for element in self._action_links(actions[0])] if actions else []
+        }
+
+class SelectolaxCardParser(WeiboCardParser):
+    """selectolax 后端（lexbor，C实现，CSS选择器）"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    @staticmethod
+    def _text(node) -> str:
+        return node.text(deep=True, separator='', strip=True)
+
+    def _first_text(self, card, selector: str) -> Optional[str]:
+        node = card.css_first(selector)
+        return self._text(node) if node is not None else None
+
+    def parse(self, html: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        tree = self._parser_class(html)
+        title = tree.css_first('title')
+        return (self._text(title) if title is not None else None), [self._extract_fields(card) for card in tree.css('div.card-wrap')]
+
+    def _extract_fields(self, card) -> Dict[str, Any]:
+        link = next((node.attributes['href'] for node in card.css('a[href]')
+                     if CARD_LINK_PATTERN.search(node.attributes['href'] or '')), None)
+        action = card.css_first('div.card-act')
+        return {
+            'content': self._first_text(card, 'p.txt'),
+            'link': link,
+            'user_name': self._first_text(card, 'a.name') or '',
+            'time_text': self._first_text(card, 'a.time'),
+            'actions': [self._text(node) for node in action.css('a')] if action is not None else []
+        }
+
+CARD_PARSERS = {
+    'bs4': BeautifulSoupCardParser,
+    'lxml': LxmlCardParser,
+    'selectolax': SelectolaxCardParser,
+}
+
+def create_card_parser(backend: str = None) -> WeiboCardParser:
+    """按配置创建解析后端，依赖未安装时退回 bs4"""
+    backend = backend or PARSER_CONFIG['html_backend']
+    if backend not in CARD_PARSERS:
+        logger.warning(f"未知的HTML解析后端: {backend}，使用 bs4")
+        backend = 'bs4'
+
+    try:
+        return CARD_PARSERS[backend]()
+    except ImportError as e:
+        logger.warning(f"HTML解析后端 {backend} 不可用（{e}），使用 bs4")
+        return BeautifulSoupCardParser()
@@ -0,0 +1,90 @@
+"""
+爬虫出站请求混入类
+统一处理主机限速、自适应限速与代理池，微博/抖音爬虫共用
+"""
+import time
+import logging
+from typing import Optional
+
+import requests
+
+from utils.helpers import detect_block_signal, get_random_user_agent
+from utils.rate_limiter import HostRateLimiter, get_rate_limiter
+from utils.adaptive_throttle import AdaptiveThrottle, get_adaptive_throttle
+from utils.proxy_pool import get_proxy_pool
+from utils.hedging import HedgedRequester
+from utils.retry_policy import RetryPolicy
+from utils.circuit_breaker import get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+class RequestMixin:
+    """出站请求混入类
+
+    使用方需要提供 self.session（requests.Session，保存请求头与Cookie）
+    以及 get_platform_name() 方法。
+    """
+
+    def _setup_request_controls(self, rate_limiter: HostRateLimiter = None, throttle: AdaptiveThrottle = None):
+        """初始化限速器、代理池与熔断器（默认使用进程内共享实例）及本爬虫的对冲请求执行器、重试策略"""
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.throttle = throttle or get_adaptive_throttle()
+        self.proxy_pool = get_proxy_pool()
+        self.circuit_breaker = get_circuit_breaker(self.get_platform_name())
+        self.hedger = HedgedRequester()
+        self.retry_policy = RetryPolicy()
+    
+    def _rotate_user_agent(self):
+        """更换User-Agent（重试前调用）"""
+        self.session.headers['User-Agent'] = get_random_user_agent()
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """发送GET请求 - 所有出站请求统一经过熔断器、主机限速、自适应限速与代理池"""
+        # 平台熔断期间直接抛出 CircuitOpenError，不占用代理与限速配额
+        self.circuit_breaker.before_request()
+        
+        platform = self.get_platform_name()
+        proxy = self.proxy_pool.acquire() if self.proxy_pool else None
+
+        try:
+            self.rate_limiter.acquire(url)
+            self.throttle.acquire(platform, proxy)
+        except BaseException:
+            # 等待限速期间被中断时释放代理的在途计数，不计入代理健康度
+            if proxy:
+                self.proxy_pool.release(proxy)
+            raise
+
+        start_time = time.monotonic()
+        try:
+            response = self._send(url, proxy, **kwargs)
+        except Exception:
+            if proxy:
+                self.proxy_pool.report(proxy, None, error=True)
+            raise
+        except BaseException:
+            # 发送过程中被中断（如 KeyboardInterrupt）只释放在途计数
+            if proxy:
+                self.proxy_pool.release(proxy)
+            raise
+
+        signal = detect_block_signal(response)
+        if proxy:
+            self.proxy_pool.report(proxy, time.monotonic() - start_time, signal)
+        self.throttle.record(platform, proxy, signal)
+        return response
+
+    def _send(self, url: str, proxy: Optional[str], **kwargs) -> requests.Response:
+        """通过代理对应的keep-alive会话发送请求，请求头与Cookie以主会话为准"""
+        if not proxy:
+            return self.session.get(url, **kwargs)
+
+        headers = dict(self.session.headers)
+        headers.update(kwargs.pop('headers', None) or {})
+
+        response = self.proxy_pool.get_session(proxy).get(
+            url, headers=headers, cookies=self.session.cookies, **kwargs
+        )
+        # 服务端下发的Cookie同步回主会话，供后续经其他代理的请求使用
+        self.session.cookies.update(response.cookies)
+        return response
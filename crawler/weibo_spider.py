@@ -2,7 +2,6 @@
 微博爬虫核心模块
 """
 import requests
-import json
 import time
 import random
 import re
@@ -10,23 +9,36 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlencode, quote
-from bs4 import BeautifulSoup
+from pathlib import Path
 
-from config.settings import CRAWLER_CONFIG, USER_AGENTS, PROXY_CONFIG, WEIBO_URLS, COOKIE_CONFIG
+from config.settings import CRAWLER_CONFIG, USER_AGENTS, WEIBO_URLS, COOKIE_CONFIG, PARSER_CONFIG
 from utils.data_processor import DataProcessor
 from utils.data_storage_manager import DataStorageManager
-from utils.helpers import get_random_user_agent, parse_weibo_time
+from crawler.request_mixin import RequestMixin
+from crawler.html_parser import create_card_parser
+from utils.helpers import get_random_user_agent, parse_weibo_time, is_login_redirect
+from utils.rate_limiter import HostRateLimiter
+from utils.adaptive_throttle import AdaptiveThrottle
+from utils.hedging import PRIMARY
+from utils.retry_policy import raise_for_signal
+from utils.circuit_breaker import CircuitOpenError
+from utils.bounded_id_set import BoundedIdSet
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
-class WeiboSpider:
+class WeiboSpider(RequestMixin):
     """微博爬虫类"""
     
-    def __init__(self, storage_manager: DataStorageManager = None):
+    def __init__(self, storage_manager: DataStorageManager = None, rate_limiter: HostRateLimiter = None,
+                 throttle: AdaptiveThrottle = None):
         self.session = requests.Session()
         self.data_processor = DataProcessor()
+        self.card_parser = create_card_parser()
         self.storage_manager = storage_manager
-        self.crawled_ids = set()
+        self.crawled_ids = BoundedIdSet()
+        self.sort_by_time = False  # 增量模式下按发布时间排序搜索
+        self._setup_request_controls(rate_limiter, throttle)
         
         # 设置请求头
         self.session.headers.update({
@@ -38,10 +50,7 @@ class WeiboSpider:
             'Upgrade-Insecure-Requests': '1',
         })
         
-        # 设置代理（如果启用）
-        if PROXY_CONFIG['enabled'] and PROXY_CONFIG['proxies']:
-            proxy = random.choice(PROXY_CONFIG['proxies'])
-            self.session.proxies = {'http': proxy, 'https': proxy}
+        # 代理由共享代理池按请求轮换（见 RequestMixin._get）
         
         # 配置Cookie
         if COOKIE_CONFIG['enabled']:
@@ -57,61 +66,15 @@ class WeiboSpider:
             if cookie_count == 0:
                 logger.warning("[Cookie] 未配置有效Cookie，可能影响爬取效果")
     
+    def get_platform_name(self) -> str:
+        """获取平台名称"""
+        return "Weibo"
+    
     def search_weibo(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
         """搜索微博数据"""
         try:
-            # 构建搜索URL
-            params = {
-                'q': keyword,
-                'typeall': '1',
-                'suball': '1',
-                'timescope': '',
-                'category': '4',
-                'intpicture': '',
-                'f': '1',
-                'realip': '1',
-                'topsug': '1',
-                'sug': '1',
-                'atten': '1',
-                'Refer': 'g',
-                'page': page
-            }
-            
-            search_url = f"{WEIBO_URLS['search_url']}?{urlencode(params)}"
-            
-            # 发送请求
-            response = self.session.get(
-                search_url,
-                timeout=CRAWLER_CONFIG['timeout'],
-                headers={'User-Agent': get_random_user_agent()}
-            )
-            
-            if response.status_code == 200:
-                # 添加调试日志：记录响应信息
-                logger.info(f"[调试] 搜索请求成功，状态码: {response.status_code}")
-                logger.info(f"[调试] 响应头: {dict(response.headers)}")
-                logger.info(f"[调试] 响应内容长度: {len(response.text)} 字符")
-                logger.info(f"[调试] 响应内容前500字符: {response.text[:500]}")
-                
-                # 检查是否被重定向到登录页面
-                if 'login' in response.url.lower() or '登录' in response.text:
-                    logger.warning("[调试] 检测到被重定向到登录页面")
-                
-                # 检查是否包含反爬虫提示
-                if '验证码' in response.text or 'captcha' in response.text.lower():
-                    logger.warning("[调试] 检测到验证码或反爬虫机制")
-                
-                # 解析搜索结果
-                weibo_list = self._parse_search_results(response.text, keyword)
-                
-                # 保存原始数据
-                if self.storage_manager and weibo_list:
-                    self.storage_manager.save_raw_data(weibo_list, page, "weibo_web", "weibo")
-                
-                return weibo_list
-            else:
-                logger.warning(f"搜索请求失败，状态码: {response.status_code}")
-                return []
+            weibo_list = self._fetch_web_results(keyword, page)
+            return self._commit_results(weibo_list, page, "weibo_web")
                 
         except Exception as e:
             logger.error(f"搜索微博失败: {e}")
@@ -120,125 +83,195 @@ class WeiboSpider:
     def search_weibo_mobile(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
         """使用移动端API搜索微博"""
         try:
-            # 移动端搜索参数
+            weibo_list = self._fetch_mobile_results(keyword, page)
+            return self._commit_results(weibo_list, page, "weibo_mobile")
+                
+        except Exception as e:
+            logger.error(f"移动端搜索失败: {e}")
+            return []
+    
+    def _fetch_web_results(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """请求并解析网页端搜索结果（不登记已爬取ID、不保存数据，可用于对冲请求）"""
+        response = self._get(
+            self._build_search_url(keyword, page),
+            timeout=CRAWLER_CONFIG['timeout'],
+            headers={'User-Agent': get_random_user_agent()}
+        )
+        return self._handle_search_response(response, keyword)
+    
+    def _fetch_mobile_results(self, keyword: str, page: int = 1) -> List[Dict[str, Any]]:
+        """请求并解析移动端搜索结果（不登记已爬取ID、不保存数据，可用于对冲请求）"""
+        response = self._get(
+            self._build_mobile_search_url(keyword, page),
+            headers=self._get_mobile_headers(),
+            timeout=CRAWLER_CONFIG['timeout']
+        )
+        return self._handle_mobile_response(response, keyword)
+    
+    def _commit_results(self, weibo_list: List[Dict[str, Any]], page: int, data_type: str) -> List[Dict[str, Any]]:
+        """登记已爬取ID并保存原始数据 - 只对最终采用的结果调用"""
+        # 并发爬取时其他页面可能已登记同一条微博，这里再过滤一次
+        weibo_list = [weibo for weibo in weibo_list if weibo['_id'] not in self.crawled_ids]
+        self.crawled_ids.update(weibo['_id'] for weibo in weibo_list)
+        
+        # 保存原始数据
+        if self.storage_manager and weibo_list:
+            self.storage_manager.save_raw_data(weibo_list, page, data_type, "weibo")
+        
+        return weibo_list
+    
+    def _build_search_url(self, keyword: str, page: int = 1) -> str:
+        """构建网页端搜索URL"""
+        if self.sort_by_time:
+            # 实时搜索：结果按发布时间倒序
             params = {
-                'containerid': f'100103type=1&q={quote(keyword)}',
-                'page_type': 'searchall',
+                'q': keyword,
+                'rd': 'realtime',
+                'tw': 'realtime',
+                'Refer': 'weibo_realtime',
                 'page': page
             }
+            return f"{WEIBO_URLS['realtime_search_url']}?{urlencode(params)}"
+        
+        params = {
+            'q': keyword,
+            'typeall': '1',
+            'suball': '1',
+            'timescope': '',
+            'category': '4',
+            'intpicture': '',
+            'f': '1',
+            'realip': '1',
+            'topsug': '1',
+            'sug': '1',
+            'atten': '1',
+            'Refer': 'g',
+            'page': page
+        }
+        
+        return f"{WEIBO_URLS['search_url']}?{urlencode(params)}"
+    
+    def _build_mobile_search_url(self, keyword: str, page: int = 1) -> str:
+        """构建移动端搜索URL"""
+        # type=61 为实时（按发布时间倒序），type=1 为综合
+        search_type = 61 if self.sort_by_time else 1
+        params = {
+            'containerid': f'100103type={search_type}&q={quote(keyword)}',
+            'page_type': 'searchall',
+            'page': page
+        }
+        
+        return f"{WEIBO_URLS['mobile_search_url']}?{urlencode(params)}"
+    
+    def _get_mobile_headers(self) -> Dict[str, str]:
+        """移动端请求头"""
+        return {
+            'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1',
+            'Accept': 'application/json, text/plain, */*',
+            'Referer': 'https://m.weibo.cn/',
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    
+    def _handle_search_response(self, response, keyword: str) -> List[Dict[str, Any]]:
+        """处理网页端搜索响应（同步/异步请求共用）"""
+        if response.status_code == 200:
+            # 添加调试日志：记录响应信息
+            logger.info(f"[调试] 搜索请求成功，状态码: {response.status_code}")
+            logger.info(f"[调试] 响应头: {dict(response.headers)}")
+            logger.info(f"[调试] 响应内容长度: {len(response.text)} 字符")
+            logger.info(f"[调试] 响应内容前500字符: {response.text[:500]}")
+            
+            # 检查是否被重定向到登录页面（页面正文中的“登录”字样可能只是导航链接，不作判断），跳转登录页计入熔断器
+            if is_login_redirect(response.url):
+                logger.warning("[调试] 检测到被重定向到登录页面")
+                self.circuit_breaker.record_failure('login')
+            else:
+                self.circuit_breaker.record_success()
+            
+            # 检查是否包含反爬虫提示
+            if '验证码' in response.text or 'captcha' in response.text.lower():
+                logger.warning("[调试] 检测到验证码或反爬虫机制")
+            
+            if PARSER_CONFIG['sample_dir']:
+                self._save_page_sample(response.text, keyword)
+            
+            # 解析搜索结果
+            return self._parse_search_results(response.text, keyword)
+        else:
+            self.circuit_breaker.record_failure(f"status_{response.status_code}")
+            # 限流/封禁及服务端错误抛出可重试异常，其他状态码视为本页无数据
+            raise_for_signal(response)
+            logger.warning(f"搜索请求失败，状态码: {response.status_code}")
+            return []
+    
+    def _handle_mobile_response(self, response, keyword: str) -> List[Dict[str, Any]]:
+        """处理移动端搜索响应（同步/异步请求共用）"""
+        if response.status_code == 200:
+            # 添加调试日志：记录移动端响应信息
+            logger.info(f"[调试] 移动端搜索请求成功，状态码: {response.status_code}")
+            logger.info(f"[调试] 移动端响应头: {dict(response.headers)}")
             
-            mobile_url = f"{WEIBO_URLS['mobile_search_url']}?{urlencode(params)}"
-            
-            # 设置移动端请求头
-            mobile_headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1',
-                'Accept': 'application/json, text/plain, */*',
-                'Referer': 'https://m.weibo.cn/',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            response = self.session.get(
-                mobile_url,
-                headers=mobile_headers,
-                timeout=CRAWLER_CONFIG['timeout']
-            )
-            
-            if response.status_code == 200:
-                # 添加调试日志：记录移动端响应信息
-                logger.info(f"[调试] 移动端搜索请求成功，状态码: {response.status_code}")
-                logger.info(f"[调试] 移动端响应头: {dict(response.headers)}")
+            try:
+                json_data = json_codec.loads_response(response)
+                self.circuit_breaker.record_success()
+                logger.info(f"[调试] JSON响应结构: {list(json_data.keys()) if isinstance(json_data, dict) else type(json_data)}")
                 
-                try:
-                    json_data = response.json()
-                    logger.info(f"[调试] JSON响应结构: {list(json_data.keys()) if isinstance(json_data, dict) else type(json_data)}")
+                if isinstance(json_data, dict) and 'data' in json_data:
+                    data = json_data['data']
+                    logger.info(f"[调试] data字段结构: {list(data.keys()) if isinstance(data, dict) else type(data)}")
                     
-                    if isinstance(json_data, dict) and 'data' in json_data:
-                        data = json_data['data']
-                        logger.info(f"[调试] data字段结构: {list(data.keys()) if isinstance(data, dict) else type(data)}")
-                        
-                        if isinstance(data, dict) and 'cards' in data:
-                            cards = data['cards']
-                            logger.info(f"[调试] 找到 {len(cards)} 个cards")
-                            for i, card in enumerate(cards[:3]):  # 只记录前3个card的信息
-                                logger.info(f"[调试] Card {i}: type={card.get('card_type')}, keys={list(card.keys())}")
-                    
-                    # 解析移动端结果
-                    weibo_list = self._parse_mobile_results(json_data, keyword)
-                    
-                    # 保存原始数据
-                    if self.storage_manager and weibo_list:
-                        self.storage_manager.save_raw_data(weibo_list, page, "weibo_mobile", "weibo")
-                    
-                    return weibo_list
-                except json.JSONDecodeError as e:
-                    logger.error(f"[调试] JSON解析失败: {e}")
-                    logger.info(f"[调试] 原始响应内容: {response.text[:500]}")
-                    return []
-            else:
-                logger.warning(f"移动端搜索失败，状态码: {response.status_code}")
-                return []
+                    if isinstance(data, dict) and 'cards' in data:
+                        cards = data['cards']
+                        logger.info(f"[调试] 找到 {len(cards)} 个cards")
+                        for i, card in enumerate(cards[:3]):  # 只记录前3个card的信息
+                            logger.info(f"[调试] Card {i}: type={card.get('card_type')}, keys={list(card.keys())}")
                 
-        except Exception as e:
-            logger.error(f"移动端搜索失败: {e}")
+                # 解析移动端结果
+                return self._parse_mobile_results(json_data, keyword)
+            except json_codec.JSONDecodeError as e:
+                # 移动端接口返回非JSON通常是跳转到了登录/验证页面
+                self.circuit_breaker.record_failure('invalid_json')
+                logger.error(f"[调试] JSON解析失败: {e}")
+                logger.info(f"[调试] 原始响应内容: {response.text[:500]}")
+                return []
+        else:
+            self.circuit_breaker.record_failure(f"status_{response.status_code}")
+            raise_for_signal(response)
+            logger.warning(f"移动端搜索失败，状态码: {response.status_code}")
             return []
     
+    def _save_page_sample(self, html: str, keyword: str):
+        """保存搜索结果页原始HTML（PARSER_CONFIG['sample_dir']），供 benchmark_parsers.py 对比各解析后端"""
+        try:
+            sample_dir = Path(PARSER_CONFIG['sample_dir'])
+            sample_dir.mkdir(parents=True, exist_ok=True)
+            safe_keyword = re.sub(r'[\\/:*?"<>|\s]+', '_', keyword)
+            file_path = sample_dir / f"{safe_keyword}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.html"
+            file_path.write_text(html, encoding='utf-8')
+        except Exception as e:
+            logger.error(f"保存搜索页样本失败: {e}")
+    
     def _parse_search_results(self, html: str, keyword: str) -> List[Dict[str, Any]]:
-        """解析搜索结果页面"""
+        """解析搜索结果页面（只读检查已爬取ID，登记由 _commit_results 完成）"""
         weibo_list = []
+        seen_ids = set()
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
             # 添加调试日志：检查页面结构
             logger.info(f"[调试] 开始解析HTML，长度: {len(html)} 字符")
+            title, cards = self.card_parser.parse(html)
             
             # 检查页面标题
-            title = soup.find('title')
             if title:
-                logger.info(f"[调试] 页面标题: {title.get_text()}")
-            
-            # 查找微博卡片
-            cards = soup.find_all('div', class_='card-wrap')
-            logger.info(f"[调试] 找到 {len(cards)} 个card-wrap元素")
-            
-            # 如果没有找到card-wrap，尝试其他可能的选择器
-            if not cards:
-                logger.info("[调试] 未找到card-wrap，尝试其他选择器...")
-                
-                # 尝试其他可能的微博容器选择器
-                alternative_selectors = [
-                    'div[class*="card"]',
-                    'div[class*="weibo"]',
-                    'div[class*="feed"]',
-                    'div[class*="content"]',
-                    '.m-con-box',
-                    '.WB_feed',
-                    '.WB_cardwrap'
-                ]
-                
-                for selector in alternative_selectors:
-                    elements = soup.select(selector)
-                    if elements:
-                        logger.info(f"[调试] 使用选择器 '{selector}' 找到 {len(elements)} 个元素")
-                        break
-                else:
-                    logger.warning("[调试] 所有选择器都未找到匹配元素")
-                    
-                    # 记录页面的主要结构
-                    body = soup.find('body')
-                    if body:
-                        main_divs = body.find_all('div', limit=10)
-                        logger.info(f"[调试] 页面主要div元素的class属性:")
-                        for i, div in enumerate(main_divs):
-                            class_attr = div.get('class', [])
-                            logger.info(f"[调试] Div {i}: class={class_attr}")
+                logger.info(f"[调试] 页面标题: {title}")
+            logger.info(f"[调试] 找到 {len(cards)} 个card-wrap元素（解析后端: {self.card_parser.name}）")
             
             for card in cards:
                 try:
                     weibo_data = self._extract_weibo_from_card(card, keyword)
-                    if weibo_data and weibo_data['_id'] not in self.crawled_ids:
+                    if weibo_data and weibo_data['_id'] not in self.crawled_ids and weibo_data['_id'] not in seen_ids:
                         weibo_list.append(weibo_data)
-                        self.crawled_ids.add(weibo_data['_id'])
+                        seen_ids.add(weibo_data['_id'])
                 except Exception as e:
                     logger.warning(f"解析微博卡片失败: {e}")
                     continue
@@ -251,8 +284,9 @@ class WeiboSpider:
         return weibo_list
     
     def _parse_mobile_results(self, json_data: dict, keyword: str) -> List[Dict[str, Any]]:
-        """解析移动端API返回的JSON数据"""
+        """解析移动端API返回的JSON数据（只读检查已爬取ID，登记由 _commit_results 完成）"""
         weibo_list = []
+        seen_ids = set()
         
         try:
             if 'data' in json_data and 'cards' in json_data['data']:
@@ -265,9 +299,9 @@ class WeiboSpider:
                         try:
                             logger.debug(f"[调试] 处理卡片类型: {card_type}")
                             weibo_data = self._extract_weibo_from_mobile_card(card, keyword)
-                            if weibo_data and weibo_data['_id'] not in self.crawled_ids:
+                            if weibo_data and weibo_data['_id'] not in self.crawled_ids and weibo_data['_id'] not in seen_ids:
                                 weibo_list.append(weibo_data)
-                                self.crawled_ids.add(weibo_data['_id'])
+                                seen_ids.add(weibo_data['_id'])
                                 logger.debug(f"[调试] 成功提取微博数据，ID: {weibo_data['_id']}")
                         except Exception as e:
                             logger.warning(f"解析移动端微博卡片失败 (card_type={card_type}): {e}")
@@ -282,22 +316,19 @@ class WeiboSpider:
         
         return weibo_list
     
-    def _extract_weibo_from_card(self, card, keyword: str) -> Optional[Dict[str, Any]]:
-        """从网页卡片中提取微博数据"""
+    def _extract_weibo_from_card(self, card: Dict[str, Any], keyword: str) -> Optional[Dict[str, Any]]:
+        """从网页卡片字段（见 crawler.html_parser）中提取微博数据"""
         try:
             # 提取基本信息
-            content_elem = card.find('p', class_='txt')
-            if not content_elem:
+            content = card['content']
+            if content is None:
                 return None
             
-            content = content_elem.get_text(strip=True)
-            
             # 提取微博ID
-            mid_elem = card.find('a', href=re.compile(r'/\d+/[A-Za-z0-9]+'))
-            if not mid_elem:
+            href = card['link']
+            if href is None:
                 return None
             
-            href = mid_elem.get('href', '')
             mid_match = re.search(r'/(\d+)/([A-Za-z0-9]+)', href)
             if not mid_match:
                 return None
@@ -306,29 +337,23 @@ class WeiboSpider:
             mblog_id = mid_match.group(2)
             
             # 提取用户信息
-            user_elem = card.find('a', class_='name')
-            user_name = user_elem.get_text(strip=True) if user_elem else ''
+            user_name = card['user_name']
             
             # 提取时间
-            time_elem = card.find('a', class_='time')
-            created_at = parse_weibo_time(time_elem.get_text(strip=True)) if time_elem else datetime.now()
+            created_at = parse_weibo_time(card['time_text']) if card['time_text'] is not None else datetime.now()
             
             # 提取互动数据
-            action_elem = card.find('div', class_='card-act')
             reposts_count = 0
             comments_count = 0
             attitudes_count = 0
             
-            if action_elem:
-                action_links = action_elem.find_all('a')
-                for link in action_links:
-                    text = link.get_text(strip=True)
-                    if '转发' in text:
-                        reposts_count = self._extract_count(text)
-                    elif '评论' in text:
-                        comments_count = self._extract_count(text)
-                    elif '赞' in text:
-                        attitudes_count = self._extract_count(text)
+            for text in card['actions']:
+                if '转发' in text:
+                    reposts_count = self._extract_count(text)
+                elif '评论' in text:
+                    comments_count = self._extract_count(text)
+                elif '赞' in text:
+                    attitudes_count = self._extract_count(text)
             
             # 提取来源和图片
             source, pic_urls = self.data_processor.extract_source_and_pics(content)
@@ -349,7 +374,7 @@ class WeiboSpider:
                 'attitudes_count': attitudes_count,
                 'source': source,
                 'content': content,
-                'pic_urls': json.dumps(pic_urls) if pic_urls else None,
+                'pic_urls': json_codec.dumps(pic_urls) if pic_urls else None,
                 'pic_num': len(pic_urls) if pic_urls else 0,
                 'isLongText': len(content) > 140,
                 'user_id': user_id,
@@ -360,7 +385,8 @@ class WeiboSpider:
                 'user_mbtype': 0,
                 'user_verified_type': -1,
                 'url': f"https://weibo.com/{user_id}/{mblog_id}",
-                'keyword': keyword
+                'keyword': keyword,
+                'content_cluster_id': None  # 入库前由近似重复检测填写
             }
             
         except Exception as e:
@@ -416,7 +442,7 @@ class WeiboSpider:
             
             if geo:
                 geo_type = geo.get('type')
-                geo_coordinates = json.dumps(geo.get('coordinates', []))
+                geo_coordinates = json_codec.dumps(geo.get('coordinates', []))
                 geo_detail = geo.get('detail', {})
             
             # IP位置
@@ -447,7 +473,7 @@ class WeiboSpider:
                 'attitudes_count': attitudes_count,
                 'source': source,
                 'content': content,
-                'pic_urls': json.dumps(pic_urls) if pic_urls else None,
+                'pic_urls': json_codec.dumps(pic_urls) if pic_urls else None,
                 'pic_num': len(pic_urls),
                 'isLongText': mblog.get('isLongText', False),
                 'user_id': user_id,
@@ -458,7 +484,8 @@ class WeiboSpider:
                 'user_mbtype': user.get('mbtype', 0),
                 'user_verified_type': user_verified_type,
                 'url': f"https://weibo.com/{user_id}/{mid}",
-                'keyword': keyword
+                'keyword': keyword,
+                'content_cluster_id': None  # 入库前由近似重复检测填写
             }
             
         except Exception as e:
@@ -477,37 +504,65 @@ class WeiboSpider:
             return 0
     
     def crawl_with_retry(self, keyword: str, page: int = 1, use_mobile: bool = True) -> List[Dict[str, Any]]:
-        """带重试机制的爬取"""
-        for attempt in range(CRAWLER_CONFIG['retry_times']):
+        """带重试机制的爬取 - 网络错误与限流按重试策略退避重试，正常响应但无数据时不再重试"""
+        try:
+            return self.retry_policy.call(
+                lambda: self._search_once(keyword, page, use_mobile),
+                description=f"第 {page} 页",
+                on_retry=self._rotate_user_agent
+            )
+        except CircuitOpenError:
+            # 熔断由爬取循环等待冷却后处理
+            raise
+        except Exception as e:
+            logger.error(f"第 {page} 页爬取失败: {e}")
+            return []
+    
+    def _search_once(self, keyword: str, page: int = 1, use_mobile: bool = True) -> List[Dict[str, Any]]:
+        """单次爬取：主接口无结果时回退备用接口；两个接口都请求失败时抛出异常交由重试策略处理"""
+        if self.hedger.enabled:
+            return self.hedged_search(keyword, page, use_mobile)
+        
+        last_error = None
+        responded = False
+        for fetch, data_type in self._get_search_fetchers(use_mobile):
             try:
-                if use_mobile:
-                    results = self.search_weibo_mobile(keyword, page)
-                else:
-                    results = self.search_weibo(keyword, page)
-                
-                if results:
-                    return results
-                
-                # 如果没有结果，尝试另一种方式
-                if use_mobile:
-                    results = self.search_weibo(keyword, page)
-                else:
-                    results = self.search_weibo_mobile(keyword, page)
-                
-                return results
-                
+                weibo_list = fetch(keyword, page)
             except Exception as e:
-                logger.warning(f"第 {attempt + 1} 次尝试失败: {e}")
-                if attempt < CRAWLER_CONFIG['retry_times'] - 1:
-                    time.sleep(random.uniform(2, 5))
-                    # 更换User-Agent
-                    self.session.headers['User-Agent'] = get_random_user_agent()
+                logger.warning(f"{data_type} 请求失败: {e}")
+                last_error = e
+                continue
+            
+            if weibo_list:
+                return self._commit_results(weibo_list, page, data_type)
+            responded = True
         
-        logger.error(f"爬取失败，已重试 {CRAWLER_CONFIG['retry_times']} 次")
+        if not responded and last_error is not None:
+            raise last_error
         return []
     
+    def _get_search_fetchers(self, use_mobile: bool = True):
+        """主/备用搜索接口：[(请求解析函数, 数据类型), ...]"""
+        fetchers = [(self._fetch_mobile_results, "weibo_mobile"), (self._fetch_web_results, "weibo_web")]
+        if not use_mobile:
+            fetchers.reverse()
+        return fetchers
+    
+    def hedged_search(self, keyword: str, page: int = 1, use_mobile: bool = True) -> List[Dict[str, Any]]:
+        """对冲请求：主接口超过对冲等待时间未返回时并行请求备用接口，采用先返回有效结果的一方"""
+        (primary, primary_type), (secondary, secondary_type) = self._get_search_fetchers(use_mobile)
+        
+        label, weibo_list = self.hedger.run(
+            lambda: primary(keyword, page),
+            lambda: secondary(keyword, page)
+        )
+        return self._commit_results(weibo_list, page, primary_type if label == PRIMARY else secondary_type)
+    
     def random_delay(self):
-        """随机延迟"""
+        """随机延迟（启用限速器时由令牌桶控制节奏，无需额外等待）"""
+        if self.rate_limiter.enabled:
+            return
+        
         delay = random.uniform(*CRAWLER_CONFIG['delay_range'])
         logger.debug(f"等待 {delay:.2f} 秒")
         time.sleep(delay)
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+数据库连接池
+多个爬取任务、写入线程与分析查询各自借用独立连接，不再排队共用同一个连接；
+借出时检查连接健康状态，连接异常（OperationalError/InterfaceError）时丢弃并重建，空闲过久的多余连接自动关闭
+"""
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+import pymysql
+
+from config.settings import DATABASE_CONFIG, DB_POOL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 连接已不可用的异常，出现时丢弃该连接
+BROKEN_CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+class ConnectionPool:
+    """线程安全的 PyMySQL 连接池"""
+
+    def __init__(self, db_config: Dict[str, Any] = None, config: Dict[str, Any] = None):
+        self.db_config = db_config or DATABASE_CONFIG
+        self.config = config or DB_POOL_CONFIG
+        self._idle = deque()  # (连接, 归还时间)，后进先出，空闲最久的连接留在队首便于回收
+        self._size = 0  # 已创建且未关闭的连接数（空闲+借出）
+        self._closed = False
+        self._condition = threading.Condition()
+        self.stats = {'created': 0, 'discarded': 0, 'reaped': 0, 'waits': 0}
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _create_connection(self):
+        connection = pymysql.connect(
+            host=self.db_config['host'],
+            port=self.db_config['port'],
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            database=self.db_config['database'],
+            charset=self.db_config['charset'],
+            autocommit=True
+        )
+        with self._condition:
+            self.stats['created'] += 1
+        return connection
+
+    def warm_up(self):
+        """预先建立 min_size 个连接，连接失败时抛出异常"""
+        connections = [self.acquire() for _ in range(max(1, self.config['min_size']))]
+        for connection in connections:
+            self.release(connection)
+
+    def acquire(self, timeout: float = None):
+        """借出连接：优先复用空闲连接，未达上限时新建，否则等待其他线程归还"""
+        timeout = self.config['checkout_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise pymysql.err.InterfaceError("连接池已关闭")
+
+                self._reap_idle()
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    break
+                if self._size < self.config['max_size']:
+                    # 先占用名额，在锁外建立连接
+                    self._size += 1
+                    connection, released_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"等待数据库连接超时（{timeout} 秒，连接数已达上限 {self.config['max_size']}）")
+                self.stats['waits'] += 1
+                self._condition.wait(remaining)
+
+        if connection is None:
+            try:
+                return self._create_connection()
+            except Exception:
+                self._discard(None)
+                raise
+
+        # 空闲超过检查间隔的连接借出前先 ping，失败则重建
+        if time.monotonic() - released_at >= self.config['health_check_interval']:
+            try:
+                connection.ping(reconnect=False)
+            except Exception as e:
+                logger.warning(f"[连接池] 连接已失效，重新建立: {e}")
+                self._close_quietly(connection)
+                try:
+                    connection = self._create_connection()
+                except Exception:
+                    self._discard(None)
+                    raise
+        return connection
+
+    def release(self, connection, broken: bool = False):
+        """归还连接，broken=True 时直接关闭（连接出现异常时）"""
+        if broken or self._closed:
+            self._close_quietly(connection)
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self, connection):
+        with self._condition:
+            self._size -= 1
+            if connection is not None:
+                self.stats['discarded'] += 1
+            self._condition.notify()
+
+    def _reap_idle(self):
+        """关闭空闲超时且超出 min_size 的连接（调用方持有锁）"""
+        now = time.monotonic()
+        while self._idle and self._size > self.config['min_size'] \
+                and now - self._idle[0][1] >= self.config['idle_timeout']:
+            connection, _ = self._idle.popleft()
+            self._close_quietly(connection)
+            self._size -= 1
+            self.stats['reaped'] += 1
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """借用连接的上下文管理器，连接类异常时丢弃该连接，下次借出时重建"""
+        connection = self.acquire()
+        try:
+            yield connection
+        except BROKEN_CONNECTION_ERRORS:
+            self.release(connection, broken=True)
+            raise
+        except BaseException:
+            self.release(connection)
+            raise
+        else:
+            self.release(connection)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._condition:
+            return dict(self.stats, size=self._size, idle=len(self._idle), in_use=self._size - len(self._idle))
+
+    def close(self):
+        """关闭所有空闲连接，借出中的连接在归还时关闭"""
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._close_quietly(connection)
+                self._size -= 1
+            self._condition.notify_all()
+
+_shared_pool: Optional[ConnectionPool] = None
+_shared_lock = threading.Lock()
+
+def get_connection_pool() -> ConnectionPool:
+    """获取进程内共享的连接池（已关闭时重新创建）"""
+    global _shared_pool
+
+    with _shared_lock:
+        if _shared_pool is None or _shared_pool.closed:
+            _shared_pool = ConnectionPool()
+        return _shared_pool
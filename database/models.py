@@ -1,43 +1,176 @@
 """
 数据库模型定义
 """
+import os
+import re
 import pymysql
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from config.settings import DATABASE_CONFIG
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Any, Iterable
+from config.settings import DATABASE_CONFIG, DB_WRITE_CONFIG, SNAPSHOT_CONFIG
+from database.connection_pool import ConnectionPool, get_connection_pool
+from database.write_behind import WriteBehindWriter
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+WEIBO_INSERT_SQL = """
+INSERT IGNORE INTO weibo_data (
+    _id, mblogid, created_at, geo_type, geo_coordinates, geo_detail_poiid,
+    geo_detail_title, geo_detail_type, geo_detail_spot_type, ip_location,
+    reposts_count, comments_count, attitudes_count, source, content,
+    content_cluster_id, pic_urls, pic_num, isLongText, user_id, user_avatar_hd, user_nick_name,
+    user_verified, user_mbrank, user_mbtype, user_verified_type, url, keyword
+) VALUES (
+    %(_id)s, %(mblogid)s, %(created_at)s, %(geo_type)s, %(geo_coordinates)s,
+    %(geo_detail_poiid)s, %(geo_detail_title)s, %(geo_detail_type)s,
+    %(geo_detail_spot_type)s, %(ip_location)s, %(reposts_count)s,
+    %(comments_count)s, %(attitudes_count)s, %(source)s, %(content)s,
+    %(content_cluster_id)s, %(pic_urls)s, %(pic_num)s, %(isLongText)s, %(user_id)s, %(user_avatar_hd)s,
+    %(user_nick_name)s, %(user_verified)s, %(user_mbrank)s, %(user_mbtype)s,
+    %(user_verified_type)s, %(url)s, %(keyword)s
+)
+"""
+
+DOUYIN_INSERT_SQL = """
+INSERT IGNORE INTO douyin_data (
+    _id, aweme_id, created_at, content, content_cluster_id, video_url, video_cover, video_duration,
+    music_title, music_author, location, hashtags, digg_count, comment_count,
+    share_count, play_count, user_id, user_name, user_avatar, user_verified,
+    url, keyword, platform
+) VALUES (
+    %(_id)s, %(aweme_id)s, %(created_at)s, %(content)s, %(content_cluster_id)s, %(video_url)s,
+    %(video_cover)s, %(video_duration)s, %(music_title)s, %(music_author)s,
+    %(location)s, %(hashtags)s, %(digg_count)s, %(comment_count)s,
+    %(share_count)s, %(play_count)s, %(user_id)s, %(user_name)s,
+    %(user_avatar)s, %(user_verified)s, %(url)s, %(keyword)s, %(platform)s
+)
+"""
+
+# 各平台数据表的插入语句（INSERT IGNORE：_id 已存在的行影响行数为0）
+INSERT_SQL = {
+    'weibo': WEIBO_INSERT_SQL,
+    'douyin': DOUYIN_INSERT_SQL,
+}
+
+# 各平台的互动计数列，更新模式下只刷新这些列
+COUNTER_COLUMNS = {
+    'weibo': ['reposts_count', 'comments_count', 'attitudes_count'],
+    'douyin': ['digg_count', 'comment_count', 'share_count', 'play_count'],
+}
+
+# 各平台的更新插入语句：_id 已存在时只刷新互动计数，计数未变化的行不会被改写
+# 影响行数：新增为1，计数有变化为2，未变化为0
+UPSERT_SQL = {
+    platform: sql.replace('INSERT IGNORE', 'INSERT', 1).rstrip() + '\nON DUPLICATE KEY UPDATE '
+              + ', '.join(f'{column} = VALUES({column})' for column in COUNTER_COLUMNS[platform]) + '\n'
+    for platform, sql in INSERT_SQL.items()
+}
+
+# 快照表中的通用计数列与各平台数据列的对应关系（抖音独有播放数，微博为NULL）
+SNAPSHOT_COUNTERS = {
+    'weibo': {'shares': 'reposts_count', 'comments': 'comments_count', 'likes': 'attitudes_count', 'plays': None},
+    'douyin': {'shares': 'share_count', 'comments': 'comment_count', 'likes': 'digg_count', 'plays': 'play_count'},
+}
+
+SNAPSHOT_INSERT_SQL = """
+INSERT IGNORE INTO engagement_snapshots (
+    platform, post_id, snapshot_time, shares, comments, likes, plays
+) VALUES (
+    %(platform)s, %(post_id)s, %(snapshot_time)s, %(shares)s, %(comments)s, %(likes)s, %(plays)s
+)
+"""
+
+# 各平台插入的列（与插入语句一致，供 LOAD DATA 使用）
+INSERT_COLUMNS = {platform: re.findall(r'%\((\w+)\)s', sql) for platform, sql in INSERT_SQL.items()}
+
+LOAD_DATA_SQL = """
+LOAD DATA LOCAL INFILE %s {mode} INTO TABLE {table}
+CHARACTER SET utf8mb4
+FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+LINES TERMINATED BY '\\n'
+({columns})
+"""
+
+def _to_tsv_field(value: Any) -> str:
+    """转换为 LOAD DATA 默认转义规则下的字段文本（NULL 为 \\N）"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, (list, dict)):
+        value = json_codec.dumps(value)
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r').replace('\0', '\\0'))
+
 class DatabaseManager:
     """数据库管理类"""
     
     def __init__(self):
         self.config = DATABASE_CONFIG
-        self.connection = None
+        self.pool: Optional[ConnectionPool] = None
+        self.writer: Optional[WriteBehindWriter] = None
+        self._writer_lock = threading.Lock()
         
     def connect(self):
-        """建立数据库连接"""
+        """连接数据库（初始化进程内共享的连接池）"""
         try:
-            self.connection = pymysql.connect(
-                host=self.config['host'],
-                port=self.config['port'],
-                user=self.config['user'],
-                password=self.config['password'],
-                database=self.config['database'],
-                charset=self.config['charset'],
-                autocommit=True
-            )
+            pool = get_connection_pool()
+            pool.warm_up()
+            self.pool = pool
             logger.info("数据库连接成功")
             return True
         except Exception as e:
             logger.error(f"数据库连接失败: {e}")
             return False
     
+    @contextmanager
+    def cursor(self):
+        """从连接池借用连接并获取游标（自动提交），用完归还"""
+        if not self.pool and not self.connect():
+            raise ConnectionError("数据库未连接")
+        
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                yield cursor
+    
+    @contextmanager
+    def transaction(self):
+        """借用一个连接，在一个事务中执行多条语句，出错时回滚"""
+        if not self.pool and not self.connect():
+            raise ConnectionError("数据库未连接")
+        
+        with self.pool.connection() as connection:
+            connection.begin()
+            try:
+                with connection.cursor() as cursor:
+                    yield cursor
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+    
+    def get_writer(self) -> WriteBehindWriter:
+        """获取后台写入线程（首次调用时启动），关闭连接池前会写完其中的全部数据"""
+        with self._writer_lock:
+            if self.writer is None:
+                self.writer = WriteBehindWriter(self)
+            return self.writer
+    
     def disconnect(self):
-        """关闭数据库连接"""
-        if self.connection:
-            self.connection.close()
+        """写完后台写入队列中的数据后关闭数据库连接池"""
+        with self._writer_lock:
+            writer, self.writer = self.writer, None
+        if writer:
+            writer.close()
+        if self.pool:
+            self.pool.close()
+            self.pool = None
             logger.info("数据库连接已关闭")
     
     def create_database(self):
@@ -64,7 +197,7 @@ class DatabaseManager:
     
     def create_tables(self):
         """创建数据表"""
-        if not self.connection:
+        if not self.pool:
             if not self.connect():
                 return False
         
@@ -87,6 +220,7 @@ class DatabaseManager:
             attitudes_count INT DEFAULT 0 COMMENT '点赞数量',
             source VARCHAR(200) COMMENT '来源',
             content TEXT COMMENT '正文内容',
+            content_cluster_id VARCHAR(50) COMMENT '近似重复内容簇ID（簇内第一条内容的_id）',
             pic_urls TEXT COMMENT '图片URL列表',
             pic_num INT DEFAULT 0 COMMENT '图片数量',
             isLongText BOOLEAN DEFAULT FALSE COMMENT '是否为长文本',
@@ -105,6 +239,7 @@ class DatabaseManager:
             INDEX idx_created_at (created_at),
             INDEX idx_user_id (user_id),
             INDEX idx_keyword (keyword),
+            INDEX idx_content_cluster_id (content_cluster_id),
             INDEX idx_crawl_time (crawl_time)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='微博数据表';
         """
@@ -117,6 +252,7 @@ class DatabaseManager:
             aweme_id VARCHAR(50) COMMENT '视频ID',
             created_at DATETIME COMMENT '创建时间',
             content TEXT COMMENT '视频描述',
+            content_cluster_id VARCHAR(50) COMMENT '近似重复内容簇ID（簇内第一条内容的_id）',
             video_url VARCHAR(1000) COMMENT '视频URL',
             video_cover VARCHAR(1000) COMMENT '视频封面URL',
             video_duration FLOAT DEFAULT 0 COMMENT '视频时长(秒)',
@@ -141,6 +277,7 @@ class DatabaseManager:
             INDEX idx_created_at (created_at),
             INDEX idx_user_id (user_id),
             INDEX idx_keyword (keyword),
+            INDEX idx_content_cluster_id (content_cluster_id),
             INDEX idx_crawl_time (crawl_time),
             INDEX idx_platform (platform)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='抖音数据表';
@@ -164,130 +301,423 @@ class DatabaseManager:
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='爬取日志表';
         """
         
+        # 增量爬取水位线表
+        watermark_table_sql = """
+        CREATE TABLE IF NOT EXISTS crawl_watermarks (
+            platform VARCHAR(20) NOT NULL COMMENT '平台类型',
+            keyword VARCHAR(100) NOT NULL COMMENT '关键词',
+            newest_created_at DATETIME COMMENT '已爬取的最新内容发布时间',
+            newest_id VARCHAR(50) COMMENT '已爬取的最新内容ID',
+            updated_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+            PRIMARY KEY (platform, keyword)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='增量爬取水位线表';
+        """
+        
+        # 互动计数快照表（只追加，按天分区，按内容查询历史走主键范围扫描）
+        snapshot_table_sql = """
+        CREATE TABLE IF NOT EXISTS engagement_snapshots (
+            platform VARCHAR(20) NOT NULL COMMENT '平台类型',
+            post_id VARCHAR(50) NOT NULL COMMENT '内容ID（对应数据表 _id）',
+            snapshot_time DATETIME NOT NULL COMMENT '采集时间',
+            shares INT COMMENT '转发/分享数量',
+            comments INT COMMENT '评论数量',
+            likes INT COMMENT '点赞数量',
+            plays INT COMMENT '播放数量（仅抖音）',
+            PRIMARY KEY (platform, post_id, snapshot_time),
+            INDEX idx_snapshot_time (snapshot_time)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='互动计数快照表'
+        PARTITION BY RANGE (TO_DAYS(snapshot_time)) (
+            PARTITION p_future VALUES LESS THAN MAXVALUE
+        );
+        """
+        
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(weibo_table_sql)
                 cursor.execute(douyin_table_sql)
                 cursor.execute(log_table_sql)
+                cursor.execute(watermark_table_sql)
+                cursor.execute(snapshot_table_sql)
+                
+                # 旧版本创建的数据表补充近似重复内容簇列
+                for table in ('weibo_data', 'douyin_data'):
+                    self._add_column_if_missing(
+                        cursor, table, 'content_cluster_id',
+                        "VARCHAR(50) COMMENT '近似重复内容簇ID（簇内第一条内容的_id）' AFTER content, "
+                        "ADD INDEX idx_content_cluster_id (content_cluster_id)"
+                    )
                 logger.info("数据表创建成功")
-                return True
         except Exception as e:
             logger.error(f"创建数据表失败: {e}")
             return False
+        
+        self.maintain_snapshot_partitions()
+        return True
+    
+    @staticmethod
+    def _add_column_if_missing(cursor, table: str, column: str, definition: str):
+        """数据表缺少指定列时添加（迁移旧表结构）"""
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column))
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info(f"数据表 {table} 已添加列 {column}")
+    
+    def maintain_snapshot_partitions(self) -> bool:
+        """维护快照表的按天分区：预建未来 partitions_ahead 天的分区，删除超过 retention_days 的分区
+        
+        分区 pYYYYMMDD 存放当天的快照，p_future 兜底存放尚未建分区的日期
+        """
+        today = date.today()
+        try:
+            with self.cursor() as cursor:
+                cursor.execute("""
+                    SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'engagement_snapshots'
+                """)
+                existing = {row[0] for row in cursor.fetchall() if row[0] and row[0] != 'p_future'}
+                latest = max((datetime.strptime(name[1:], '%Y%m%d').date() for name in existing), default=None)
+                
+                # 新分区只能从 p_future 中拆分出来，因此只补建最新分区之后的日期
+                new_days = [today + timedelta(days=offset) for offset in range(SNAPSHOT_CONFIG['partitions_ahead'] + 1)]
+                new_days = [day for day in new_days if latest is None or day > latest]
+                if new_days:
+                    partitions = ', '.join(
+                        f"PARTITION p{day:%Y%m%d} VALUES LESS THAN (TO_DAYS('{day + timedelta(days=1)}'))"
+                        for day in new_days
+                    )
+                    cursor.execute(f"ALTER TABLE engagement_snapshots REORGANIZE PARTITION p_future INTO "
+                                   f"({partitions}, PARTITION p_future VALUES LESS THAN MAXVALUE)")
+                
+                cutoff = today - timedelta(days=SNAPSHOT_CONFIG['retention_days'])
+                expired = sorted(name for name in existing if datetime.strptime(name[1:], '%Y%m%d').date() < cutoff)
+                if expired:
+                    cursor.execute(f"ALTER TABLE engagement_snapshots DROP PARTITION {', '.join(expired)}")
+                
+                logger.info(f"快照表分区维护完成，新建 {len(new_days)} 个，删除过期 {len(expired)} 个")
+                return True
+        except Exception as e:
+            logger.error(f"维护快照表分区失败: {e}")
+            return False
     
     def insert_weibo_data(self, data: Dict[str, Any]) -> bool:
         """插入微博数据"""
-        if not self.connection:
+        if not self.pool:
             if not self.connect():
                 return False
         
-        sql = """
-        INSERT IGNORE INTO weibo_data (
-            _id, mblogid, created_at, geo_type, geo_coordinates, geo_detail_poiid,
-            geo_detail_title, geo_detail_type, geo_detail_spot_type, ip_location,
-            reposts_count, comments_count, attitudes_count, source, content,
-            pic_urls, pic_num, isLongText, user_id, user_avatar_hd, user_nick_name,
-            user_verified, user_mbrank, user_mbtype, user_verified_type, url, keyword
-        ) VALUES (
-            %(_id)s, %(mblogid)s, %(created_at)s, %(geo_type)s, %(geo_coordinates)s,
-            %(geo_detail_poiid)s, %(geo_detail_title)s, %(geo_detail_type)s,
-            %(geo_detail_spot_type)s, %(ip_location)s, %(reposts_count)s,
-            %(comments_count)s, %(attitudes_count)s, %(source)s, %(content)s,
-            %(pic_urls)s, %(pic_num)s, %(isLongText)s, %(user_id)s, %(user_avatar_hd)s,
-            %(user_nick_name)s, %(user_verified)s, %(user_mbrank)s, %(user_mbtype)s,
-            %(user_verified_type)s, %(url)s, %(keyword)s
-        )
-        """
+        sql = WEIBO_INSERT_SQL
         
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(sql, data)
                 return True
         except Exception as e:
             logger.error(f"插入数据失败: {e}")
             return False
     
-    def batch_insert_weibo_data(self, data_list: List[Dict[str, Any]]) -> int:
-        """批量插入微博数据"""
-        if not self.connection:
+    def batch_insert_weibo_data(self, data_list: List[Dict[str, Any]], upsert: bool = False) -> int:
+        """批量插入微博数据，upsert=True 时已存在的数据刷新互动计数"""
+        if not self.pool:
             if not self.connect():
                 return 0
         
         if not data_list:
             return 0
         
-        success_count = 0
-        for data in data_list:
-            if self.insert_weibo_data(data):
-                success_count += 1
-        
-        logger.info(f"批量插入完成，成功: {success_count}/{len(data_list)}")
-        return success_count
+        result = self.bulk_insert('weibo', data_list, upsert)
+        return result['inserted'] + result['updated'] + result['ignored']
     
     def insert_douyin_data(self, data: Dict[str, Any]) -> bool:
         """插入抖音数据"""
-        if not self.connection:
+        if not self.pool:
             if not self.connect():
                 return False
         
-        sql = """
-        INSERT IGNORE INTO douyin_data (
-            _id, aweme_id, created_at, content, video_url, video_cover, video_duration,
-            music_title, music_author, location, hashtags, digg_count, comment_count,
-            share_count, play_count, user_id, user_name, user_avatar, user_verified,
-            url, keyword, platform
-        ) VALUES (
-            %(_id)s, %(aweme_id)s, %(created_at)s, %(content)s, %(video_url)s,
-            %(video_cover)s, %(video_duration)s, %(music_title)s, %(music_author)s,
-            %(location)s, %(hashtags)s, %(digg_count)s, %(comment_count)s,
-            %(share_count)s, %(play_count)s, %(user_id)s, %(user_name)s,
-            %(user_avatar)s, %(user_verified)s, %(url)s, %(keyword)s, %(platform)s
-        )
-        """
+        sql = DOUYIN_INSERT_SQL
         
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(sql, data)
                 return True
         except Exception as e:
             logger.error(f"插入抖音数据失败: {e}")
             return False
     
-    def batch_insert_douyin_data(self, data_list: List[Dict[str, Any]]) -> int:
-        """批量插入抖音数据"""
-        if not self.connection:
+    def batch_insert_douyin_data(self, data_list: List[Dict[str, Any]], upsert: bool = False) -> int:
+        """批量插入抖音数据，upsert=True 时已存在的数据刷新互动计数"""
+        if not self.pool:
             if not self.connect():
                 return 0
         
         if not data_list:
             return 0
         
-        success_count = 0
+        result = self.bulk_insert('douyin', data_list, upsert)
+        return result['inserted'] + result['updated'] + result['ignored']
+    
+    def bulk_insert(self, platform: str, data_list: List[Dict[str, Any]], upsert: bool = False) -> Dict[str, int]:
+        """批量插入平台数据，返回 新增/更新/已存在/失败 条数
+        
+        按 chunk_size 分块 executemany（PyMySQL 会改写为多行 VALUES 语句），所有分块在同一事务中提交；
+        事务失败时回滚并改为逐行插入，只有出错的行计入失败。
+        upsert=True 时已存在的行只刷新互动计数（COUNTER_COLUMNS），计数未变化的行计入已存在，
+        并在同一事务中向 engagement_snapshots 追加本批数据的计数快照；同一批中重复的 _id 以最后一条为准
+        """
+        result = {'inserted': 0, 'updated': 0, 'ignored': 0, 'failed': 0}
+        if not data_list:
+            return result
+        
+        if not self.pool:
+            if not self.connect():
+                result['failed'] = len(data_list)
+                return result
+        
+        if upsert:
+            # 同一批中重复的 _id（如续爬时待插入数据与重新爬取的页面重叠）只保留最后一条，
+            # 否则新增/更新计数与快照行会重复计算
+            data_list = list({data['_id']: data for data in data_list}.values())
+        
+        sql = (UPSERT_SQL if upsert else INSERT_SQL)[platform]
+        chunk_size = DB_WRITE_CONFIG['chunk_size']
+        
+        try:
+            affected = existing = 0
+            snapshot = upsert and SNAPSHOT_CONFIG['enabled']
+            snapshot_time = datetime.now()
+            with self.transaction() as cursor:
+                for start in range(0, len(data_list), chunk_size):
+                    chunk = data_list[start:start + chunk_size]
+                    if upsert:
+                        # 影响行数无法区分新增与更新，先统计已存在的行数
+                        existing += self._count_existing(cursor, platform, chunk)
+                    affected += cursor.executemany(sql, chunk)
+                    if snapshot:
+                        cursor.executemany(SNAPSHOT_INSERT_SQL, self._snapshot_rows(platform, chunk, snapshot_time))
+            
+            if upsert:
+                result['inserted'] = len(data_list) - existing
+                result['updated'] = (affected - result['inserted']) // 2
+                result['ignored'] = existing - result['updated']
+            else:
+                result['inserted'] = affected
+                result['ignored'] = len(data_list) - affected
+        except Exception as e:
+            logger.warning(f"批量插入失败，已回滚，改为逐行插入: {e}")
+            result = self._insert_rows(sql, data_list)
+            if snapshot:
+                self._insert_snapshots(platform, data_list, snapshot_time)
+        
+        logger.info(f"批量插入完成，新增: {result['inserted']}，更新: {result['updated']}，已存在: {result['ignored']}，"
+                    f"失败: {result['failed']}，共 {len(data_list)} 条")
+        return result
+    
+    def bulk_load(self, platform: str, records: Iterable[Dict[str, Any]], replace: bool = False) -> Dict[str, int]:
+        """通过 LOAD DATA LOCAL INFILE 批量导入（历史数据回灌）
+        
+        记录流式写入临时TSV，每 load_chunk_rows 行执行一次 LOAD DATA，避免整体载入内存；
+        重复 _id 默认跳过（IGNORE），replace=True 时以导入的数据覆盖（REPLACE）。
+        使用单独开启 local_infile 的连接，服务端也需开启 local_infile。
+        """
+        result = {'rows': 0, 'inserted': 0, 'ignored': 0, 'replaced': 0}
+        columns = INSERT_COLUMNS[platform]
+        sql = LOAD_DATA_SQL.format(mode='REPLACE' if replace else 'IGNORE', table=f"{platform}_data",
+                                   columns=', '.join(columns))
+        chunk_rows = DB_WRITE_CONFIG['load_chunk_rows']
+        
+        try:
+            connection = pymysql.connect(
+                host=self.config['host'],
+                port=self.config['port'],
+                user=self.config['user'],
+                password=self.config['password'],
+                database=self.config['database'],
+                charset=self.config['charset'],
+                local_infile=True,
+                autocommit=True
+            )
+        except Exception as e:
+            logger.error(f"数据库连接失败: {e}")
+            return result
+        
+        def load_chunk(file_path: str, row_count: int):
+            with connection.cursor() as cursor:
+                affected = cursor.execute(sql, (file_path,))
+            # IGNORE：影响行数即新增行数；REPLACE：覆盖已有行计为2（删除+插入）
+            if replace:
+                result['replaced'] += affected - row_count
+                result['inserted'] += 2 * row_count - affected
+            else:
+                result['inserted'] += affected
+                result['ignored'] += row_count - affected
+            result['rows'] += row_count
+            logger.info(f"[批量导入] {platform}: 已导入 {result['rows']} 行")
+        
+        tmp_file = None
+        try:
+            row_count = 0
+            for record in records:
+                if tmp_file is None:
+                    tmp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.tsv', delete=False)
+                tmp_file.write('\t'.join(_to_tsv_field(record.get(column)) for column in columns) + '\n')
+                row_count += 1
+                
+                if row_count >= chunk_rows:
+                    tmp_file.close()
+                    load_chunk(tmp_file.name, row_count)
+                    os.remove(tmp_file.name)
+                    tmp_file, row_count = None, 0
+            
+            if tmp_file is not None:
+                tmp_file.close()
+                load_chunk(tmp_file.name, row_count)
+        except Exception as e:
+            logger.error(f"批量导入失败: {e}")
+        finally:
+            if tmp_file is not None:
+                tmp_file.close()
+                if os.path.exists(tmp_file.name):
+                    os.remove(tmp_file.name)
+            connection.close()
+        
+        logger.info(f"[批量导入] {platform} 完成，共 {result['rows']} 行，新增: {result['inserted']}，"
+                    f"跳过: {result['ignored']}，覆盖: {result['replaced']}")
+        return result
+    
+    def _insert_rows(self, sql: str, data_list: List[Dict[str, Any]]) -> Dict[str, int]:
+        """逐行插入（批量插入失败时定位出错的行）"""
+        result = {'inserted': 0, 'updated': 0, 'ignored': 0, 'failed': 0}
         for data in data_list:
-            if self.insert_douyin_data(data):
-                success_count += 1
+            try:
+                with self.cursor() as cursor:
+                    affected = cursor.execute(sql, data)
+                result[{0: 'ignored', 1: 'inserted'}.get(affected, 'updated')] += 1
+            except Exception as e:
+                logger.error(f"插入数据失败 (_id: {data.get('_id')}): {e}")
+                result['failed'] += 1
+        return result
+    
+    @staticmethod
+    def _snapshot_rows(platform: str, data_list: List[Dict[str, Any]], snapshot_time: datetime) -> List[Dict[str, Any]]:
+        """将平台数据转换为快照行"""
+        counters = SNAPSHOT_COUNTERS[platform]
+        return [
+            dict({name: data.get(column) if column else None for name, column in counters.items()},
+                 platform=platform, post_id=data['_id'], snapshot_time=snapshot_time)
+            for data in data_list
+        ]
+    
+    def insert_snapshots(self, platform: str, data_list: List[Dict[str, Any]]) -> bool:
+        """只写入互动计数快照、不改写数据表（非更新模式下重复爬到已入库的内容时调用）"""
+        if not SNAPSHOT_CONFIG['enabled'] or not data_list:
+            return True
         
-        logger.info(f"抖音数据批量插入完成，成功: {success_count}/{len(data_list)}")
-        return success_count
+        if not self.pool:
+            if not self.connect():
+                return False
+        
+        return self._insert_snapshots(platform, data_list, datetime.now())
+    
+    def _insert_snapshots(self, platform: str, data_list: List[Dict[str, Any]], snapshot_time: datetime) -> bool:
+        """单独写入互动计数快照（批量事务失败改为逐行插入后补写）"""
+        try:
+            with self.cursor() as cursor:
+                cursor.executemany(SNAPSHOT_INSERT_SQL, self._snapshot_rows(platform, data_list, snapshot_time))
+            return True
+        except Exception as e:
+            logger.error(f"写入互动计数快照失败: {e}")
+            return False
     
-    def get_existing_ids(self) -> set:
-        """获取已存在的微博ID"""
-        if not self.connection:
+    @staticmethod
+    def _count_existing(cursor, platform: str, data_list: List[Dict[str, Any]]) -> int:
+        """统计数据表中已存在的 _id 数量"""
+        cursor.execute(f"SELECT COUNT(*) FROM {platform}_data WHERE _id IN %s",
+                       ([data['_id'] for data in data_list],))
+        return cursor.fetchone()[0]
+    
+    def iter_ids(self, platform: str, after_id: int = 0, batch_size: int = 50000):
+        """按自增主键顺序分批产出 (id, _id)，只包含 id 大于 after_id 的行；数据库出错时抛出异常，调用方据此判断读取不完整"""
+        if not self.pool:
+            if not self.connect():
+                raise ConnectionError("数据库连接失败，无法读取已存在ID")
+        
+        sql = f"SELECT id, _id FROM {platform}_data WHERE id > %s ORDER BY id LIMIT %s"
+        while True:
+            try:
+                with self.cursor() as cursor:
+                    cursor.execute(sql, (after_id, batch_size))
+                    rows = cursor.fetchall()
+            except Exception as e:
+                logger.error(f"读取已存在ID失败: {e}")
+                raise
+            
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+    
+    def filter_existing_ids(self, platform: str, ids: List[str]) -> set:
+        """返回 ids 中在数据表里已存在的ID"""
+        if not ids:
+            return set()
+        
+        if not self.pool:
             if not self.connect():
                 return set()
         
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT _id FROM weibo_data")
-                results = cursor.fetchall()
-                return {row[0] for row in results}
+            with self.cursor() as cursor:
+                cursor.execute(f"SELECT _id FROM {platform}_data WHERE _id IN %s", (list(ids),))
+                return {row[0] for row in cursor.fetchall()}
         except Exception as e:
-            logger.error(f"获取已存在ID失败: {e}")
+            logger.error(f"查询已存在ID失败: {e}")
             return set()
     
+    def get_watermark(self, platform: str, keyword: str) -> Optional[Dict[str, Any]]:
+        """获取关键词的增量爬取水位线"""
+        if not self.pool:
+            if not self.connect():
+                return None
+        
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    "SELECT newest_created_at, newest_id FROM crawl_watermarks WHERE platform = %s AND keyword = %s",
+                    (platform, keyword)
+                )
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                return {'newest_created_at': row[0], 'newest_id': row[1]}
+        except Exception as e:
+            logger.error(f"获取水位线失败: {e}")
+            return None
+    
+    def update_watermark(self, platform: str, keyword: str, newest_created_at: datetime, newest_id: str) -> bool:
+        """更新关键词的增量爬取水位线"""
+        if not self.pool:
+            if not self.connect():
+                return False
+        
+        sql = """
+        INSERT INTO crawl_watermarks (platform, keyword, newest_created_at, newest_id)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE newest_created_at = VALUES(newest_created_at), newest_id = VALUES(newest_id)
+        """
+        
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(sql, (platform, keyword, newest_created_at, newest_id))
+                return True
+        except Exception as e:
+            logger.error(f"更新水位线失败: {e}")
+            return False
+    
     def insert_crawl_log(self, log_data: Dict[str, Any]) -> bool:
         """插入爬取日志"""
-        if not self.connection:
+        if not self.pool:
             if not self.connect():
                 return False
         
@@ -302,7 +732,7 @@ class DatabaseManager:
         """
         
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(sql, log_data)
                 return True
         except Exception as e:
@@ -311,12 +741,12 @@ class DatabaseManager:
     
     def get_crawl_statistics(self) -> Dict[str, Any]:
         """获取爬取统计信息"""
-        if not self.connection:
+        if not self.pool:
             if not self.connect():
                 return {}
         
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 # 总数据量
                 cursor.execute("SELECT COUNT(*) FROM weibo_data")
                 total_count = cursor.fetchone()[0]
@@ -0,0 +1,131 @@
+"""
+后台写入模块（write-behind）
+爬取线程只把待入库的数据放入队列即返回，由后台线程按条数或时间窗口合并成大批次写入数据库，
+爬取不再等待数据库提交；关闭时写完队列中的全部数据
+"""
+import time
+import queue
+import logging
+import threading
+from typing import Dict, List, Any, Callable
+
+from config.settings import DB_WRITE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# 写入结果回调：(写入结果 {'inserted','updated','ignored','failed'}, 本次写入包含的各个提交批次)
+ResultCallback = Callable[[Dict[str, int], List[List[Dict[str, Any]]]], None]
+
+class _FlushRequest:
+    """立即写入当前已提交数据的请求"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+class WriteBehindWriter:
+    """后台批量写入线程
+
+    提交的数据按 (平台, 是否更新插入, 回调) 分组合并，每组调用一次 bulk_insert，
+    写入结果通过提交时传入的回调返回，便于各爬虫分别统计。
+    """
+
+    def __init__(self, db_manager, config: Dict[str, Any] = None):
+        self.db_manager = db_manager
+        self.config = config or DB_WRITE_CONFIG
+        # 队列写满（数据库长时间跟不上）时 submit 阻塞，避免内存无限增长
+        self._queue = queue.Queue(maxsize=self.config['write_behind_max_pending'])
+        self.stats = {'submitted': 0, 'inserted': 0, 'updated': 0, 'ignored': 0, 'failed': 0, 'flushes': 0}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='db-write-behind', daemon=True)
+        self._thread.start()
+
+    def submit(self, platform: str, records: List[Dict[str, Any]], callback: ResultCallback = None,
+               upsert: bool = False):
+        """提交待写入的数据，立即返回（upsert 含义同 DatabaseManager.bulk_insert）"""
+        if not records:
+            return
+        if self._closed:
+            raise RuntimeError("后台写入线程已关闭")
+
+        with self._lock:
+            self.stats['submitted'] += len(records)
+        self._queue.put((platform, upsert, records, callback))
+
+    def flush(self, timeout: float = None) -> bool:
+        """写入所有已提交的数据后返回，超时返回False"""
+        if self._closed:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self):
+        """写完队列中的全部数据后停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        pending: Dict[tuple, List[List[Dict[str, Any]]]] = {}
+        pending_count = 0
+        deadline = None
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # 时间窗口到期
+                self._write(pending)
+                pending, pending_count = {}, 0
+                continue
+
+            if item is _STOP or isinstance(item, _FlushRequest):
+                self._write(pending)
+                pending, pending_count = {}, 0
+                if item is _STOP:
+                    return
+                item.done.set()
+                continue
+
+            platform, upsert, records, callback = item
+            if not pending:
+                deadline = time.monotonic() + self.config['write_behind_interval']
+            pending.setdefault((platform, upsert, callback), []).append(records)
+            pending_count += len(records)
+
+            if pending_count >= self.config['write_behind_batch_size']:
+                self._write(pending)
+                pending, pending_count = {}, 0
+
+    def _write(self, pending: Dict[tuple, List[List[Dict[str, Any]]]]):
+        for (platform, upsert, callback), batches in pending.items():
+            records = [record for batch in batches for record in batch]
+            try:
+                result = self.db_manager.bulk_insert(platform, records, upsert)
+            except Exception as e:
+                logger.error(f"[后台写入] {platform} 写入 {len(records)} 条失败: {e}")
+                result = {'inserted': 0, 'updated': 0, 'ignored': 0, 'failed': len(records)}
+
+            if result['failed']:
+                logger.error(f"[后台写入] {platform} 有 {result['failed']}/{len(records)} 条写入失败")
+
+            with self._lock:
+                self.stats['flushes'] += 1
+                for key in ('inserted', 'updated', 'ignored', 'failed'):
+                    self.stats[key] += result[key]
+
+            if callback:
+                try:
+                    callback(result, batches)
+                except Exception as e:
+                    logger.error(f"[后台写入] 处理写入结果失败: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, queued=self._queue.qsize())
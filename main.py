@@ -11,13 +11,15 @@ from typing import Dict, Any
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import CRAWLER_CONFIG
+from config.settings import CRAWLER_CONFIG, NEAR_DUPLICATE_CONFIG
 from database.models import DatabaseManager
 from crawler.weibo_spider import WeiboSpider
 from utils.data_storage_manager import DataStorageManager
 from utils.data_analyzer import WeiboDataAnalyzer
 from utils.logger import setup_logger, log_crawler_start, log_crawler_end, log_page_result
 from utils.helpers import calculate_time_diff
+from utils.dedupe_index import DedupeIndex
+from utils.near_duplicate import NearDuplicateDetector
 
 class WeiboDataCrawler:
     """微博数据爬虫主类"""
@@ -27,6 +29,8 @@ class WeiboDataCrawler:
         self.db_manager = DatabaseManager()
         self.storage_manager = DataStorageManager()
         self.spider = WeiboSpider(self.storage_manager)
+        self.existing_ids = None
+        self.near_duplicates = NearDuplicateDetector() if NEAR_DUPLICATE_CONFIG['enabled'] else None
         self.is_running = True
         
         # 统计信息
@@ -91,8 +95,8 @@ class WeiboDataCrawler:
             self.logger.info(f"创建数据存储会话目录: {session_dir}")
         
         try:
-            # 获取已存在的微博ID，用于去重
-            existing_ids = self.db_manager.get_existing_ids()
+            # 打开微博去重索引
+            existing_ids = self.existing_ids = DedupeIndex.open('weibo', self.db_manager)
             self.logger.info(f"数据库中已有 {len(existing_ids)} 条记录")
             
             # 记录爬取开始日志
@@ -127,11 +131,19 @@ class WeiboDataCrawler:
                     
                     # 过滤已存在的数据
                     new_weibo_list = []
+                    known_ids = existing_ids.contains_many([weibo['_id'] for weibo in weibo_list])
                     for weibo in weibo_list:
-                        if weibo['_id'] not in existing_ids:
+                        if weibo['_id'] not in known_ids:
                             new_weibo_list.append(weibo)
                             existing_ids.add(weibo['_id'])
                     
+                    # 已存在的微博只追加互动计数快照
+                    self.db_manager.insert_snapshots('weibo', [weibo for weibo in weibo_list if weibo['_id'] in known_ids])
+                    
+                    if new_weibo_list and self.near_duplicates:
+                        # 标记近似重复内容簇，按配置丢弃近似重复的内容
+                        new_weibo_list = self.near_duplicates.process(new_weibo_list)
+                    
                     if new_weibo_list:
                         batch_data.extend(new_weibo_list)
                         all_crawled_data.extend(new_weibo_list)  # 保存所有数据用于文件存储
@@ -241,6 +253,8 @@ class WeiboDataCrawler:
     def cleanup(self):
         """清理资源"""
         try:
+            if self.existing_ids is not None:
+                self.existing_ids.save()
             self.db_manager.disconnect()
             self.logger.info("资源清理完成")
         except Exception as e:
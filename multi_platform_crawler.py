@@ -6,6 +6,8 @@ import os
 import sys
 import time
 import signal
+import asyncio
+import threading
 import argparse
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -13,25 +15,53 @@ from typing import Dict, Any, Optional
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import CRAWLER_CONFIG, PLATFORM_CONFIG
+from config.settings import (CRAWLER_CONFIG, PLATFORM_CONFIG, CIRCUIT_BREAKER_CONFIG, PIPELINE_CONFIG, DB_WRITE_CONFIG,
+                             NEAR_DUPLICATE_CONFIG)
 from database.models import DatabaseManager
 from crawler.weibo_spider import WeiboSpider
 from crawler.douyin_spider import DouyinSpider
+from crawler.async_weibo_spider import AsyncWeiboSpider
+from crawler.async_douyin_spider import AsyncDouyinSpider
 from utils.data_storage_manager import DataStorageManager
 from utils.data_analyzer import WeiboDataAnalyzer
 from utils.logger import setup_logger, log_crawler_start, log_crawler_end, log_page_result
 from utils.helpers import calculate_time_diff
+from utils.circuit_breaker import CircuitOpenError
+from utils.incremental import IncrementalTracker
+from utils.pipeline import Pipeline
+from utils.dedupe_index import DedupeIndex
+from utils.near_duplicate import NearDuplicateDetector
 
 class MultiPlatformCrawler:
     """多平台数据爬虫主类"""
     
-    def __init__(self, platform: str = 'weibo'):
+    def __init__(self, platform: str = 'weibo', use_async: bool = False, incremental: bool = False,
+                 resume: bool = False, db_manager: DatabaseManager = None, existing_ids: DedupeIndex = None,
+                 install_signal_handlers: bool = True, upsert: bool = False):
+        """
+        Args:
+            upsert: 更新模式，重复爬到数据库中已存在的内容时刷新其互动计数（转发/评论/点赞/播放等）
+            db_manager: 共享的数据库管理器（调度器中多个任务共用一个连接池），为None时自行创建
+            existing_ids: 共享的去重索引（调度器中同平台任务共用），为None时打开平台的持久化索引
+            install_signal_handlers: 是否注册退出信号处理器（只能在主线程注册，调度器的工作线程中需关闭）
+        """
         self.platform = platform.lower()
+        self.use_async = use_async
+        self.incremental = incremental
+        self.resume = resume
+        self.upsert = upsert
         self.logger = setup_logger()
-        self.db_manager = DatabaseManager()
+        self.standalone = db_manager is None  # 独立运行时负责关闭数据库连接与代理会话，调度任务由调度器统一关闭
+        self.db_manager = db_manager or DatabaseManager()
+        self.existing_ids = existing_ids
         self.storage_manager = DataStorageManager()
         self.spider = self._create_spider()
+        self.spider.sort_by_time = incremental  # 增量模式依赖按发布时间排序的搜索结果
         self.is_running = True
+        self.pipeline: Optional[Pipeline] = None
+        self.near_duplicates = NearDuplicateDetector() if NEAR_DUPLICATE_CONFIG['enabled'] else None
+        self._unwritten_batches = []  # 已交给后台写入线程、尚未确认写入的批次
+        self._stats_lock = threading.Lock()
         
         # 统计信息
         self.stats = {
@@ -39,16 +69,26 @@ class MultiPlatformCrawler:
             'total_crawled': 0,
             'success_count': 0,
             'error_count': 0,
+            'refreshed_count': 0,
             'start_time': None,
             'end_time': None
         }
         
         # 注册信号处理器
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        if install_signal_handlers:
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
     
     def _create_spider(self):
         """根据平台创建相应的爬虫实例"""
+        if self.use_async:
+            if self.platform == 'weibo':
+                return AsyncWeiboSpider(self.storage_manager)
+            elif self.platform == 'douyin':
+                return AsyncDouyinSpider(self.storage_manager)
+            else:
+                raise ValueError(f"不支持的平台: {self.platform}")
+        
         if self.platform == 'weibo':
             return WeiboSpider(self.storage_manager)
         elif self.platform == 'douyin':
@@ -93,16 +133,14 @@ class MultiPlatformCrawler:
         if not keyword:
             keyword = CRAWLER_CONFIG['keyword']
         
-        if not max_pages:
-            max_pages = CRAWLER_CONFIG['max_pages']
-        
         self.stats['start_time'] = datetime.now()
         log_crawler_start(self.logger, keyword)
         
-        # 创建数据存储会话目录 - 传递平台信息
-        session_dir = self.storage_manager.create_session_directory(keyword, self.platform)
-        if session_dir:
-            self.logger.info(f"创建统一数据存储会话目录: {session_dir}")
+        # 创建数据存储会话目录 - 传递平台信息（续爬时沿用上次未完成的会话目录）
+        checkpoint = self._open_session(keyword)
+        
+        if not max_pages:
+            max_pages = checkpoint['max_pages'] if checkpoint else CRAWLER_CONFIG['max_pages']
         
         try:
             # 获取已存在的ID，用于去重
@@ -124,144 +162,510 @@ class MultiPlatformCrawler:
             
             batch_data = []  # 批量插入缓存
             all_crawled_data = []  # 存储所有爬取的数据用于文件保存
+            tracker = self._create_incremental_tracker(keyword) if self.incremental else None
             
-            for page in range(1, max_pages + 1):
-                if not self.is_running:
-                    self.logger.info("收到停止信号，退出爬取")
-                    break
-                
-                self.logger.info(f"正在爬取第 {page} 页...")
-                
+            start_page = 1
+            if checkpoint:
+                start_page, batch_data, all_crawled_data = self._restore_checkpoint(checkpoint, existing_ids, tracker)
+            last_completed_page = start_page - 1
+            
+            pages = self._iter_pages(keyword, max_pages, start_page)
+            for page, content_list in pages:
                 try:
-                    # 爬取当前页数据
-                    content_list = self.spider.crawl_with_retry(keyword, page)
-                    
                     if not content_list:
                         self.logger.warning(f"第 {page} 页没有获取到数据")
                         continue
                     
-                    # 过滤已存在的数据
+                    # 过滤已存在的数据（更新模式下已存在的数据仍写入数据库以刷新互动计数）
                     new_content_list = []
+                    refreshed_list = []
+                    known_ids = existing_ids.contains_many([content['_id'] for content in content_list])
                     for content in content_list:
-                        if content['_id'] not in existing_ids:
+                        if content['_id'] not in known_ids:
                             new_content_list.append(content)
                             existing_ids.add(content['_id'])
+                        else:
+                            refreshed_list.append(content)
+                    
+                    if not self.upsert:
+                        # 非更新模式下已存在的数据不改写，只追加互动计数快照
+                        self.db_manager.insert_snapshots(self.platform, refreshed_list)
+                        refreshed_list = []
                     
                     if new_content_list:
-                        batch_data.extend(new_content_list)
-                        all_crawled_data.extend(new_content_list)  # 保存所有数据用于文件存储
-                        self.stats['total_crawled'] += len(new_content_list)
+                        stored_list = self._tag_near_duplicates(new_content_list)
+                        batch_data.extend(stored_list)
+                        all_crawled_data.extend(stored_list)  # 保存所有数据用于文件存储
+                        self.stats['total_crawled'] += len(stored_list)
                         
-                        log_page_result(self.logger, page, len(new_content_list))
-                        
-                        # 批量插入数据库
-                        if len(batch_data) >= CRAWLER_CONFIG['batch_size']:
-                            success_count = self._batch_insert_data(batch_data)
-                            self.stats['success_count'] += success_count
-                            self.stats['error_count'] += len(batch_data) - success_count
-                            batch_data = []  # 清空缓存
+                        log_page_result(self.logger, page, len(stored_list))
+                    elif refreshed_list:
+                        self.logger.info(f"第 {page} 页数据已存在，刷新 {len(refreshed_list)} 条互动计数")
                     else:
                         self.logger.info(f"第 {page} 页数据已存在，跳过")
+                    batch_data.extend(refreshed_list)
+                    
+                    # 批量插入数据库
+                    if len(batch_data) >= CRAWLER_CONFIG['batch_size']:
+                        self._store_batch(batch_data)
+                        batch_data = []  # 清空缓存
                     
-                    # 随机延迟
-                    self.spider.random_delay()
+                    if tracker and tracker.observe_page(content_list, len(new_content_list)):
+                        self.logger.info(f"[增量] {tracker.stop_reason}，在第 {page} 页停止翻页")
+                        break
                     
                 except Exception as e:
                     self.logger.error(f"爬取第 {page} 页失败: {e}")
                     self.stats['error_count'] += 1
                     continue
+                finally:
+                    # 每页处理完成后记录断点
+                    last_completed_page = page
+                    self._save_checkpoint(keyword, max_pages, page, batch_data, tracker)
+            
+            # 提前停止时取消仍在途的页面请求
+            pages.close()
             
             # 处理剩余的批量数据
             if batch_data:
-                success_count = self._batch_insert_data(batch_data)
-                self.stats['success_count'] += success_count
-                self.stats['error_count'] += len(batch_data) - success_count
+                self._store_batch(batch_data)
             
-            # 更新统计信息
-            self.stats['end_time'] = datetime.now()
-            self.stats['duration'] = calculate_time_diff(
-                self.stats['start_time'], 
-                self.stats['end_time']
-            )
+            # 等待后台写入线程写完已提交的数据，统计与断点才准确
+            if self.db_manager.writer:
+                self.db_manager.writer.flush()
             
-            # 记录爬取结束日志
-            log_data.update({
-                'end_time': self.stats['end_time'],
-                'total_crawled': self.stats['total_crawled'],
-                'success_count': self.stats['success_count'],
-                'error_count': self.stats['error_count'],
-                'status': 'completed' if self.is_running else 'interrupted',
+            if tracker and self.is_running:
+                self._save_watermark(keyword, tracker)
+            
+            # 待插入数据已全部写入数据库，中断的会话可通过 --resume 从下一页继续
+            self._save_checkpoint(keyword, max_pages, last_completed_page, [], tracker,
+                                  status='completed' if self.is_running else 'interrupted')
+            
+            return self._finish_crawl(keyword, max_pages, log_data, all_crawled_data)
+            
+        except Exception as e:
+            self._record_crawl_error(log_data if 'log_data' in locals() else None, e)
+            return False
+    
+    def crawl_data_pipeline(self, keyword: str = None, max_pages: int = None) -> bool:
+        """以流水线方式爬取：抓取、去重、入库、写文件各阶段并发运行，互不阻塞
+        
+        阶段之间以有界队列连接，下游处理不过来时上游阻塞等待；各阶段线程数见 PIPELINE_CONFIG。
+        页面乱序完成，因此不支持依赖按页顺序处理的增量模式与断点续爬。
+        """
+        if self.use_async or self.incremental or self.resume or self.upsert:
+            self.logger.warning("流水线模式不支持异步/增量/断点续爬/更新模式，改用逐页模式")
+            return self.crawl_data(keyword, max_pages)
+        
+        if not keyword:
+            keyword = CRAWLER_CONFIG['keyword']
+        
+        if not max_pages:
+            max_pages = CRAWLER_CONFIG['max_pages']
+        
+        self.stats['start_time'] = datetime.now()
+        log_crawler_start(self.logger, keyword)
+        
+        session_dir = self.storage_manager.create_session_directory(keyword, self.platform)
+        if session_dir:
+            self.logger.info(f"创建统一数据存储会话目录: {session_dir}")
+        
+        try:
+            # 获取已存在的ID，用于去重
+            existing_ids = self._get_existing_ids()
+            self.logger.info(f"数据库中已有 {len(existing_ids)} 条{PLATFORM_CONFIG[self.platform]['name']}记录")
+            
+            log_data = {
+                'platform': self.platform,
+                'keyword': keyword,
+                'start_time': self.stats['start_time'],
+                'end_time': None,
+                'total_crawled': 0,
+                'success_count': 0,
+                'error_count': 0,
+                'status': 'running',
                 'error_message': None
-            })
+            }
             
-            self.db_manager.insert_crawl_log(log_data)
-            log_crawler_end(self.logger, self.stats)
+            self.pipeline = self._build_pipeline(keyword, existing_ids)
+            self.pipeline.start()
+            
+            # 按页码提交抓取任务，抓取队列已满时在此阻塞
+            for page in range(1, max_pages + 1):
+                if not self.is_running:
+                    self.logger.info("收到停止信号，不再提交新的页面")
+                    break
+                self.pipeline.put(page)
+            
+            # 等待已提交的页面全部处理、入库完成
+            self.pipeline.join()
+            self.pipeline.log_statistics()
+            self.logger.info(f"[流水线] 忙碌占比最高的阶段: {self.pipeline.get_bottleneck()}")
             
-            # 保存结构化数据到文件 - 传递平台信息
-            if all_crawled_data:
-                self.storage_manager.save_structured_data(all_crawled_data, platform=self.platform)
-                self.logger.info(f"保存结构化数据: {len(all_crawled_data)} 条记录")
+            # 写文件阶段已逐批追加到会话目录，合并为结构化数据文件（数据不在内存中累积）
+            merged_count = self.storage_manager.merge_structured_data(self.platform)
+            if merged_count:
+                self.logger.info(f"保存结构化数据: {merged_count} 条记录")
             
-            # 生成并保存分析报告 - 传递平台信息
+            return self._finish_crawl(keyword, max_pages, log_data, [])
+            
+        except Exception as e:
+            self._record_crawl_error(log_data if 'log_data' in locals() else None, e)
+            return False
+    
+    def _build_pipeline(self, keyword: str, existing_ids: DedupeIndex) -> Pipeline:
+        """构建 抓取→去重→入库→写文件 流水线"""
+        stats_lock = threading.Lock()
+        trips_at_start = self.spider.circuit_breaker.trip_count
+        
+        def fetch(page):
             try:
-                if self.platform == 'weibo':  # 目前只有微博有分析器
-                    analyzer = WeiboDataAnalyzer(self.db_manager)
-                    report = analyzer.generate_summary_report(keyword)
-                    if report:
-                        self.storage_manager.save_analysis_report(report, platform=self.platform)
-                        self.logger.info("保存分析报告完成")
+                content_list = self._fetch_page(keyword, page, trips_at_start)
             except Exception as e:
-                self.logger.warning(f"生成分析报告失败: {e}")
+                self.logger.error(f"爬取第 {page} 页失败: {e}")
+                with stats_lock:
+                    self.stats['error_count'] += 1
+                return None
             
-            # 保存会话元数据
-            session_metadata = {
-                'platform': self.platform,
-                'keyword': keyword,
-                'max_pages': max_pages,
+            if content_list is None:
+                return None
+            if not content_list:
+                self.logger.warning(f"第 {page} 页没有获取到数据")
+                return None
+            
+            log_page_result(self.logger, page, len(content_list))
+            # 随机延迟
+            self.spider.random_delay()
+            # 整页作为一个输入交给去重阶段
+            return [content_list]
+        
+        def dedupe(content_list):
+            # 过滤已存在的数据：整页一次查询（布隆过滤器命中的ID合并为一次数据库查询），不持有统计锁
+            known_ids = existing_ids.contains_many([content['_id'] for content in content_list])
+            # 已存在的数据只追加互动计数快照
+            self.db_manager.insert_snapshots(self.platform, [content for content in content_list
+                                                             if content['_id'] in known_ids])
+            new_ids = set(existing_ids.add_new([content['_id'] for content in content_list
+                                                if content['_id'] not in known_ids]))
+            new_content_list = []
+            for content in content_list:
+                if content['_id'] in new_ids:
+                    new_content_list.append(content)
+                    new_ids.discard(content['_id'])  # 同一页中重复出现的内容只保留第一条
+            
+            stored_list = self._tag_near_duplicates(new_content_list) if new_content_list else []
+            with stats_lock:
+                self.stats['total_crawled'] += len(stored_list)
+            return stored_list or None
+        
+        def write_db(batch):
+            success_count = self._batch_insert_data(batch)
+            with stats_lock:
+                self.stats['success_count'] += success_count
+                self.stats['error_count'] += len(batch) - success_count
+            return batch
+        
+        def write_file(batch):
+            # 逐批追加到会话目录的结构化数据文件，结束时合并
+            if not self.storage_manager.append_structured_data(batch, self.platform):
+                raise IOError("追加结构化数据失败")
+            return None
+        
+        stage_config = PIPELINE_CONFIG['stages']
+        pipeline = Pipeline(self.platform, PIPELINE_CONFIG['report_interval'], self.logger)
+        pipeline.add_stage('fetch', fetch, **stage_config['fetch'])
+        pipeline.add_stage('dedupe', dedupe, **stage_config['dedupe'])
+        pipeline.add_stage('db_writer', write_db, **stage_config['db_writer'])
+        pipeline.add_stage('file_writer', write_file, **stage_config['file_writer'])
+        return pipeline
+    
+    def _finish_crawl(self, keyword: str, max_pages: int, log_data: Dict[str, Any], all_crawled_data: list) -> bool:
+        """爬取结束：记录日志与统计，保存结构化数据、分析报告与会话元数据"""
+        # 更新统计信息
+        self.stats['end_time'] = datetime.now()
+        self.stats['duration'] = calculate_time_diff(
+            self.stats['start_time'], 
+            self.stats['end_time']
+        )
+        
+        # 记录爬取结束日志
+        log_data.update({
+            'end_time': self.stats['end_time'],
+            'total_crawled': self.stats['total_crawled'],
+            'success_count': self.stats['success_count'],
+            'error_count': self.stats['error_count'],
+            'status': 'completed' if self.is_running else 'interrupted',
+            'error_message': None
+        })
+        
+        self.db_manager.insert_crawl_log(log_data)
+        log_crawler_end(self.logger, self.stats)
+        
+        for key, state in self.spider.throttle.get_statistics(self.platform).items():
+            self.logger.info(f"[自适应限速] {key} 当前速率: {state['rate']} 次/秒 "
+                             f"(正常 {state['success_count']}, 受限 {state['penalty_count']})")
+        
+        if self.spider.hedger.enabled:
+            hedge_stats = self.spider.hedger.get_statistics()
+            self.logger.info(f"[对冲请求] 共 {hedge_stats['calls']} 次，发出备用请求 {hedge_stats['hedged']} 次，"
+                             f"主接口胜出 {hedge_stats['primary_wins']} 次，备用接口胜出 {hedge_stats['secondary_wins']} 次")
+        
+        # 保存结构化数据到文件 - 传递平台信息
+        if all_crawled_data:
+            self.storage_manager.save_structured_data(all_crawled_data, platform=self.platform)
+            self.logger.info(f"保存结构化数据: {len(all_crawled_data)} 条记录")
+        
+        # 生成并保存分析报告 - 传递平台信息
+        try:
+            if self.platform == 'weibo':  # 目前只有微博有分析器
+                analyzer = WeiboDataAnalyzer(self.db_manager)
+                report = analyzer.generate_summary_report(keyword)
+                if report:
+                    self.storage_manager.save_analysis_report(report, platform=self.platform)
+                    self.logger.info("保存分析报告完成")
+        except Exception as e:
+            self.logger.warning(f"生成分析报告失败: {e}")
+        
+        # 保存会话元数据
+        session_metadata = {
+            'platform': self.platform,
+            'keyword': keyword,
+            'max_pages': max_pages,
+            'total_crawled': self.stats['total_crawled'],
+            'success_count': self.stats['success_count'],
+            'error_count': self.stats['error_count'],
+            'start_time': self.stats['start_time'].isoformat(),
+            'end_time': self.stats['end_time'].isoformat(),
+            'duration': self.stats['duration']
+        }
+        self.storage_manager.save_session_metadata(session_metadata)
+        
+        return True
+    
+    def _record_crawl_error(self, log_data: Optional[Dict[str, Any]], error: Exception):
+        """记录爬取过程中的错误"""
+        self.logger.error(f"爬取过程发生错误: {error}")
+        
+        # 记录错误日志
+        if log_data:
+            log_data.update({
+                'end_time': datetime.now(),
                 'total_crawled': self.stats['total_crawled'],
                 'success_count': self.stats['success_count'],
                 'error_count': self.stats['error_count'],
-                'start_time': self.stats['start_time'].isoformat(),
-                'end_time': self.stats['end_time'].isoformat(),
-                'duration': self.stats['duration']
-            }
-            self.storage_manager.save_session_metadata(session_metadata)
+                'status': 'error',
+                'error_message': str(error)
+            })
+            self.db_manager.insert_crawl_log(log_data)
+    
+    def _open_session(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """打开会话目录：续爬模式下优先恢复最近一次未完成的会话，返回其断点"""
+        if self.resume:
+            session_dir = self.storage_manager.find_resumable_session(self.platform, keyword)
+            if session_dir and self.storage_manager.open_session_directory(session_dir):
+                checkpoint = self.storage_manager.load_checkpoint()
+                if checkpoint:
+                    self.logger.info(f"从断点恢复: {session_dir}，已完成 {checkpoint['last_completed_page']} 页")
+                    return checkpoint
+            self.logger.info("未找到可恢复的会话，开始新的爬取")
+        
+        session_dir = self.storage_manager.create_session_directory(keyword, self.platform)
+        if session_dir:
+            self.logger.info(f"创建统一数据存储会话目录: {session_dir}")
+        return None
+    
+    def _restore_checkpoint(self, checkpoint: Dict[str, Any], existing_ids: DedupeIndex,
+                            tracker: Optional[IncrementalTracker]):
+        """恢复断点中的进度、待插入数据、统计与去重状态，返回 (起始页, 待插入数据, 已爬取数据)"""
+        batch_data = checkpoint.get('pending_batch', [])
+        for content in batch_data:
+            # JSON中的时间为ISO字符串，恢复为datetime后再写入数据库
+            if isinstance(content.get('created_at'), str):
+                content['created_at'] = datetime.fromisoformat(content['created_at'])
+            content.setdefault('content_cluster_id', None)
+            existing_ids.add(content['_id'])
+        
+        for key in ('total_crawled', 'success_count', 'error_count', 'refreshed_count'):
+            self.stats[key] = checkpoint.get('stats', {}).get(key, 0)
+        
+        if tracker and checkpoint.get('incremental'):
+            tracker.restore_state(checkpoint['incremental'])
+        
+        all_crawled_data = self.storage_manager.load_structured_data(self.platform)
+        # 爬虫去重集合由本会话已保存与待插入的数据重建，更早的内容由数据库去重索引过滤
+        # （旧版断点中保存的 crawled_ids 仍然读取）
+        self.spider.crawled_ids.update(checkpoint.get('crawled_ids', []))
+        self.spider.crawled_ids.update(content['_id'] for content in all_crawled_data)
+        self.spider.crawled_ids.update(content['_id'] for content in batch_data)
+        start_page = checkpoint['last_completed_page'] + 1
+        self.logger.info(f"断点恢复完成: 从第 {start_page} 页继续，待插入 {len(batch_data)} 条，"
+                         f"已去重ID {len(self.spider.crawled_ids)} 个")
+        return start_page, batch_data, all_crawled_data
+    
+    def _save_checkpoint(self, keyword: str, max_pages: int, last_completed_page: int, batch_data: list,
+                         tracker: Optional[IncrementalTracker], status: str = 'running'):
+        """写入断点：已完成页码、尚未写入数据库的数据、统计与增量游标
+
+        爬虫的已爬取ID集合不写入断点（每页都完整序列化的开销随运行时长增长），恢复时重建
+        """
+        with self._stats_lock:
+            # 后台写入线程尚未确认的数据也记入断点，恢复时重新写入（INSERT IGNORE 不会重复）
+            pending_batch = batch_data + [content for batch in self._unwritten_batches for content in batch]
+            stats = {key: self.stats[key] for key in ('total_crawled', 'success_count', 'error_count', 'refreshed_count')}
+        
+        self.storage_manager.save_checkpoint({
+            'platform': self.platform,
+            'keyword': keyword,
+            'max_pages': max_pages,
+            'status': status,
+            'last_completed_page': last_completed_page,
+            'pending_batch': pending_batch,
+            'stats': stats,
+            'incremental': tracker.get_state() if tracker else None
+        })
+    
+    def _iter_pages(self, keyword: str, max_pages: int, start_page: int = 1):
+        """按页码顺序产出 (页码, 数据列表)，根据模式选择同步或异步爬取"""
+        if self.use_async:
+            yield from self._iter_pages_async(keyword, max_pages, start_page)
+            return
+        
+        trips_at_start = self.spider.circuit_breaker.trip_count
+        
+        page = start_page
+        while page <= max_pages:
+            if not self.is_running:
+                self.logger.info("收到停止信号，退出爬取")
+                return
             
-            return True
+            self.logger.info(f"正在爬取第 {page} 页...")
             
-        except Exception as e:
-            self.logger.error(f"爬取过程发生错误: {e}")
+            try:
+                # 爬取当前页数据
+                content_list = self._fetch_page(keyword, page, trips_at_start)
+            except Exception as e:
+                self.logger.error(f"爬取第 {page} 页失败: {e}")
+                self.stats['error_count'] += 1
+                page += 1
+                continue
             
-            # 记录错误日志
-            if 'log_data' in locals():
-                log_data.update({
-                    'end_time': datetime.now(),
-                    'total_crawled': self.stats['total_crawled'],
-                    'success_count': self.stats['success_count'],
-                    'error_count': self.stats['error_count'],
-                    'status': 'error',
-                    'error_message': str(e)
-                })
-                self.db_manager.insert_crawl_log(log_data)
+            if content_list is None:
+                return
             
-            return False
+            yield page, content_list
+            
+            # 随机延迟
+            if content_list:
+                self.spider.random_delay()
+            
+            page += 1
     
-    def _get_existing_ids(self) -> set:
-        """获取已存在的内容ID"""
-        if self.platform == 'weibo':
-            return self.db_manager.get_existing_ids()
-        elif self.platform == 'douyin':
-            # 为抖音添加获取已存在ID的方法
+    def _fetch_page(self, keyword: str, page: int, trips_at_start: int) -> Optional[list]:
+        """爬取单页，平台熔断时等待冷却结束后重新爬取该页，不跳过页面
+        
+        熔断次数超过上限时按中断处理（保留断点供 --resume 继续），收到停止信号或中断时返回None
+        """
+        max_trips = CIRCUIT_BREAKER_CONFIG['max_trips']
+        
+        while self.is_running:
             try:
-                with self.db_manager.connection.cursor() as cursor:
-                    cursor.execute("SELECT _id FROM douyin_data")
-                    results = cursor.fetchall()
-                    return {row[0] for row in results}
-            except Exception as e:
-                self.logger.error(f"获取已存在抖音ID失败: {e}")
-                return set()
+                return self.spider.crawl_with_retry(keyword, page)
+            except CircuitOpenError as e:
+                if self.spider.circuit_breaker.trip_count - trips_at_start >= max_trips:
+                    self.logger.error(f"{self.platform} 本次运行已熔断 {max_trips} 次，停止爬取")
+                    self.is_running = False
+                    return None
+                self.logger.warning(f"{e}，等待后重新爬取第 {page} 页")
+                self._wait(e.retry_after)
+        
+        return None
+    
+    def _create_incremental_tracker(self, keyword: str) -> IncrementalTracker:
+        """读取关键词水位线，创建增量爬取状态"""
+        watermark = self.db_manager.get_watermark(self.platform, keyword)
+        newest_created_at = watermark['newest_created_at'] if watermark else None
+        
+        if newest_created_at:
+            self.logger.info(f"[增量] 关键词 '{keyword}' 水位线: {newest_created_at} (ID: {watermark['newest_id']})")
         else:
-            return set()
+            self.logger.info(f"[增量] 关键词 '{keyword}' 尚无水位线，本次为首次爬取")
+        
+        return IncrementalTracker(newest_created_at)
+    
+    def _save_watermark(self, keyword: str, tracker: IncrementalTracker):
+        """衔接上次爬取范围后推进水位线"""
+        if not tracker.should_advance_watermark():
+            if tracker.watermark is not None and tracker.stop_reason is None:
+                self.logger.warning("[增量] 本次未翻到上次的水位线，保留原水位线以免遗漏中间数据")
+            return
+        
+        if self.db_manager.update_watermark(self.platform, keyword, tracker.newest_created_at, tracker.newest_id):
+            self.logger.info(f"[增量] 水位线更新为 {tracker.newest_created_at} (ID: {tracker.newest_id})")
+    
+    def _wait(self, seconds: float):
+        """可被停止信号打断的等待"""
+        deadline = time.monotonic() + seconds
+        while self.is_running and time.monotonic() < deadline:
+            time.sleep(max(0.0, min(1.0, deadline - time.monotonic())))
+    
+    def _iter_pages_async(self, keyword: str, max_pages: int, start_page: int = 1):
+        """在独立事件循环中并发爬取，按页码顺序产出结果"""
+        loop = asyncio.new_event_loop()
+        pages = self.spider.crawl_pages(keyword, start_page, max_pages)
+        
+        try:
+            while True:
+                if not self.is_running:
+                    self.logger.info("收到停止信号，退出爬取")
+                    break
+                
+                try:
+                    page, content_list = loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+                except CircuitOpenError as e:
+                    # 熔断次数超过上限，按中断处理，保留断点供 --resume 继续
+                    self.logger.error(f"{self.platform} 熔断次数过多，停止爬取: {e}")
+                    self.is_running = False
+                    break
+                
+                yield page, content_list
+        finally:
+            # 取消在途请求并关闭会话
+            loop.run_until_complete(pages.aclose())
+            loop.run_until_complete(self.spider.close())
+            loop.close()
+    
+    def _get_existing_ids(self) -> DedupeIndex:
+        """获取去重索引（优先使用调度器共享的索引）"""
+        if self.existing_ids is None:
+            self.existing_ids = DedupeIndex.open(self.platform, self.db_manager)
+        return self.existing_ids
+    
+    def _tag_near_duplicates(self, data_list: list) -> list:
+        """标记近似重复内容簇，按配置丢弃近似重复的内容"""
+        if not self.near_duplicates:
+            return data_list
+        return self.near_duplicates.process(data_list)
+    
+    def _store_batch(self, data_list: list):
+        """写入一批数据：启用后台写入时提交给写入线程后立即返回，不等待数据库提交"""
+        if not DB_WRITE_CONFIG['write_behind']:
+            self._on_batch_written(self.db_manager.bulk_insert(self.platform, data_list, self.upsert), [])
+            return
+        
+        with self._stats_lock:
+            self._unwritten_batches.append(data_list)
+        self.db_manager.get_writer().submit(self.platform, data_list, self._on_batch_written, self.upsert)
+    
+    def _on_batch_written(self, result: Dict[str, int], batches: list):
+        """后台写入完成回调（在写入线程中执行）"""
+        written = {id(batch) for batch in batches}
+        with self._stats_lock:
+            self.stats['success_count'] += result['inserted'] + result['updated'] + result['ignored']
+            self.stats['error_count'] += result['failed']
+            self.stats['refreshed_count'] += result['updated']
+            self._unwritten_batches = [batch for batch in self._unwritten_batches if id(batch) not in written]
     
     def _batch_insert_data(self, data_list) -> int:
         """批量插入数据"""
@@ -278,13 +682,29 @@ class MultiPlatformCrawler:
         
         return {
             'current_session': self.stats,
-            'database_stats': db_stats
+            'database_stats': db_stats,
+            'throttle': self.spider.throttle.get_statistics(self.platform),
+            'proxies': self.spider.proxy_pool.get_statistics() if self.spider.proxy_pool else {},
+            'hedging': self.spider.hedger.get_statistics(),
+            'retry': self.spider.retry_policy.get_statistics(),
+            'circuit_breaker': self.spider.circuit_breaker.get_state(),
+            'pipeline': self.pipeline.get_statistics() if self.pipeline else {},
+            'db_pool': self.db_manager.pool.get_statistics() if self.db_manager.pool else {},
+            'db_writer': self.db_manager.writer.get_statistics() if self.db_manager.writer else {},
+            'dedupe_index': self.existing_ids.get_statistics() if self.existing_ids is not None else {},
+            'near_duplicates': self.near_duplicates.get_statistics() if self.near_duplicates else {}
         }
     
     def cleanup(self):
         """清理资源"""
         try:
-            self.db_manager.disconnect()
+            if self.standalone:
+                if self.existing_ids is not None:
+                    self.existing_ids.save()
+                self.db_manager.disconnect()
+                if self.spider.proxy_pool:
+                    self.spider.proxy_pool.close()
+            self.spider.hedger.close()
             self.logger.info("资源清理完成")
         except Exception as e:
             self.logger.error(f"清理资源失败: {e}")
@@ -298,10 +718,21 @@ def main():
                        help='搜索关键词')
     parser.add_argument('--pages', '-n', type=int, 
                        help='最大爬取页数')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='使用异步并发模式爬取（并发数见 CRAWLER_CONFIG[\'concurrency\']）')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量爬取：按发布时间排序搜索，翻到上次已爬取的内容时停止')
+    parser.add_argument('--resume', action='store_true',
+                       help='从该平台+关键词最近一次中断的会话断点继续爬取')
+    parser.add_argument('--upsert', action='store_true',
+                       help='更新模式：重复爬到已入库的内容时刷新其互动计数（计数未变化的行不改写）')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='流水线模式：抓取、去重、入库、写文件各阶段并发运行（线程数见 PIPELINE_CONFIG）')
     
     args = parser.parse_args()
     
-    crawler = MultiPlatformCrawler(platform=args.platform)
+    crawler = MultiPlatformCrawler(platform=args.platform, use_async=args.use_async,
+                                   incremental=args.incremental, resume=args.resume, upsert=args.upsert)
     
     try:
         # 初始化系统
@@ -310,7 +741,10 @@ def main():
             return 1
         
         # 开始爬取数据
-        success = crawler.crawl_data(keyword=args.keyword, max_pages=args.pages)
+        if args.pipeline:
+            success = crawler.crawl_data_pipeline(keyword=args.keyword, max_pages=args.pages)
+        else:
+            success = crawler.crawl_data(keyword=args.keyword, max_pages=args.pages)
         
         # 显示统计信息
         stats = crawler.get_statistics()
@@ -320,6 +754,8 @@ def main():
         print(f"本次爬取: {stats['current_session']['total_crawled']} 条")
         print(f"成功保存: {stats['current_session']['success_count']} 条")
         print(f"失败数量: {stats['current_session']['error_count']} 条")
+        if args.upsert:
+            print(f"刷新计数: {stats['current_session']['refreshed_count']} 条")
         print(f"数据库总量: {stats['database_stats'].get('total_count', 0)} 条")
         print(f"今日爬取: {stats['database_stats'].get('today_count', 0)} 条")
         print("="*50)
@@ -0,0 +1,126 @@
+"""
+自适应限速模块
+AIMD（加性增、乘性减）：响应正常时线性提高请求速率，遇到封禁信号时按比例降低速率
+按 (平台, 代理) 分别维护速率
+"""
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from config.settings import THROTTLE_CONFIG
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DIRECT_CONNECTION = 'direct'
+
+class AIMDController:
+    """单个 (平台, 代理) 的AIMD速率控制器"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.rate = config['initial_rate']
+        self.bucket = TokenBucket(self.rate, burst=1)
+        self.success_count = 0
+        self.penalty_count = 0
+        self.last_signal = None
+        self._lock = threading.Lock()
+
+    def on_success(self):
+        """正常响应：加性提高速率"""
+        with self._lock:
+            self.success_count += 1
+            self._set_rate(min(self.config['max_rate'], self.rate + self.config['increase_step']))
+
+    def on_penalty(self, signal: str):
+        """封禁信号：乘性降低速率"""
+        with self._lock:
+            self.penalty_count += 1
+            self.last_signal = signal
+            self._set_rate(max(self.config['min_rate'], self.rate * self.config['decrease_factor']))
+
+    def _set_rate(self, rate: float):
+        self.rate = rate
+        self.bucket.set_rate(rate)
+
+    def get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'success_count': self.success_count,
+                'penalty_count': self.penalty_count,
+                'last_signal': self.last_signal
+            }
+
+class AdaptiveThrottle:
+    """按 (平台, 代理) 划分的自适应限速器"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or THROTTLE_CONFIG
+        self._controllers: Dict[Tuple[str, str], AIMDController] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.get('enabled', False)
+
+    def get_controller(self, platform: str, proxy: Optional[str] = None) -> AIMDController:
+        """获取（必要时创建）对应的控制器"""
+        key = (platform.lower(), proxy or DIRECT_CONNECTION)
+        with self._lock:
+            controller = self._controllers.get(key)
+            if controller is None:
+                controller = AIMDController(self.config)
+                self._controllers[key] = controller
+            return controller
+
+    def acquire(self, platform: str, proxy: Optional[str] = None) -> float:
+        """按当前速率等待发出下一个请求"""
+        if not self.enabled:
+            return 0.0
+        return self.get_controller(platform, proxy).bucket.acquire()
+
+    async def acquire_async(self, platform: str, proxy: Optional[str] = None) -> float:
+        """acquire 的异步版本"""
+        if not self.enabled:
+            return 0.0
+        return await self.get_controller(platform, proxy).bucket.acquire_async()
+
+    def record(self, platform: str, proxy: Optional[str], signal: Optional[str]):
+        """根据响应信号调整速率
+
+        signal 为 None 表示响应正常；惩罚信号（429/403/验证码/登录跳转）触发降速；
+        其他异常状态码（如5xx）不调整速率。
+        """
+        if not self.enabled:
+            return
+
+        controller = self.get_controller(platform, proxy)
+        if signal is None:
+            controller.on_success()
+        elif signal in self.config['penalty_signals']:
+            controller.on_penalty(signal)
+            logger.warning(f"[自适应限速] {platform}/{proxy or DIRECT_CONNECTION} 检测到 {signal}，"
+                           f"速率降至 {controller.rate:.3f} 次/秒")
+
+    def get_statistics(self, platform: str = None) -> Dict[str, Dict[str, Any]]:
+        """获取各控制器当前速率，可按平台过滤"""
+        with self._lock:
+            controllers = dict(self._controllers)
+        return {
+            f"{key[0]}/{key[1]}": controller.get_state()
+            for key, controller in controllers.items()
+            if platform is None or key[0] == platform.lower()
+        }
+
+_shared_throttle: Optional[AdaptiveThrottle] = None
+_shared_lock = threading.Lock()
+
+def get_adaptive_throttle() -> AdaptiveThrottle:
+    """获取进程内共享的自适应限速器"""
+    global _shared_throttle
+
+    with _shared_lock:
+        if _shared_throttle is None:
+            _shared_throttle = AdaptiveThrottle()
+        return _shared_throttle
@@ -0,0 +1,98 @@
+"""
+有界ID集合模块
+爬虫实例内的已爬取ID去重：按代淘汰最旧的ID，长期运行时内存保持恒定；
+纯数字ID（微博 mid、抖音 aweme_id）封存后以排序的 int64 数组存储，每个ID 8 字节
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Set
+
+from config.settings import CRAWLED_IDS_CONFIG
+
+INT64_MAX = 2 ** 63 - 1
+
+def _encode(content_id: str):
+    """规范的十进制数字ID转换为整数，其他ID原样返回"""
+    if content_id.isdigit() and (content_id[0] != '0' or content_id == '0'):
+        value = int(content_id)
+        if value <= INT64_MAX:
+            return value
+    return content_id
+
+class _Generation:
+    """封存的一代ID：数字ID为排序数组，其余为字符串集合"""
+
+    def __init__(self, ids: Set):
+        self.numbers = array('q', sorted(value for value in ids if isinstance(value, int)))
+        self.others = {value for value in ids if not isinstance(value, int)}
+
+    def __contains__(self, value) -> bool:
+        if isinstance(value, int):
+            index = bisect_left(self.numbers, value)
+            return index < len(self.numbers) and self.numbers[index] == value
+        return value in self.others
+
+    def __len__(self) -> int:
+        return len(self.numbers) + len(self.others)
+
+    def __iter__(self):
+        yield from self.numbers
+        yield from self.others
+
+class BoundedIdSet:
+    """按代淘汰的有界ID集合，接口与 set 一致（in / add / update / len / 迭代），线程安全
+
+    当前代写满 capacity/generations 个ID后封存为紧凑数组并开始新的一代，
+    超过 generations 代时丢弃最旧的一代（按首次加入时间淘汰）；每个ID只保存在一代中，长度与迭代结果准确。
+    """
+
+    def __init__(self, capacity: int = None, generations: int = None):
+        self.capacity = capacity or CRAWLED_IDS_CONFIG['capacity']
+        self.generations = max(2, generations or CRAWLED_IDS_CONFIG['generations'])
+        self.generation_size = max(1, self.capacity // self.generations)
+        self._current: Set = set()
+        self._sealed: List[_Generation] = []  # 从旧到新
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def _add(self, value):
+        """加入编码后的ID（调用方持有锁）"""
+        self._current.add(value)
+        if len(self._current) >= self.generation_size:
+            self._sealed.append(_Generation(self._current))
+            self._current = set()
+            if len(self._sealed) >= self.generations:
+                self.evicted += len(self._sealed.pop(0))
+
+    def _contains(self, value) -> bool:
+        """检查编码后的ID是否在任一代中（调用方持有锁）"""
+        return value in self._current or any(value in generation for generation in reversed(self._sealed))
+
+    def __contains__(self, content_id: str) -> bool:
+        value = _encode(content_id)
+        with self._lock:
+            return self._contains(value)
+
+    def add(self, content_id: str):
+        value = _encode(content_id)
+        with self._lock:
+            if not self._contains(value):
+                self._add(value)
+
+    def update(self, content_ids: Iterable[str]):
+        for content_id in content_ids:
+            self.add(content_id)
+
+    def __len__(self) -> int:
+        """保存的ID数"""
+        with self._lock:
+            return len(self._current) + sum(len(generation) for generation in self._sealed)
+
+    def __iter__(self) -> Iterator[str]:
+        """按从旧到新的顺序产出ID字符串"""
+        with self._lock:
+            generations = list(self._sealed) + [list(self._current)]
+        for generation in generations:
+            for value in generation:
+                yield str(value)
@@ -0,0 +1,124 @@
+"""
+熔断器模块
+按平台统计连续的响应验证失败（被封禁、跳转登录、接口返回错误码等），
+达到阈值后熔断：冷却期内直接拒绝请求，冷却结束后半开放行少量探测请求，探测成功再恢复
+"""
+import time
+import logging
+import threading
+from typing import Dict, Any
+
+from config.settings import CIRCUIT_BREAKER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """熔断期间拒绝请求，retry_after 为距离可再次请求的秒数"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 已熔断，{retry_after:.0f} 秒后重试")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """单个平台的熔断器"""
+
+    def __init__(self, name: str, config: Dict[str, Any] = None):
+        self.name = name
+        self.config = config or CIRCUIT_BREAKER_CONFIG
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.trip_count = 0  # 熔断次数
+        self.open_level = 0  # 连续熔断（半开探测失败）次数，决定冷却时长
+        self.opened_until = 0.0
+        self.next_probe_at = 0.0
+        self.last_reason = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.get('enabled', False)
+
+    def before_request(self):
+        """请求前检查，熔断中抛出 CircuitOpenError"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self.state == CLOSED:
+                return
+
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now < self.opened_until:
+                    raise CircuitOpenError(self.name, self.opened_until - now)
+                self.state = HALF_OPEN
+                logger.info(f"[熔断器] {self.name} 冷却结束，进入半开状态，放行探测请求")
+
+            # 半开状态每个探测间隔只放行一个请求，探测请求无结果（如网络异常）时到期自动放行下一个
+            if now < self.next_probe_at:
+                raise CircuitOpenError(self.name, self.next_probe_at - now)
+            self.next_probe_at = now + self.config['probe_interval']
+
+    def record_success(self):
+        """响应验证通过"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self.open_level = 0
+                logger.info(f"[熔断器] {self.name} 探测请求成功，恢复正常")
+
+    def record_failure(self, reason: str):
+        """响应验证失败"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.last_reason = reason
+            if self.state == HALF_OPEN:
+                self._open(f"探测请求失败（{reason}）")
+            elif self.state == CLOSED:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= self.config['failure_threshold']:
+                    self._open(f"连续 {self.consecutive_failures} 次响应验证失败（{reason}）")
+
+    def _open(self, reason: str):
+        cooldown = min(self.config['max_cooldown'], self.config['cooldown'] * (2 ** self.open_level))
+        self.state = OPEN
+        self.open_level += 1
+        self.trip_count += 1
+        self.consecutive_failures = 0
+        self.opened_until = time.monotonic() + cooldown
+        self.next_probe_at = self.opened_until
+        logger.warning(f"[熔断器] {self.name} {reason}，熔断 {cooldown} 秒")
+
+    def get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trip_count': self.trip_count,
+                'last_reason': self.last_reason,
+                'cooldown_remaining': max(0, round(self.opened_until - time.monotonic(), 1)) if self.state == OPEN else 0
+            }
+
+_shared_breakers: Dict[str, CircuitBreaker] = {}
+_shared_lock = threading.Lock()
+
+def get_circuit_breaker(platform: str) -> CircuitBreaker:
+    """获取进程内按平台共享的熔断器"""
+    key = platform.lower()
+    with _shared_lock:
+        breaker = _shared_breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(platform)
+            _shared_breakers[key] = breaker
+        return breaker
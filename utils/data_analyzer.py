@@ -1,27 +1,16 @@
 """
 数据分析和报告生成模块
 """
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from collections import Counter
-from decimal import Decimal
-import re
 
-logger = logging.getLogger(__name__)
+from database.models import SNAPSHOT_COUNTERS
+from utils.data_processor import HASHTAG_PATTERN
+from utils import json_codec
 
-class DecimalEncoder(json.JSONEncoder):
-    """自定义JSON编码器，处理Decimal和datetime类型"""
-    
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            # 将Decimal转换为float，保持数值精度
-            return float(obj)
-        elif isinstance(obj, datetime):
-            # 将datetime转换为ISO格式字符串
-            return obj.isoformat()
-        return super(DecimalEncoder, self).default(obj)
+logger = logging.getLogger(__name__)
 
 class WeiboDataAnalyzer:
     """微博数据分析器"""
@@ -32,7 +21,7 @@ class WeiboDataAnalyzer:
     def generate_summary_report(self, keyword: str = "李雨珊事件") -> Dict[str, Any]:
         """生成数据摘要报告"""
         try:
-            if not self.db_manager.connection:
+            if not self.db_manager.pool:
                 if not self.db_manager.connect():
                     return {}
             
@@ -56,7 +45,7 @@ class WeiboDataAnalyzer:
     def _get_basic_statistics(self, keyword: str) -> Dict[str, Any]:
         """获取基础统计信息"""
         try:
-            with self.db_manager.connection.cursor() as cursor:
+            with self.db_manager.cursor() as cursor:
                 # 总数据量
                 cursor.execute("""
                     SELECT COUNT(*) as total_count,
@@ -90,7 +79,7 @@ class WeiboDataAnalyzer:
     def _get_time_distribution(self, keyword: str) -> Dict[str, Any]:
         """获取时间分布分析"""
         try:
-            with self.db_manager.connection.cursor() as cursor:
+            with self.db_manager.cursor() as cursor:
                 # 按日期分布
                 cursor.execute("""
                     SELECT DATE(created_at) as post_date, 
@@ -137,7 +126,7 @@ class WeiboDataAnalyzer:
     def _get_user_analysis(self, keyword: str) -> Dict[str, Any]:
         """获取用户分析"""
         try:
-            with self.db_manager.connection.cursor() as cursor:
+            with self.db_manager.cursor() as cursor:
                 # 活跃用户TOP10
                 cursor.execute("""
                     SELECT user_nick_name, 
@@ -185,12 +174,12 @@ class WeiboDataAnalyzer:
             return {}
     
     def _get_content_analysis(self, keyword: str) -> Dict[str, Any]:
-        """获取内容分析"""
+        """获取内容分析（来源与话题按近似重复内容簇去重统计，复制转发的内容只计一次）"""
         try:
-            with self.db_manager.connection.cursor() as cursor:
+            with self.db_manager.cursor() as cursor:
                 # 获取所有内容进行分析
                 cursor.execute("""
-                    SELECT content, pic_num, isLongText, source
+                    SELECT content, pic_num, isLongText, source, COALESCE(content_cluster_id, _id)
                     FROM weibo_data 
                     WHERE keyword = %s AND content IS NOT NULL
                 """, (keyword,))
@@ -202,21 +191,34 @@ class WeiboDataAnalyzer:
                 long_text_count = sum(1 for row in contents if row[2])
                 has_image_count = sum(1 for row in contents if row[1] and row[1] > 0)
                 
+                # 每个内容簇保留第一条作为代表
+                cluster_sizes = Counter(row[4] for row in contents)
+                representatives = {}
+                for row in contents:
+                    representatives.setdefault(row[4], row)
+                distinct_contents = list(representatives.values())
+                
                 # 来源统计
-                sources = [row[3] for row in contents if row[3]]
+                sources = [row[3] for row in distinct_contents if row[3]]
                 source_counter = Counter(sources)
                 
                 # 提取话题标签
-                all_hashtags = []
-                for row in contents:
+                hashtag_counter = Counter()
+                for row in distinct_contents:
                     if row[0]:
-                        hashtags = re.findall(r'#([^#]+)#', row[0])
-                        all_hashtags.extend(hashtags)
-                
-                hashtag_counter = Counter(all_hashtags)
+                        hashtag_counter.update(HASHTAG_PATTERN.findall(row[0]))
                 
                 return {
                     'total_analyzed': total_posts,
+                    'distinct_voices': len(distinct_contents),
+                    'near_duplicate_ratio': round((total_posts - len(distinct_contents)) / total_posts * 100, 2) if total_posts > 0 else 0,
+                    'top_duplicate_clusters': [
+                        {
+                            'cluster_id': cluster_id,
+                            'count': count,
+                            'content': representatives[cluster_id][0][:100]
+                        } for cluster_id, count in cluster_sizes.most_common(10) if count > 1
+                    ],
                     'long_text_ratio': round(long_text_count / total_posts * 100, 2) if total_posts > 0 else 0,
                     'image_ratio': round(has_image_count / total_posts * 100, 2) if total_posts > 0 else 0,
                     'top_sources': [
@@ -236,7 +238,7 @@ class WeiboDataAnalyzer:
     def _get_engagement_analysis(self, keyword: str) -> Dict[str, Any]:
         """获取互动分析"""
         try:
-            with self.db_manager.connection.cursor() as cursor:
+            with self.db_manager.cursor() as cursor:
                 # 互动数据统计
                 cursor.execute("""
                     SELECT 
@@ -297,7 +299,7 @@ class WeiboDataAnalyzer:
     def _get_geographic_analysis(self, keyword: str) -> Dict[str, Any]:
         """获取地理分析"""
         try:
-            with self.db_manager.connection.cursor() as cursor:
+            with self.db_manager.cursor() as cursor:
                 # IP位置统计
                 cursor.execute("""
                     SELECT ip_location, COUNT(*) as count
@@ -337,6 +339,95 @@ class WeiboDataAnalyzer:
             logger.error(f"获取地理分析失败: {e}")
             return {}
     
+    def get_engagement_velocity(self, post_id: str, platform: str = 'weibo', since: datetime = None) -> List[Dict[str, Any]]:
+        """计算单条内容各互动计数的增长速度（每小时）与加速度（每小时²）
+        
+        基于 engagement_snapshots 中按时间排序的快照，第一个快照没有速度，前两个快照没有加速度
+        """
+        try:
+            if not self.db_manager.pool:
+                if not self.db_manager.connect():
+                    return []
+            
+            counters = [name for name, column in SNAPSHOT_COUNTERS[platform].items() if column]
+            with self.db_manager.cursor() as cursor:
+                # 主键 (platform, post_id, snapshot_time) 范围扫描
+                cursor.execute(f"""
+                    SELECT snapshot_time, {', '.join(counters)}
+                    FROM engagement_snapshots
+                    WHERE platform = %s AND post_id = %s AND snapshot_time >= %s
+                    ORDER BY snapshot_time
+                """, (platform, post_id, since or datetime.min))
+                rows = cursor.fetchall()
+            
+            points = []
+            for index, row in enumerate(rows):
+                point = {
+                    'snapshot_time': row[0],
+                    'counters': {name: row[i + 1] or 0 for i, name in enumerate(counters)},
+                    'velocity': None,
+                    'acceleration': None
+                }
+                if index > 0:
+                    previous = points[-1]
+                    hours = (point['snapshot_time'] - previous['snapshot_time']).total_seconds() / 3600
+                    point['velocity'] = {
+                        name: (point['counters'][name] - previous['counters'][name]) / hours for name in counters
+                    }
+                    if previous['velocity'] is not None:
+                        # 速度对应区间中点，加速度按两个区间中点的时间差计算
+                        span = (point['snapshot_time'] - points[-2]['snapshot_time']).total_seconds() / 3600 / 2
+                        point['acceleration'] = {
+                            name: (point['velocity'][name] - previous['velocity'][name]) / span for name in counters
+                        }
+                points.append(point)
+            
+            return points
+            
+        except Exception as e:
+            logger.error(f"计算互动增长速度失败: {e}")
+            return []
+    
+    def get_fastest_growing_posts(self, platform: str = 'weibo', hours: int = 24, counter: str = 'likes',
+                                  limit: int = 20) -> List[Dict[str, Any]]:
+        """最近 hours 小时内指定互动计数增长最快的内容（按每小时增长量排序）"""
+        if not SNAPSHOT_COUNTERS[platform].get(counter):
+            logger.error(f"{platform} 不支持的互动计数: {counter}")
+            return []
+        
+        try:
+            if not self.db_manager.pool:
+                if not self.db_manager.connect():
+                    return []
+            
+            with self.db_manager.cursor() as cursor:
+                # 按时间范围扫描，只涉及最近几天的分区
+                cursor.execute(f"""
+                    SELECT post_id,
+                           MAX({counter}) - MIN({counter}) as growth,
+                           TIMESTAMPDIFF(SECOND, MIN(snapshot_time), MAX(snapshot_time)) as seconds,
+                           COUNT(*) as snapshots
+                    FROM engagement_snapshots
+                    WHERE platform = %s AND snapshot_time >= %s
+                    GROUP BY post_id
+                    HAVING snapshots > 1 AND seconds > 0
+                    ORDER BY growth * 3600 / seconds DESC
+                    LIMIT %s
+                """, (platform, datetime.now() - timedelta(hours=hours), limit))
+                
+                return [
+                    {
+                        'post_id': row[0],
+                        'growth': row[1] or 0,
+                        'velocity': (row[1] or 0) * 3600 / row[2],
+                        'snapshots': row[3]
+                    } for row in cursor.fetchall()
+                ]
+                
+        except Exception as e:
+            logger.error(f"获取增长最快内容失败: {e}")
+            return []
+    
     def export_report_to_json(self, report: Dict[str, Any], filename: str = None) -> str:
         """导出报告为JSON文件"""
         try:
@@ -348,8 +439,7 @@ class WeiboDataAnalyzer:
             import os
             os.makedirs(os.path.dirname(filename), exist_ok=True)
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+            json_codec.dump_file(report, filename, indent=True)
             
             logger.info(f"报告已导出到: {filename}")
             return filename
@@ -397,6 +487,7 @@ class WeiboDataAnalyzer:
             content = report.get('content_analysis', {})
             if content:
                 print(f"\n📝 内容分析:")
+                print(f"  不同内容: {content.get('distinct_voices', 0)}条 (近似重复占比 {content.get('near_duplicate_ratio', 0)}%)")
                 print(f"  长文本比例: {content.get('long_text_ratio', 0)}%")
                 print(f"  含图片比例: {content.get('image_ratio', 0)}%")
                 
@@ -2,34 +2,88 @@
 数据处理工具模块
 """
 import re
-import json
 import logging
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict, Any
 from datetime import datetime
 from urllib.parse import urlparse
 
+from utils import json_codec
+
 logger = logging.getLogger(__name__)
 
+# 来源匹配模式（按优先级）
+SOURCE_PATTERNS = [
+    re.compile(r'来自\s*([^<>\n]+)', re.IGNORECASE),
+    re.compile(r'via\s+([^<>\n]+)', re.IGNORECASE),
+    re.compile(r'source:\s*([^<>\n]+)', re.IGNORECASE),
+    re.compile(r'发布于\s*([^<>\n]+)', re.IGNORECASE)
+]
+CLIENT_PATTERN = re.compile(r'(iPhone|Android|iPad|微博网页版|微博桌面版)')
+
+# 图片URL匹配模式
+PIC_URL_PATTERNS = [
+    re.compile(r'https?://[^\s<>"]+\.(?:jpg|jpeg|png|gif|webp|bmp)'),
+    re.compile(r'https?://wx\d+\.sinaimg\.cn/[^\s<>"]+'),
+    re.compile(r'https?://tva\d+\.sinaimg\.cn/[^\s<>"]+'),
+    re.compile(r'https?://ww\d+\.sinaimg\.cn/[^\s<>"]+')
+]
+VALID_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+IMAGE_URL_CACHE_SIZE = 65536  # 图片URL验证结果缓存条数（同一图片常被多条转发引用）
+
+HASHTAG_PATTERN = re.compile(r'#([^#]+)#')
+MENTION_PATTERN = re.compile(r'@([^\s@]+)')
+URL_PATTERN = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+CONTROL_CHAR_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+DOUYIN_HASHTAG_PATTERN = re.compile(r'#([^#\s]+)#')
+DOUYIN_MENTION_PATTERN = re.compile(r'@([^\s@#]+)')
+
+# extract_all 中以一次扫描提取话题、@用户、来源和客户端（结果与上面各模式分别匹配一致）：
+# 每个分支以一个字面字符开头，正则引擎可直接跳过不可能匹配的位置；
+# 分支只消耗这个字符，其余部分放在先行断言中，不同类型的匹配可以相互重叠。
+# 链接与图片不在此扫描：多图微博中链接很多，逐个在Python中处理比 URL_PATTERN / PIC_URL_PATTERNS 的 findall 慢
+CONTENT_SCAN_PATTERN = re.compile(
+    r'#(?=(?P<hashtag>[^#]+)#)'
+    r'|@(?=(?P<mention>[^\s@]+))'
+    r'|来(?=自\s*(?P<source_from>[^<>\n]+))'
+    r'|v(?=[iI][aA]\s+(?P<source_via>[^<>\n]+))'
+    r'|V(?=[iI][aA]\s+(?P<source_via_upper>[^<>\n]+))'
+    r'|s(?=[oO][uU][rR][cC][eE]:\s*(?P<source_colon>[^<>\n]+))'
+    r'|S(?=[oO][uU][rR][cC][eE]:\s*(?P<source_colon_upper>[^<>\n]+))'
+    r'|发(?=布于\s*(?P<source_published>[^<>\n]+))'
+    r'|i(?=(?P<client_i>Phone|Pad))'
+    r'|A(?=(?P<client_a>ndroid))'
+    r'|微(?=(?P<client_weibo>博网页版|博桌面版))'
+)
+# 来源分组对应 SOURCE_PATTERNS 中的优先级
+SOURCE_GROUP_PRIORITY = {
+    'source_from': 0,
+    'source_via': 1,
+    'source_via_upper': 1,
+    'source_colon': 2,
+    'source_colon_upper': 2,
+    'source_published': 3
+}
+
+@lru_cache(maxsize=IMAGE_URL_CACHE_SIZE)
+def is_valid_image_url(url: str) -> bool:
+    """验证图片URL是否有效（结果缓存）"""
+    try:
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            return False
+        
+        # 检查文件扩展名
+        return parsed.path.lower().endswith(VALID_IMAGE_EXTENSIONS)
+        
+    except Exception:
+        return False
+
 class DataProcessor:
     """数据处理类"""
     
-    def __init__(self):
-        # 来源匹配模式
-        self.source_patterns = [
-            r'来自\s*([^<>\n]+)',
-            r'via\s+([^<>\n]+)',
-            r'source:\s*([^<>\n]+)',
-            r'发布于\s*([^<>\n]+)'
-        ]
-        
-        # 图片URL匹配模式
-        self.pic_url_patterns = [
-            r'https?://[^\s<>"]+\.(?:jpg|jpeg|png|gif|webp|bmp)',
-            r'https?://wx\d+\.sinaimg\.cn/[^\s<>"]+',
-            r'https?://tva\d+\.sinaimg\.cn/[^\s<>"]+',
-            r'https?://ww\d+\.sinaimg\.cn/[^\s<>"]+'
-        ]
-    
     def extract_source_and_pics(self, content: str) -> Tuple[Optional[str], List[str]]:
         """从微博正文中提取来源和图片URL"""
         source = self._extract_source(content)
@@ -37,19 +91,67 @@ class DataProcessor:
         
         return source, pic_urls
     
+    def extract_all(self, content: str) -> Dict[str, Any]:
+        """提取正文的来源、图片URL、话题标签、@用户和URL链接（需要全部字段时使用）
+        
+        话题、@用户、来源和客户端在 CONTENT_SCAN_PATTERN 的一次扫描中取得，URL链接另做一次
+        URL_PATTERN.findall，图片URL由 _extract_pic_urls 匹配；只需要来源和图片时用 extract_source_and_pics。
+        各字段与 _extract_source、_extract_pic_urls、extract_hashtags、extract_mentions、
+        extract_urls 的结果相同
+        """
+        result = {'source': None, 'pic_urls': [], 'hashtags': [], 'mentions': [], 'urls': []}
+        if not content:
+            return result
+        
+        try:
+            hashtags, mentions = result['hashtags'], result['mentions']
+            source, source_priority, client = None, len(SOURCE_PATTERNS), None
+            hashtag_end = 0
+            
+            for match in CONTENT_SCAN_PATTERN.finditer(content):
+                kind = match.lastgroup
+                if kind == 'hashtag':
+                    # 与 findall 一致，话题之间不重叠
+                    start = match.start()
+                    if start >= hashtag_end:
+                        tag = match.group(kind)
+                        hashtag_end = start + len(tag) + 2
+                        if tag.strip():
+                            hashtags.append(tag.strip())
+                elif kind == 'mention':
+                    mentions.append(match.group(kind))
+                elif kind in SOURCE_GROUP_PRIORITY:
+                    if SOURCE_GROUP_PRIORITY[kind] < source_priority:
+                        source, source_priority = match.group(kind), SOURCE_GROUP_PRIORITY[kind]
+                elif client is None:
+                    client = match.group(0) + match.group(kind)
+            
+            if source is not None:
+                result['source'] = HTML_TAG_PATTERN.sub('', source.strip())
+            else:
+                result['source'] = client
+            result['urls'] = URL_PATTERN.findall(content)
+            result['pic_urls'] = self._extract_pic_urls(content)
+            
+            return result
+            
+        except Exception as e:
+            logger.warning(f"提取正文信息失败: {e}")
+            return result
+    
     def _extract_source(self, content: str) -> Optional[str]:
         """提取来源信息"""
         try:
-            for pattern in self.source_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
+            for pattern in SOURCE_PATTERNS:
+                match = pattern.search(content)
                 if match:
                     source = match.group(1).strip()
                     # 清理HTML标签
-                    source = re.sub(r'<[^>]+>', '', source)
+                    source = HTML_TAG_PATTERN.sub('', source)
                     return source
             
             # 如果没有明确的来源标识，尝试提取可能的客户端信息
-            client_match = re.search(r'(iPhone|Android|iPad|微博网页版|微博桌面版)', content)
+            client_match = CLIENT_PATTERN.search(content)
             if client_match:
                 return client_match.group(1)
             
@@ -63,18 +165,17 @@ class DataProcessor:
         """提取图片URL"""
         pic_urls = []
         
+        # 图片URL都以 http 开头，正文中没有时不必再匹配图片模式
+        if not content or 'http' not in content:
+            return pic_urls
+        
         try:
-            for pattern in self.pic_url_patterns:
-                matches = re.findall(pattern, content)
+            for pattern in PIC_URL_PATTERNS:
+                matches = pattern.findall(content)
                 pic_urls.extend(matches)
             
-            # 去重并验证URL
-            unique_urls = []
-            for url in pic_urls:
-                if url not in unique_urls and self._is_valid_image_url(url):
-                    unique_urls.append(url)
-            
-            return unique_urls
+            # 保序去重并验证URL
+            return [url for url in dict.fromkeys(pic_urls) if is_valid_image_url(url)]
             
         except Exception as e:
             logger.warning(f"提取图片URL失败: {e}")
@@ -82,19 +183,7 @@ class DataProcessor:
     
     def _is_valid_image_url(self, url: str) -> bool:
         """验证图片URL是否有效"""
-        try:
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                return False
-            
-            # 检查文件扩展名
-            path = parsed.path.lower()
-            valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']
-            
-            return any(path.endswith(ext) for ext in valid_extensions)
-            
-        except Exception:
-            return False
+        return is_valid_image_url(url)
     
     def clean_content(self, content: str) -> str:
         """清理微博内容"""
@@ -103,13 +192,13 @@ class DataProcessor:
         
         try:
             # 移除HTML标签
-            content = re.sub(r'<[^>]+>', '', content)
+            content = HTML_TAG_PATTERN.sub('', content)
             
             # 移除多余的空白字符
-            content = re.sub(r'\s+', ' ', content)
+            content = WHITESPACE_PATTERN.sub(' ', content)
             
             # 移除特殊字符
-            content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', content)
+            content = CONTROL_CHAR_PATTERN.sub('', content)
             
             return content.strip()
             
@@ -120,7 +209,7 @@ class DataProcessor:
     def extract_hashtags(self, content: str) -> List[str]:
         """提取话题标签"""
         try:
-            hashtags = re.findall(r'#([^#]+)#', content)
+            hashtags = HASHTAG_PATTERN.findall(content)
             return [tag.strip() for tag in hashtags if tag.strip()]
         except Exception as e:
             logger.warning(f"提取话题标签失败: {e}")
@@ -129,7 +218,7 @@ class DataProcessor:
     def extract_mentions(self, content: str) -> List[str]:
         """提取@用户"""
         try:
-            mentions = re.findall(r'@([^\s@]+)', content)
+            mentions = MENTION_PATTERN.findall(content)
             return [mention.strip() for mention in mentions if mention.strip()]
         except Exception as e:
             logger.warning(f"提取@用户失败: {e}")
@@ -138,8 +227,7 @@ class DataProcessor:
     def extract_urls(self, content: str) -> List[str]:
         """提取URL链接"""
         try:
-            url_pattern = r'https?://[^\s<>"]+|www\.[^\s<>"]+'
-            urls = re.findall(url_pattern, content)
+            urls = URL_PATTERN.findall(content)
             return [url.strip() for url in urls if url.strip()]
         except Exception as e:
             logger.warning(f"提取URL失败: {e}")
@@ -164,7 +252,7 @@ class DataProcessor:
             
             coordinates = geo_data.get('coordinates')
             if coordinates:
-                processed['geo_coordinates'] = json.dumps(coordinates)
+                processed['geo_coordinates'] = json_codec.dumps(coordinates)
             
             detail = geo_data.get('detail', {})
             if detail:
@@ -345,7 +433,7 @@ class DataProcessor:
         """提取抖音话题标签"""
         try:
             # 抖音话题标签格式：#话题名#
-            hashtags = re.findall(r'#([^#\s]+)#', content)
+            hashtags = DOUYIN_HASHTAG_PATTERN.findall(content)
             return [tag.strip() for tag in hashtags if tag.strip()]
         except Exception as e:
             logger.warning(f"提取抖音话题标签失败: {e}")
@@ -355,7 +443,7 @@ class DataProcessor:
         """提取抖音@用户"""
         try:
             # 抖音@用户格式：@用户名
-            mentions = re.findall(r'@([^\s@#]+)', content)
+            mentions = DOUYIN_MENTION_PATTERN.findall(content)
             return [mention.strip() for mention in mentions if mention.strip()]
         except Exception as e:
             logger.warning(f"提取抖音@用户失败: {e}")
@@ -3,16 +3,18 @@
 按时间戳组织数据存储，每次爬取创建独立的文件夹
 """
 import os
-import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 from pathlib import Path
 
-from utils.data_analyzer import WeiboDataAnalyzer, DecimalEncoder
+from utils.data_analyzer import WeiboDataAnalyzer
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+CHECKPOINT_FILENAME = "checkpoint.json"
+
 class DataStorageManager:
     """数据存储管理器类"""
     
@@ -96,8 +98,7 @@ class DataStorageManager:
             # 保存文件
             file_path = self.current_session_dir / "raw_data" / filename
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+            json_codec.dump_file(data, file_path, indent=True)
             
             logger.info(f"保存原始数据: {file_path} ({len(data)} 条记录)")
             return True
@@ -131,8 +132,7 @@ class DataStorageManager:
             # 保存文件
             file_path = self.current_session_dir / "structured_data" / filename
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+            json_codec.dump_file(data, file_path, indent=True)
             
             logger.info(f"保存结构化数据: {file_path} ({len(data)} 条记录)")
             return True
@@ -141,6 +141,46 @@ class DataStorageManager:
             logger.error(f"保存结构化数据失败: {e}")
             return False
     
+    def append_structured_data(self, data: List[Dict[str, Any]], platform: str) -> bool:
+        """逐批追加结构化数据（JSON Lines，流水线写文件阶段使用），结束时由 merge_structured_data 合并"""
+        try:
+            if not self.current_session_dir:
+                logger.error("未创建会话目录，无法保存结构化数据")
+                return False
+            
+            file_path = self.current_session_dir / "structured_data" / f"{platform.lower()}_structured_data_{self.session_timestamp}.jsonl"
+            with open(file_path, 'ab') as f:
+                f.write(b''.join(json_codec.dumps_bytes(record) + b'\n' for record in data))
+            
+            logger.debug(f"追加结构化数据: {file_path} ({len(data)} 条记录)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"追加结构化数据失败: {e}")
+            return False
+    
+    def merge_structured_data(self, platform: str) -> int:
+        """将 append_structured_data 追加的 JSON Lines 合并为结构化数据文件（格式与 save_structured_data 相同），返回条数"""
+        try:
+            if not self.current_session_dir:
+                return 0
+            
+            lines_path = self.current_session_dir / "structured_data" / f"{platform.lower()}_structured_data_{self.session_timestamp}.jsonl"
+            if not lines_path.exists():
+                return 0
+            
+            with open(lines_path, 'rb') as f:
+                data = [json_codec.loads(line) for line in f if line.strip()]
+            
+            if data and not self.save_structured_data(data, platform=platform):
+                return 0
+            lines_path.unlink()
+            return len(data)
+            
+        except Exception as e:
+            logger.error(f"合并结构化数据失败: {e}")
+            return 0
+    
     def save_analysis_report(self, report: Dict[str, Any], db_manager=None, keyword: str = None, platform: str = None) -> bool:
         """保存分析报告 - 统一文件命名格式"""
         try:
@@ -174,8 +214,7 @@ class DataStorageManager:
             # 保存文件
             file_path = self.current_session_dir / "analysis_report" / filename
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+            json_codec.dump_file(report, file_path, indent=True)
             
             logger.info(f"保存分析报告: {file_path}")
             return True
@@ -206,8 +245,7 @@ class DataStorageManager:
             # 保存元数据文件
             file_path = self.current_session_dir / "session_metadata.json"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+            json_codec.dump_file(metadata, file_path, indent=True)
             
             logger.info(f"保存会话元数据: {file_path}")
             return True
@@ -216,6 +254,120 @@ class DataStorageManager:
             logger.error(f"保存会话元数据失败: {e}")
             return False
     
+    def save_checkpoint(self, checkpoint: Dict[str, Any]) -> bool:
+        """保存断点（先写临时文件再替换，避免中途被终止时留下不完整的文件）"""
+        try:
+            if not self.current_session_dir:
+                logger.error("未创建会话目录，无法保存断点")
+                return False
+            
+            checkpoint['updated_at'] = datetime.now().isoformat()
+            file_path = self.current_session_dir / CHECKPOINT_FILENAME
+            tmp_path = file_path.with_suffix('.tmp')
+            
+            json_codec.dump_file(checkpoint, tmp_path)
+            os.replace(tmp_path, file_path)
+            
+            logger.debug(f"保存断点: 第 {checkpoint.get('last_completed_page')} 页")
+            return True
+            
+        except Exception as e:
+            logger.error(f"保存断点失败: {e}")
+            return False
+    
+    def load_checkpoint(self, session_dir: str = None) -> Optional[Dict[str, Any]]:
+        """读取会话目录中的断点，不存在时返回None"""
+        try:
+            session_path = Path(session_dir) if session_dir else self.current_session_dir
+            if not session_path:
+                return None
+            
+            file_path = session_path / CHECKPOINT_FILENAME
+            if not file_path.exists():
+                return None
+            
+            return json_codec.load_file(file_path)
+            
+        except Exception as e:
+            logger.error(f"读取断点失败: {e}")
+            return None
+    
+    def find_resumable_session(self, platform: str, keyword: str) -> Optional[str]:
+        """查找该平台+关键词最近一次未完成的会话目录"""
+        try:
+            platform = platform.lower()
+            suffix = f"_{platform}_{self._clean_filename(keyword)}"
+            
+            candidates = [
+                session_dir
+                for level1_dir in self.base_data_dir.glob(f"*_{platform}")
+                for session_dir in level1_dir.iterdir()
+                if session_dir.is_dir() and session_dir.name.endswith(suffix)
+                and (session_dir / CHECKPOINT_FILENAME).exists()
+            ]
+            
+            # 目录名以时间戳开头，按名称倒序即最近的会话在前
+            for session_dir in sorted(candidates, key=lambda d: d.name, reverse=True):
+                checkpoint = self.load_checkpoint(str(session_dir))
+                if checkpoint and checkpoint.get('status') != 'completed':
+                    return str(session_dir)
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"查找可恢复会话失败: {e}")
+            return None
+    
+    def open_session_directory(self, session_dir: str) -> bool:
+        """重新打开已有的会话目录（断点续爬），后续数据写入该目录"""
+        session_path = Path(session_dir)
+        if not session_path.is_dir():
+            logger.error(f"会话目录不存在: {session_dir}")
+            return False
+        
+        self.current_session_dir = session_path
+        # 目录名格式：时间戳(YYYYmmdd_HHMMSS)_平台_关键词
+        self.session_timestamp = '_'.join(session_path.name.split('_')[:2])
+        logger.info(f"恢复爬取会话目录: {self.current_session_dir}")
+        return True
+    
+    def load_structured_data(self, platform: str) -> List[Dict[str, Any]]:
+        """读取当前会话已保存的结构化数据（断点续爬时与新数据合并后重新保存）"""
+        try:
+            if not self.current_session_dir:
+                return []
+            
+            file_path = self.current_session_dir / "structured_data" / f"{platform.lower()}_structured_data_{self.session_timestamp}.json"
+            if not file_path.exists():
+                return []
+            
+            return json_codec.load_file(file_path)
+            
+        except Exception as e:
+            logger.error(f"读取结构化数据失败: {e}")
+            return []
+    
+    def find_session_directories(self, path: str) -> List[str]:
+        """查找路径下的所有会话目录（含 raw_data 子目录），path 可以是会话目录、一级目录或数据根目录"""
+        root = Path(path)
+        if (root / "raw_data").is_dir():
+            return [str(root)]
+        return sorted(str(raw_dir.parent) for raw_dir in root.rglob("raw_data") if raw_dir.is_dir())
+    
+    def iter_raw_records(self, session_dir: str, platform: str) -> Iterator[Dict[str, Any]]:
+        """逐条读取会话目录中某平台的原始数据（用于回灌数据库），发布时间恢复为datetime"""
+        for file_path in sorted((Path(session_dir) / "raw_data").glob(f"{platform.lower()}_raw_*.json")):
+            try:
+                records = json_codec.load_file(file_path)
+            except Exception as e:
+                logger.error(f"读取原始数据失败: {file_path}: {e}")
+                continue
+            
+            for record in records:
+                if isinstance(record.get('created_at'), str):
+                    record['created_at'] = datetime.fromisoformat(record['created_at'])
+                yield record
+    
     def get_session_summary(self) -> Dict[str, Any]:
         """获取当前会话摘要"""
         if not self.current_session_dir or not self.current_session_dir.exists():
@@ -291,8 +443,7 @@ class DataStorageManager:
             # 尝试读取元数据文件
             metadata_file = session_dir / "session_metadata.json"
             if metadata_file.exists():
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return json_codec.load_file(metadata_file)
             
             # 如果没有元数据文件，生成基本信息
             return {
@@ -0,0 +1,202 @@
+"""
+去重索引模块
+以持久化到磁盘的布隆过滤器代替启动时把数据表中全部 _id 加载为集合：
+启动时读取位数组并只同步上次之后新增的行，内存占用只与容量有关；
+布隆过滤器判定"可能存在"时再查询数据库确认，判定结果精确
+"""
+import os
+import math
+import hashlib
+import logging
+import threading
+from typing import Iterable, List, Optional, Set
+
+from config.settings import DEDUPE_CONFIG
+from utils import json_codec
+from utils.bounded_id_set import BoundedIdSet
+
+logger = logging.getLogger(__name__)
+
+class DedupeIndex:
+    """基于布隆过滤器的已存在ID索引，接口与 set 一致（in / add / len），线程安全"""
+
+    def __init__(self, platform: str, capacity: int, error_rate: float):
+        self.platform = platform
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0  # 已加入的不同ID数（近似）
+        self.synced_id = 0  # 已同步到的数据表自增主键
+        self.complete = True  # 从数据库同步中断时为False，本次运行中所有ID都查询数据库确认
+        self.db_manager = None
+        self.path: Optional[str] = None
+        # 最近加入、可能尚未写入数据库的ID；有界，被淘汰的ID已写入时由布隆过滤器+数据库确认，
+        # 未写入（如写入队列积压超过容量）时按新数据处理，重复写入由 INSERT IGNORE 忽略
+        self._recent_ids = BoundedIdSet(DEDUPE_CONFIG['pending_capacity'])
+        self._lock = threading.Lock()
+        self.stats = {'negatives': 0, 'confirmed': 0, 'false_positives': 0}
+
+    @classmethod
+    def open(cls, platform: str, db_manager, config: dict = None) -> 'DedupeIndex':
+        """加载平台的持久化索引并同步数据库中新增的行；文件不存在或超出容量时从数据库重建"""
+        config = config or DEDUPE_CONFIG
+        path = os.path.join(config['directory'], f"{platform}.bloom")
+        index = cls.load(path)
+        if index is None:
+            index = cls(platform, config['capacity'], config['error_rate'])
+            logger.info(f"[去重索引] 未找到 {path}，从数据库构建")
+
+        index.db_manager = db_manager
+        added = index.sync(config['sync_batch_size'])
+
+        if index.count > index.capacity:
+            # 超出容量后误判率上升，按两倍容量重建
+            logger.warning(f"[去重索引] {platform} 已有 {index.count} 条，超出容量 {index.capacity}，重建索引")
+            index = cls(platform, index.capacity * 2, index.error_rate)
+            index.db_manager = db_manager
+            added = index.sync(config['sync_batch_size'])
+
+        index.path = path
+        if added:
+            index.save()
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> Optional['DedupeIndex']:
+        """读取持久化的索引文件，不存在或损坏时返回None"""
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                header = json_codec.loads(f.readline())
+                bits = bytearray(f.read())
+
+            index = cls(header['platform'], header['capacity'], header['error_rate'])
+            if len(bits) != len(index.bits) or header['num_hashes'] != index.num_hashes:
+                raise ValueError("位数组大小与参数不一致")
+            index.bits = bits
+            index.count = header['count']
+            index.synced_id = header['synced_id']
+            return index
+        except Exception as e:
+            logger.error(f"[去重索引] 读取 {path} 失败，将重建: {e}")
+            return None
+
+    def save(self):
+        """原子写入索引文件"""
+        path = self.path
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self._lock:
+                header = {
+                    'platform': self.platform,
+                    'capacity': self.capacity,
+                    'error_rate': self.error_rate,
+                    'num_hashes': self.num_hashes,
+                    'count': self.count,
+                    'synced_id': self.synced_id
+                }
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(json_codec.dumps_bytes(header) + b'\n')
+                    f.write(self.bits)
+            os.replace(temp_path, path)
+            logger.info(f"[去重索引] 已保存 {path}（{self.count} 条）")
+        except Exception as e:
+            logger.error(f"[去重索引] 保存 {path} 失败: {e}")
+
+    def sync(self, batch_size: int) -> int:
+        """将数据表中自增主键大于 synced_id 的行加入索引，返回同步的行数
+
+        同步中途出错时保留已同步的部分（synced_id 准确，下次启动从此处继续），
+        并将索引标记为不完整：布隆过滤器判定不存在的ID也查询数据库确认，避免把未同步的行当作新数据
+        """
+        added = 0
+        try:
+            for row_id, content_id in self.db_manager.iter_ids(self.platform, self.synced_id, batch_size):
+                with self._lock:
+                    self._add_bits(content_id)
+                    self.synced_id = row_id
+                added += 1
+        except Exception as e:
+            self.complete = False
+            logger.error(f"[去重索引] {self.platform} 从数据库同步中断（已同步 {added} 条）: {e}，"
+                         f"本次运行中所有ID改为查询数据库确认")
+
+        if added:
+            logger.info(f"[去重索引] {self.platform} 从数据库同步 {added} 条，共 {self.count} 条")
+        return added
+
+    def _positions(self, content_id: str):
+        digest = hashlib.blake2b(content_id.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _add_bits(self, content_id: str):
+        """设置ID对应的位（调用方持有锁），所有位原本都已设置时不计数"""
+        is_new = False
+        for position in self._positions(content_id):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                is_new = True
+        if is_new:
+            self.count += 1
+
+    def _might_contain(self, content_id: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(content_id))
+
+    def add(self, content_id: str):
+        with self._lock:
+            self._add_bits(content_id)
+            self._recent_ids.add(content_id)
+
+    def add_new(self, content_ids: Iterable[str]) -> List[str]:
+        """加入一批ID，返回其中此前未加入过的ID（按输入顺序）
+
+        多个线程并发加入同一ID时只有一个调用方得到它，可与 contains_many 配合在锁外完成去重
+        """
+        added = []
+        with self._lock:
+            for content_id in content_ids:
+                if content_id not in self._recent_ids:
+                    self._add_bits(content_id)
+                    self._recent_ids.add(content_id)
+                    added.append(content_id)
+        return added
+
+    def contains_many(self, content_ids: Iterable[str]) -> Set[str]:
+        """批量判断，返回其中已存在的ID；布隆过滤器命中的ID用一次数据库查询确认"""
+        candidates = []
+        found = set()
+        with self._lock:
+            for content_id in content_ids:
+                if content_id in self._recent_ids:
+                    found.add(content_id)
+                elif not self.complete or self._might_contain(content_id):
+                    candidates.append(content_id)
+                else:
+                    self.stats['negatives'] += 1
+
+        if candidates:
+            confirmed = self.db_manager.filter_existing_ids(self.platform, candidates)
+            with self._lock:
+                self.stats['confirmed'] += len(confirmed)
+                self.stats['false_positives'] += len(candidates) - len(confirmed)
+            found |= confirmed
+        return found
+
+    def __contains__(self, content_id: str) -> bool:
+        return bool(self.contains_many([content_id]))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            return dict(self.stats, count=self.count, capacity=self.capacity,
+                        size_bytes=len(self.bits), synced_id=self.synced_id, complete=self.complete)
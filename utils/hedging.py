@@ -0,0 +1,194 @@
+"""
+对冲请求模块
+主接口在给定时间内（历史延迟分位数）未返回时，并行发出备用接口请求，
+采用先返回有效结果的一方，放弃另一方
+"""
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Callable, Awaitable, Tuple, Optional
+
+from config.settings import HEDGE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'primary'
+SECONDARY = 'secondary'
+
+class LatencyTracker:
+    """记录最近若干次请求耗时，计算分位数"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+class HedgedRequester:
+    """对冲请求执行器
+
+    primary / secondary 为无副作用的“请求+解析”函数，返回解析后的数据列表，
+    非空列表视为有效结果。调用方只对胜出一方的结果做去重登记与落盘。
+    两方都请求失败时抛出最后一个异常，交由重试策略处理。
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or HEDGE_CONFIG
+        self.latency = LatencyTracker(self.config['window'])
+        self.stats = {'calls': 0, 'hedged': 0, 'primary_wins': 0, 'secondary_wins': 0}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.get('enabled', False)
+
+    def get_hedge_delay(self) -> float:
+        """发出备用请求前等待主请求的时间"""
+        if self.config['mode'] == 'parallel':
+            return 0.0
+        if len(self.latency) < self.config['min_samples']:
+            return self.config['default_delay']
+        return self.latency.percentile(self.config['percentile'])
+
+    def run(self, primary: Callable[[], List[Dict[str, Any]]],
+            secondary: Callable[[], List[Dict[str, Any]]]) -> Tuple[str, List[Dict[str, Any]]]:
+        """同步执行对冲请求，返回 (胜出方, 结果)"""
+        self.stats['calls'] += 1
+        executor = self._get_executor()
+
+        start_time = time.monotonic()
+        primary_future = executor.submit(primary)
+        primary_future.add_done_callback(lambda f: self.latency.record(time.monotonic() - start_time))
+
+        try:
+            results = primary_future.result(timeout=self.get_hedge_delay())
+        except FutureTimeoutError:
+            pass
+        except Exception as e:
+            logger.warning(f"[对冲请求] 主请求失败: {e}")
+            return self._finish(SECONDARY, secondary())
+        else:
+            # 主请求在对冲时间内完成：有结果直接采用，否则按原顺序回退备用接口
+            if results:
+                return self._finish(PRIMARY, results)
+            try:
+                return self._finish(SECONDARY, secondary())
+            except Exception as e:
+                # 主接口已正常响应（无数据），备用接口失败不视为本页失败
+                logger.warning(f"[对冲请求] 备用请求失败: {e}")
+                return self._finish(SECONDARY, [])
+
+        self.stats['hedged'] += 1
+        logger.info(f"[对冲请求] 主请求超过 {self.get_hedge_delay():.2f} 秒未返回，发出备用请求")
+        pending = {primary_future: PRIMARY, executor.submit(secondary): SECONDARY}
+        last_error = None
+        responded = False
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                label = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.warning(f"[对冲请求] {label} 请求失败: {e}")
+                    last_error = e
+                    continue
+                responded = True
+                if results:
+                    # 放弃仍在进行的另一方（尚未开始的直接取消，已开始的结果将被丢弃）
+                    for other in pending:
+                        other.cancel()
+                    return self._finish(label, results)
+
+        if not responded and last_error is not None:
+            raise last_error
+        return self._finish(SECONDARY, [])
+
+    async def run_async(self, primary: Callable[[], Awaitable[List[Dict[str, Any]]]],
+                        secondary: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> Tuple[str, List[Dict[str, Any]]]:
+        """异步执行对冲请求，落败一方的协程会被取消"""
+        self.stats['calls'] += 1
+
+        start_time = time.monotonic()
+        primary_task = asyncio.ensure_future(primary())
+        primary_task.add_done_callback(
+            lambda t: None if t.cancelled() else self.latency.record(time.monotonic() - start_time)
+        )
+
+        done, _ = await asyncio.wait({primary_task}, timeout=self.get_hedge_delay())
+        if done:
+            if primary_task.exception() is not None:
+                logger.warning(f"[对冲请求] 主请求失败: {primary_task.exception()}")
+                return self._finish(SECONDARY, await secondary())
+            if primary_task.result():
+                return self._finish(PRIMARY, primary_task.result())
+            try:
+                return self._finish(SECONDARY, await secondary())
+            except Exception as e:
+                logger.warning(f"[对冲请求] 备用请求失败: {e}")
+                return self._finish(SECONDARY, [])
+
+        self.stats['hedged'] += 1
+        logger.info(f"[对冲请求] 主请求超过 {self.get_hedge_delay():.2f} 秒未返回，发出备用请求")
+        pending = {primary_task: PRIMARY, asyncio.ensure_future(secondary()): SECONDARY}
+        last_error = None
+        responded = False
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    label = pending.pop(task)
+                    if task.exception() is not None:
+                        logger.warning(f"[对冲请求] {label} 请求失败: {task.exception()}")
+                        last_error = task.exception()
+                        continue
+                    responded = True
+                    if task.result():
+                        return self._finish(label, task.result())
+            if not responded and last_error is not None:
+                raise last_error
+            return self._finish(SECONDARY, [])
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _finish(self, label: str, results: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+        if results:
+            self.stats[f"{label}_wins"] += 1
+        return label, results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='hedge')
+            return self._executor
+
+    def get_statistics(self) -> Dict[str, Any]:
+        p = self.latency.percentile(self.config['percentile'])
+        return dict(self.stats, hedge_delay=round(self.get_hedge_delay(), 3),
+                    primary_latency_percentile=round(p, 3) if p is not None else None)
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -6,6 +6,7 @@ import re
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
+from urllib.parse import urlsplit
 from config.settings import USER_AGENTS
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,30 @@ def get_random_user_agent() -> str:
     """获取随机User-Agent"""
     return random.choice(USER_AGENTS)
 
+def is_login_redirect(url: str) -> bool:
+    """判断最终请求地址是否为登录页（只看域名与路径，查询参数中的搜索词不计入）"""
+    parts = urlsplit(url or '')
+    location = f"{parts.netloc}{parts.path}".lower()
+    return 'login' in location or 'signin' in location
+
+def detect_block_signal(response) -> Optional[str]:
+    """识别响应中的异常/反爬信号
+
+    返回 None 表示响应正常，否则返回信号名称：
+    status_<状态码>、login（跳转登录页）、captcha（验证码/反爬提示）
+    登录跳转只按响应地址判断：正常的搜索页导航栏、接口数据中也会出现“登录”字样
+    """
+    if response.status_code != 200:
+        return f"status_{response.status_code}"
+    
+    if is_login_redirect(response.url):
+        return 'login'
+    
+    if '验证码' in response.text or 'captcha' in response.text.lower():
+        return 'captcha'
+    
+    return None
+
 def parse_weibo_time(time_str: str) -> Optional[datetime]:
     """解析微博时间字符串"""
     if not time_str:
@@ -0,0 +1,74 @@
+"""
+增量爬取模块
+按发布时间倒序搜索时，结果一旦越过上次记录的水位线（已爬取的最新内容时间），
+后续页面都是已爬取过的数据，可以停止翻页
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from config.settings import INCREMENTAL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class IncrementalTracker:
+    """单个关键词的增量爬取状态"""
+
+    def __init__(self, watermark: Optional[datetime] = None, known_pages_to_stop: int = None):
+        self.watermark = watermark
+        self.known_pages_to_stop = known_pages_to_stop or INCREMENTAL_CONFIG['known_pages_to_stop']
+        self.newest_created_at: Optional[datetime] = None
+        self.newest_id: Optional[str] = None
+        self.known_pages = 0
+        self.stop_reason: Optional[str] = None
+
+    def observe_page(self, content_list: List[Dict[str, Any]], new_count: int) -> bool:
+        """记录一页结果，返回是否应停止翻页
+
+        Args:
+            content_list: 本页全部结果（含已存在的数据）
+            new_count: 本页新数据条数
+        """
+        created_times = [item['created_at'] for item in content_list if isinstance(item.get('created_at'), datetime)]
+
+        for item in content_list:
+            created_at = item.get('created_at')
+            if isinstance(created_at, datetime) and (self.newest_created_at is None or created_at > self.newest_created_at):
+                self.newest_created_at = created_at
+                self.newest_id = item['_id']
+
+        self.known_pages = self.known_pages + 1 if new_count == 0 else 0
+
+        # 结果按时间倒序，本页最旧的内容已不晚于水位线，说明已衔接上次爬取的范围
+        if self.watermark and created_times and min(created_times) <= self.watermark:
+            self.stop_reason = f"结果已越过水位线 {self.watermark}"
+        elif self.known_pages >= self.known_pages_to_stop:
+            self.stop_reason = f"连续 {self.known_pages} 页均为已知数据"
+
+        return self.stop_reason is not None
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出状态（写入断点）"""
+        return {
+            'watermark': self.watermark.isoformat() if self.watermark else None,
+            'newest_created_at': self.newest_created_at.isoformat() if self.newest_created_at else None,
+            'newest_id': self.newest_id,
+            'known_pages': self.known_pages
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """从断点恢复状态，水位线以断点记录的为准（本次运行尚未推进过）"""
+        if state.get('watermark'):
+            self.watermark = datetime.fromisoformat(state['watermark'])
+        if state.get('newest_created_at'):
+            self.newest_created_at = datetime.fromisoformat(state['newest_created_at'])
+        self.newest_id = state.get('newest_id')
+        self.known_pages = state.get('known_pages', 0)
+
+    def should_advance_watermark(self) -> bool:
+        """是否可以推进水位线：首次爬取，或本次已衔接上次爬取的范围（中途停止时推进会留下空档）"""
+        if self.newest_created_at is None:
+            return False
+        if self.watermark is not None and self.newest_created_at <= self.watermark:
+            return False
+        return self.watermark is None or self.stop_reason is not None
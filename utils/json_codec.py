@@ -0,0 +1,84 @@
+"""
+JSON编解码模块
+已安装 orjson 时用 orjson 解析与序列化（C实现，比标准库快数倍），否则退回标准库 json；
+两种后端的输出一致：不转义非ASCII字符，Decimal 转为 float，datetime 转为 ISO 格式字符串
+"""
+import json
+import logging
+from decimal import Decimal
+from datetime import datetime
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND = 'orjson' if orjson else 'json'
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方统一捕获此异常即可
+JSONDecodeError = json.JSONDecodeError
+
+class DecimalEncoder(json.JSONEncoder):
+    """自定义JSON编码器，处理Decimal和datetime类型"""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            # 将Decimal转换为float，保持数值精度
+            return float(obj)
+        elif isinstance(obj, datetime):
+            # 将datetime转换为ISO格式字符串
+            return obj.isoformat()
+        return super(DecimalEncoder, self).default(obj)
+
+def _orjson_default(obj):
+    """orjson 不支持的类型（datetime 由 orjson 直接输出为与 isoformat 相同的格式）"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _stdlib_dumps(obj: Any, indent: bool) -> str:
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), cls=DecimalEncoder)
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """序列化为UTF-8字节串，indent 为True时按2个空格缩进"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=option)
+        except TypeError:
+            # 超出64位的整数、非字符串键的特殊对象等 orjson 不支持的数据，交给标准库处理
+            pass
+    return _stdlib_dumps(obj, indent).encode('utf-8')
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为字符串（用于写入数据库字段等）"""
+    if orjson:
+        return dumps_bytes(obj, indent).decode('utf-8')
+    return _stdlib_dumps(obj, indent)
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """解析JSON文本或UTF-8字节串，格式错误时抛出 JSONDecodeError"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def loads_response(response) -> Any:
+    """解析HTTP响应体：requests 响应直接解析原始字节，省去文本解码与编码探测；
+    没有 content 属性的响应（如 AsyncResponse）解析 text"""
+    content = getattr(response, 'content', None)
+    return loads(content if content is not None else response.text)
+
+def dump_file(obj: Any, file_path, indent: bool = False):
+    """序列化后以二进制写入文件"""
+    with open(file_path, 'wb') as f:
+        f.write(dumps_bytes(obj, indent))
+
+def load_file(file_path) -> Any:
+    """读取并解析JSON文件"""
+    with open(file_path, 'rb') as f:
+        return loads(f.read())
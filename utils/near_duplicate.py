@@ -0,0 +1,119 @@
+"""
+近似重复内容检测模块
+对清洗后的正文计算 64 位 SimHash，用分段 LSH 索引查找汉明距离不超过阈值的已有内容，
+为每条数据标记内容簇ID（簇内第一条内容的 _id），可选择在入库前丢弃近似重复的内容
+"""
+import re
+import hashlib
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Any, Optional
+
+from config.settings import NEAR_DUPLICATE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+
+# 清洗时去掉的部分：链接、@用户、表情代码（如 [哈哈]）、标点空白等非文字字符
+NOISE_PATTERN = re.compile(r'https?://\S+|@[\w\-]+|\[[^\[\]]{1,8}\]|[^\w]|_')
+
+def normalize_text(content: str) -> str:
+    """去掉链接、@用户、表情与标点，只保留用于比较的文字"""
+    return NOISE_PATTERN.sub('', content or '').lower()
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    """按字符 n-gram 计算 64 位 SimHash（相同 n-gram 按出现次数加权）"""
+    shingles = Counter(text[i:i + shingle_size] for i in range(max(1, len(text) - shingle_size + 1)))
+    weights = [0] * HASH_BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(HASH_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+class NearDuplicateDetector:
+    """SimHash + LSH 近似重复检测器，线程安全
+
+    64 位指纹分为 bands 段，只比较至少有一段完全相同的候选：汉明距离小于 bands 时必定能找到，
+    距离更大时以较高概率找到；索引最多保留 max_entries 个指纹，超出时淘汰最早加入的。
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or NEAR_DUPLICATE_CONFIG
+        self.max_distance = self.config['max_distance']
+        self.bands = self.config['bands']
+        self.band_bits = HASH_BITS // self.bands
+        self._buckets: Dict[tuple, list] = defaultdict(list)
+        self._entries = deque()  # (指纹, 簇ID)，按加入顺序
+        self._lock = threading.Lock()
+        self.stats = {'checked': 0, 'near_duplicates': 0, 'dropped': 0, 'clusters': 0}
+
+    def _band_keys(self, fingerprint: int) -> List[tuple]:
+        mask = (1 << self.band_bits) - 1
+        return [(band, fingerprint >> (band * self.band_bits) & mask) for band in range(self.bands)]
+
+    def _find_cluster(self, fingerprint: int, band_keys: List[tuple]) -> Optional[str]:
+        for key in band_keys:
+            for candidate, cluster_id in self._buckets.get(key, ()):
+                if bin(candidate ^ fingerprint).count('1') <= self.max_distance:
+                    return cluster_id
+        return None
+
+    def _add(self, entry: tuple, band_keys: List[tuple]):
+        self._entries.append(entry)
+        for key in band_keys:
+            self._buckets[key].append(entry)
+
+        if len(self._entries) > self.config['max_entries']:
+            oldest = self._entries.popleft()
+            for key in self._band_keys(oldest[0]):
+                bucket = self._buckets[key]
+                bucket.remove(oldest)
+                if not bucket:
+                    del self._buckets[key]
+
+    def assign_cluster(self, content_id: str, content: str) -> str:
+        """返回内容所属的簇ID；没有近似内容（或正文过短）时以自身 _id 为新簇"""
+        text = normalize_text(content)
+        if len(text) < self.config['min_length']:
+            return content_id
+
+        fingerprint = simhash(text, self.config['shingle_size'])
+        band_keys = self._band_keys(fingerprint)
+        with self._lock:
+            self.stats['checked'] += 1
+            cluster_id = self._find_cluster(fingerprint, band_keys)
+            if cluster_id is None:
+                cluster_id = content_id
+                self.stats['clusters'] += 1
+            else:
+                self.stats['near_duplicates'] += 1
+            # 重复内容也加入索引，后续的变体可以通过任一成员匹配到簇
+            self._add((fingerprint, cluster_id), band_keys)
+        return cluster_id
+
+    def process(self, data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """为每条数据设置 content_cluster_id；drop_duplicates 开启时丢弃非簇首的近似重复内容"""
+        result = []
+        for data in data_list:
+            data['content_cluster_id'] = self.assign_cluster(data['_id'], data.get('content'))
+            if self.config['drop_duplicates'] and data['content_cluster_id'] != data['_id']:
+                with self._lock:
+                    self.stats['dropped'] += 1
+                continue
+            result.append(data)
+
+        if len(result) < len(data_list):
+            logger.info(f"[近似去重] 丢弃近似重复内容 {len(data_list) - len(result)} 条")
+        return result
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, indexed=len(self._entries))
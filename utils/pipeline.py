@@ -0,0 +1,181 @@
+"""
+流水线模块
+将爬取拆分为若干阶段（抓取、去重、入库、写文件），阶段之间以有界队列连接：
+下游处理不过来时队列写满，上游阻塞等待（背压），各阶段可独立设置工作线程数，
+并统计每个阶段的吞吐量、队列深度与忙碌程度，用于定位瓶颈阶段
+"""
+import time
+import queue
+import logging
+import threading
+from typing import Dict, List, Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # 结束标记，每个工作线程收到一个后退出
+
+class Stage:
+    """流水线中的一个阶段
+
+    handler 接收一个输入（batch_size > 1 时为输入列表），返回输出的可迭代对象（或None），
+    每个输出依次放入下一阶段的队列。
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Optional[Iterable[Any]]], workers: int = 1,
+                 queue_size: int = 100, batch_size: int = 1, flush_interval: float = 2.0):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.next_stage: Optional['Stage'] = None
+        self.threads: List[threading.Thread] = []
+
+        self.stats = {'received': 0, 'emitted': 0, 'errors': 0, 'busy_seconds': 0.0, 'blocked_seconds': 0.0}
+        self._lock = threading.Lock()
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"pipeline-{self.name}-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+
+            if self.batch_size > 1:
+                item, stopped = self._collect_batch(item)
+                self._process(item, len(item))
+                if stopped:
+                    return
+            else:
+                self._process(item, 1)
+
+    def _collect_batch(self, first_item: Any):
+        """凑满一批或等待超过 flush_interval 后返回，返回 (批次, 是否已收到结束标记)"""
+        batch = [first_item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _process(self, item: Any, count: int):
+        start_time = time.monotonic()
+        try:
+            outputs = self.handler(item)
+        except Exception as e:
+            logger.error(f"[流水线] {self.name} 阶段处理失败: {e}")
+            outputs = None
+            with self._lock:
+                self.stats['errors'] += 1
+
+        with self._lock:
+            self.stats['received'] += count
+            self.stats['busy_seconds'] += time.monotonic() - start_time
+
+        if outputs is None or self.next_stage is None:
+            return
+
+        for output in outputs:
+            # 下游队列已满时阻塞，记录被背压阻塞的时长
+            put_start = time.monotonic()
+            self.next_stage.queue.put(output)
+            with self._lock:
+                self.stats['emitted'] += 1
+                self.stats['blocked_seconds'] += time.monotonic() - put_start
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+    def get_statistics(self, elapsed: float) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        elapsed = max(elapsed, 1e-6)
+        return {
+            'workers': self.workers,
+            'queue_depth': self.queue.qsize(),
+            'queue_size': self.queue.maxsize,
+            'received': stats['received'],
+            'emitted': stats['emitted'],
+            'errors': stats['errors'],
+            'throughput': round(stats['received'] / elapsed, 2),  # 每秒处理的输入数
+            'utilization': round(stats['busy_seconds'] / (elapsed * self.workers), 3),  # 工作线程忙碌占比
+            'blocked_seconds': round(stats['blocked_seconds'], 2)  # 因下游队列已满而等待的总时长
+        }
+
+class Pipeline:
+    """由多个阶段顺序连接的流水线"""
+
+    def __init__(self, name: str = 'pipeline', report_interval: float = 0, log: logging.Logger = None):
+        self.name = name
+        self.logger = log or logger
+        self.report_interval = report_interval
+        self.stages: List[Stage] = []
+        self.start_time = None
+        self._stopped = threading.Event()
+        self._reporter: Optional[threading.Thread] = None
+
+    def add_stage(self, name: str, handler: Callable[[Any], Optional[Iterable[Any]]], **options) -> Stage:
+        """追加一个阶段，options 同 Stage 的构造参数"""
+        stage = Stage(name, handler, **options)
+        if self.stages:
+            self.stages[-1].next_stage = stage
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        self.start_time = time.monotonic()
+        for stage in self.stages:
+            stage.start()
+
+        if self.report_interval:
+            self._reporter = threading.Thread(target=self._report_loop, name=f"pipeline-{self.name}-report", daemon=True)
+            self._reporter.start()
+
+    def put(self, item: Any):
+        """向第一个阶段提交输入，队列已满时阻塞"""
+        self.stages[0].queue.put(item)
+
+    def join(self):
+        """输入提交完毕后调用：逐个阶段发送结束标记，等待所有数据处理完成"""
+        for stage in self.stages:
+            for _ in range(stage.workers):
+                stage.queue.put(_STOP)
+            stage.join()
+
+        self._stopped.set()
+        if self._reporter:
+            self._reporter.join()
+
+    def _report_loop(self):
+        while not self._stopped.wait(self.report_interval):
+            self.log_statistics()
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """各阶段的吞吐量、队列深度与忙碌程度"""
+        elapsed = time.monotonic() - self.start_time if self.start_time else 0.0
+        return {stage.name: stage.get_statistics(elapsed) for stage in self.stages}
+
+    def get_bottleneck(self) -> Optional[str]:
+        """忙碌占比最高的阶段，即最值得增加工作线程的阶段"""
+        stats = self.get_statistics()
+        if not stats:
+            return None
+        return max(stats, key=lambda name: stats[name]['utilization'])
+
+    def log_statistics(self):
+        for name, stats in self.get_statistics().items():
+            self.logger.info(f"[流水线] {self.name}/{name}: 队列 {stats['queue_depth']}/{stats['queue_size']}，"
+                             f"已处理 {stats['received']}，{stats['throughput']} 个/秒，"
+                             f"忙碌 {stats['utilization']:.0%}（{stats['workers']} 线程），背压等待 {stats['blocked_seconds']} 秒")
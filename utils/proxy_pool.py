@@ -0,0 +1,175 @@
+"""
+代理池模块
+跟踪每个代理的延迟、成功率与封禁信号，在健康代理间轮换请求，
+对异常代理按指数退避隔离，并为每个代理维护独立的keep-alive会话
+"""
+import time
+import random
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import PROXY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class ProxyState:
+    """单个代理的健康状态"""
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.latency = None  # 延迟的指数移动平均（秒）
+        self.success_count = 0
+        self.failure_count = 0
+        self.ban_count = 0
+        self.consecutive_failures = 0
+        self.quarantine_level = 0  # 连续被隔离的次数，决定下次隔离时长
+        self.quarantined_until = 0.0
+        self.in_flight = 0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.quarantined_until
+
+    def score(self) -> float:
+        """健康评分：平滑后的成功率 / 平均延迟，同时对在途请求多的代理降权"""
+        success_rate = (self.success_count + 1) / (self.success_count + self.failure_count + 2)
+        latency = self.latency if self.latency else 1.0
+        return success_rate / max(latency, 0.05) / (1 + self.in_flight)
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        total = self.success_count + self.failure_count
+        return {
+            'status': 'healthy' if self.is_available(now) else 'quarantined',
+            'latency_ms': round(self.latency * 1000) if self.latency else None,
+            'success_rate': round(self.success_count / total, 3) if total else None,
+            'success_count': self.success_count,
+            'failure_count': self.failure_count,
+            'ban_count': self.ban_count,
+            'in_flight': self.in_flight,
+            'quarantine_remaining': max(0, round(self.quarantined_until - now, 1))
+        }
+
+class ProxyPool:
+    """代理池"""
+
+    def __init__(self, proxies: List[str], config: Dict[str, Any] = None):
+        self.config = config or PROXY_CONFIG
+        self._states: Dict[str, ProxyState] = {proxy: ProxyState(proxy) for proxy in proxies}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        logger.info(f"[代理池] 已加载 {len(self._states)} 个代理")
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def acquire(self) -> Optional[str]:
+        """按健康评分加权随机选择一个可用代理，并记为在途"""
+        with self._lock:
+            if not self._states:
+                return None
+
+            now = time.monotonic()
+            candidates = [state for state in self._states.values() if state.is_available(now)]
+
+            if candidates:
+                state = random.choices(candidates, weights=[s.score() for s in candidates])[0]
+            else:
+                # 全部处于隔离期时，选择最早解除隔离的代理
+                state = min(self._states.values(), key=lambda s: s.quarantined_until)
+                logger.warning(f"[代理池] 所有代理均处于隔离期，临时使用 {state.proxy}")
+
+            state.in_flight += 1
+            return state.proxy
+
+    def report(self, proxy: str, latency: Optional[float], signal: Optional[str] = None, error: bool = False):
+        """上报请求结果
+
+        Args:
+            latency: 请求耗时（秒），请求异常时可为None
+            signal: detect_block_signal 返回的响应信号
+            error: 请求是否因网络异常失败
+        """
+        with self._lock:
+            state = self._states.get(proxy)
+            if state is None:
+                return
+
+            state.in_flight = max(0, state.in_flight - 1)
+
+            if latency is not None:
+                alpha = self.config['latency_alpha']
+                state.latency = latency if state.latency is None else alpha * latency + (1 - alpha) * state.latency
+
+            banned = signal in self.config['ban_signals']
+            if not error and not banned:
+                state.success_count += 1
+                state.consecutive_failures = 0
+                state.quarantine_level = 0
+                return
+
+            state.failure_count += 1
+            state.consecutive_failures += 1
+            if banned:
+                state.ban_count += 1
+
+            if banned or state.consecutive_failures >= self.config['max_consecutive_failures']:
+                self._quarantine(state, signal or 'network_error')
+
+    def release(self, proxy: str):
+        """释放在途计数而不记录结果（如请求被取消）"""
+        with self._lock:
+            state = self._states.get(proxy)
+            if state is not None:
+                state.in_flight = max(0, state.in_flight - 1)
+
+    def _quarantine(self, state: ProxyState, reason: str):
+        """隔离代理，隔离时长随连续隔离次数指数增长"""
+        cooldown = min(self.config['max_cooldown'], self.config['base_cooldown'] * (2 ** state.quarantine_level))
+        state.quarantine_level += 1
+        state.consecutive_failures = 0
+        state.quarantined_until = time.monotonic() + cooldown
+        logger.warning(f"[代理池] 代理 {state.proxy} 因 {reason} 被隔离 {cooldown} 秒")
+
+    def get_session(self, proxy: str) -> requests.Session:
+        """获取代理对应的keep-alive会话（按代理复用连接）"""
+        with self._lock:
+            session = self._sessions.get(proxy)
+            if session is None:
+                session = requests.Session()
+                session.proxies = {'http': proxy, 'https': proxy}
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.config['pool_maxsize'])
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[proxy] = session
+            return session
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """获取各代理健康状态"""
+        with self._lock:
+            now = time.monotonic()
+            return {proxy: state.to_dict(now) for proxy, state in self._states.items()}
+
+    def close(self):
+        """关闭所有代理会话"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+_shared_proxy_pool: Optional[ProxyPool] = None
+_shared_lock = threading.Lock()
+
+def get_proxy_pool() -> Optional[ProxyPool]:
+    """获取进程内共享的代理池，未启用代理或代理列表为空时返回None"""
+    global _shared_proxy_pool
+
+    if not PROXY_CONFIG['enabled'] or not PROXY_CONFIG['proxies']:
+        return None
+
+    with _shared_lock:
+        if _shared_proxy_pool is None:
+            _shared_proxy_pool = ProxyPool(PROXY_CONFIG['proxies'])
+        return _shared_proxy_pool
@@ -0,0 +1,135 @@
+"""
+请求限速模块
+按目标主机维护令牌桶，所有爬虫的出站请求共享同一个限速器
+"""
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from config.settings import RATE_LIMIT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """令牌桶
+
+    以 rate（每秒令牌数）匀速补充，最多积累 burst 个令牌。
+    令牌不足时采用预约方式：先扣减令牌（可为负数），再按欠额计算等待时间，
+    因此多线程、多协程同时取令牌时会自动按先后顺序排队，不会扎堆发出请求。
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """按流逝时间补充令牌"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """预约一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        """阻塞直到获得令牌，返回实际等待秒数"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """异步等待直到获得令牌，返回实际等待秒数"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def set_rate(self, rate: float):
+        """调整令牌补充速率（已积累的令牌保留）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def get_state(self) -> Dict[str, Any]:
+        """获取令牌桶状态"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'burst': self.capacity,
+                'tokens': round(self.tokens, 2)
+            }
+
+class HostRateLimiter:
+    """按主机划分的限速器"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or RATE_LIMIT_CONFIG
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.get('enabled', False)
+
+    def get_bucket(self, host: str) -> TokenBucket:
+        """获取（必要时创建）主机对应的令牌桶"""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                host_config = self.config.get('hosts', {}).get(host, self.config['default'])
+                bucket = TokenBucket(host_config['rate'], host_config.get('burst', 1))
+                self._buckets[host] = bucket
+                logger.debug(f"[限速] 创建令牌桶 {host}: {host_config}")
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """在向url发送请求前调用，阻塞直到该主机允许发出请求"""
+        if not self.enabled:
+            return 0.0
+
+        wait = self.get_bucket(self._get_host(url)).acquire()
+        if wait > 0:
+            logger.debug(f"[限速] {self._get_host(url)} 等待 {wait:.2f} 秒")
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """acquire 的异步版本"""
+        if not self.enabled:
+            return 0.0
+
+        return await self.get_bucket(self._get_host(url)).acquire_async()
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """获取各主机令牌桶状态"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.get_state() for host, bucket in buckets.items()}
+
+    @staticmethod
+    def _get_host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+_shared_rate_limiter: Optional[HostRateLimiter] = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter() -> HostRateLimiter:
+    """获取进程内共享的限速器，保证同一主机的所有请求使用同一个令牌桶"""
+    global _shared_rate_limiter
+
+    with _shared_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = HostRateLimiter()
+        return _shared_rate_limiter
@@ -0,0 +1,171 @@
+"""
+重试策略模块
+指数退避 + 去相关抖动，遵循服务端 Retry-After，区分可重试的网络/限流错误与不可重试的解析错误，
+并限制每次运行的重试总次数
+"""
+import time
+import random
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Callable, Awaitable, Optional, Tuple, Type
+
+from config.settings import CRAWLER_CONFIG, RETRY_CONFIG
+from utils.helpers import detect_block_signal
+from utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+class RetryableError(Exception):
+    """可重试的错误（服务端异常、限流等），retry_after 为服务端建议的等待秒数"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class BlockedError(RetryableError):
+    """响应带有封禁/限流信号（429、403、登录跳转、验证码）"""
+
+    def __init__(self, signal: str, retry_after: Optional[float] = None):
+        super().__init__(f"请求被限制: {signal}", retry_after)
+        self.signal = signal
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头（秒数或HTTP日期），无法解析时返回None"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_time = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_time.tzinfo is None:
+        retry_time = retry_time.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_time - datetime.now(timezone.utc)).total_seconds())
+
+def raise_for_signal(response, config: Dict[str, Any] = None):
+    """响应带有封禁信号或可重试状态码时抛出对应异常，其他情况不做处理"""
+    config = config or RETRY_CONFIG
+    signal = detect_block_signal(response)
+    if signal is None:
+        return
+
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    if signal in config['blocked_signals']:
+        raise BlockedError(signal, retry_after)
+    if response.status_code in config['retry_statuses']:
+        raise RetryableError(f"服务端返回状态码 {response.status_code}", retry_after)
+
+class RetryPolicy:
+    """重试策略
+
+    requests 的网络异常均继承自 OSError，默认视为可重试；
+    解析类异常（ValueError/KeyError 等，含 JSONDecodeError）视为不可重试。
+    """
+
+    NON_RETRYABLE_EXCEPTIONS = (ValueError, KeyError, TypeError, AttributeError)
+
+    def __init__(self, config: Dict[str, Any] = None, retryable_exceptions: Tuple[Type[BaseException], ...] = ()):
+        self.config = config or RETRY_CONFIG
+        self.retryable_exceptions = (RetryableError, OSError) + tuple(retryable_exceptions)
+        self.budget_remaining = self.config['retry_budget']
+        self.stats = {'retries': 0, 'non_retryable': 0, 'exhausted': 0, 'budget_denied': 0}
+        self._lock = threading.Lock()
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """判断异常是否值得重试"""
+        if isinstance(error, RetryableError):
+            return True
+        if isinstance(error, self.NON_RETRYABLE_EXCEPTIONS):
+            return False
+        return isinstance(error, self.retryable_exceptions)
+
+    def next_delay(self, previous_delay: float, error: BaseException = None) -> float:
+        """去相关抖动：在 [base_delay, 上次等待*3] 内随机取值，不超过 max_delay；
+        服务端给出 Retry-After 时至少等待该时长"""
+        base_delay = self.config['base_delay']
+        delay = min(self.config['max_delay'], random.uniform(base_delay, max(base_delay, previous_delay * 3)))
+
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.config['max_retry_after']))
+        return delay
+
+    def _consume_budget(self) -> bool:
+        with self._lock:
+            if self.budget_remaining is None:
+                return True
+            if self.budget_remaining <= 0:
+                return False
+            self.budget_remaining -= 1
+            return True
+
+    def _plan_retry(self, error: BaseException, attempt: int, max_attempts: int,
+                    previous_delay: float, description: str) -> Optional[float]:
+        """决定是否重试，返回等待秒数；返回None表示放弃"""
+        if isinstance(error, CircuitOpenError):
+            # 熔断期间重试没有意义，交由调用方等待冷却
+            return None
+
+        if not self.is_retryable(error):
+            self.stats['non_retryable'] += 1
+            logger.warning(f"{description}失败（不可重试）: {error}")
+            return None
+
+        if attempt >= max_attempts:
+            self.stats['exhausted'] += 1
+            logger.warning(f"{description}第 {attempt} 次尝试失败: {error}")
+            return None
+
+        if not self._consume_budget():
+            self.stats['budget_denied'] += 1
+            logger.warning(f"{description}失败且本次运行的重试预算已用完: {error}")
+            return None
+
+        self.stats['retries'] += 1
+        delay = self.next_delay(previous_delay, error)
+        logger.warning(f"{description}第 {attempt} 次尝试失败: {error}，{delay:.2f} 秒后重试")
+        return delay
+
+    def call(self, func: Callable[[], Any], max_attempts: int = None, description: str = '',
+             on_retry: Callable[[], None] = None) -> Any:
+        """执行 func，按策略重试；放弃时抛出最后一次的异常"""
+        max_attempts = max_attempts or CRAWLER_CONFIG['retry_times']
+        delay = self.config['base_delay']
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return func()
+            except Exception as e:
+                delay = self._plan_retry(e, attempt, max_attempts, delay, description)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            if on_retry:
+                on_retry()
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]], max_attempts: int = None, description: str = '',
+                         on_retry: Callable[[], None] = None) -> Any:
+        """call 的异步版本"""
+        max_attempts = max_attempts or CRAWLER_CONFIG['retry_times']
+        delay = self.config['base_delay']
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return await func()
+            except Exception as e:
+                delay = self._plan_retry(e, attempt, max_attempts, delay, description)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            if on_retry:
+                on_retry()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return dict(self.stats, budget_remaining=self.budget_remaining)